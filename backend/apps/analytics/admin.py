@@ -3,6 +3,8 @@ Analytics Admin Configuration
 """
 from django.contrib import admin
 
+from apps.core.pagination import EstimatedCountPaginator
+
 from .models import (
     ArticleAnalytics,
     DailyMetrics,
@@ -58,6 +60,9 @@ class DailyMetricsAdmin(admin.ModelAdmin):
 
 @admin.register(UserActivityLog)
 class UserActivityLogAdmin(admin.ModelAdmin):
+    # Log table: avoid COUNT(*) on every changelist page
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = [
         "activity_type",
         "user",
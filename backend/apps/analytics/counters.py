@@ -0,0 +1,440 @@
+"""
+Buffered view/download/listen counters.
+
+Request path (one or two Redis round-trips):
+1. SET NX the per-visitor dedup key (skipped when no dedup is wanted)
+2. Pipeline HINCRBY on the counter hash + XADD of the raw event
+
+The periodic flusher (`flush_counters`, scheduled every minute) then:
+- applies all pending deltas per model with a single
+  UPDATE ... FROM (VALUES ...) statement
+- drains the event streams in batches and bulk_creates the log rows
+  (ArticleView, ResearchView, ResearchDownload, EpisodeListen), resolving
+  geo data there instead of inside the request; rows that can't be
+  written (invalid values, a since-deleted article) are moved to the
+  "<stream>:dead" stream so they never block the rest
+
+Frontend activity events (TrackEventView) use the same streams without a
+counter: `queue_events` XADDs them and `run_event_ingester` bulk-inserts
+every N events or T ms, with the minute flush as a backstop.
+
+When Redis isn't available (dummy cache in tests, Redis outage) every hit
+falls back to the old synchronous F() update + INSERT so nothing is lost.
+"""
+import json
+import logging
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY_PREFIX = "counters"
+EVENT_KEY_PREFIX = "events"
+FLUSH_LOCK_KEY = "counters:flush:lock"
+FLUSH_LOCK_TTL = 55  # Slightly under the 1-minute schedule
+EVENT_BATCH_SIZE = 1000
+EVENT_STREAM_MAXLEN = 500_000  # Approximate cap so a dead flusher can't eat Redis
+DEAD_LETTER_MAXLEN = 10_000
+
+# counter kind -> (model label, counter field)
+COUNTERS = {
+    "article_view": ("news.NewsArticle", "view_count"),
+    "report_view": ("research.ResearchReport", "view_count"),
+    "report_download": ("research.ResearchReport", "download_count"),
+    "episode_listen": ("podcasts.PodcastEpisode", "listen_count"),
+    "show_listen": ("podcasts.PodcastShow", "total_listens"),
+    "redirect_hit": ("seo.Redirect", "hit_count"),
+    "media_download": ("media.MediaFile", "download_count"),
+}
+
+# counter kind -> timestamp field set to now() when its deltas are applied
+TOUCHED = {
+    "redirect_hit": "last_hit",
+}
+
+# counter kind -> event log model label
+EVENTS = {
+    "article_view": "news.ArticleView",
+    "report_view": "research.ResearchView",
+    "report_download": "research.ResearchDownload",
+    "episode_listen": "podcasts.EpisodeListen",
+    "activity": "analytics.UserActivityLog",
+}
+
+GEO_FIELDS = ("country", "country_name", "city", "region")
+
+
+def get_redis_client():
+    """Raw Redis client, or None when the cache backend isn't Redis."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
+
+def _counter_key(kind: str) -> str:
+    return f"{COUNTER_KEY_PREFIX}:{kind}"
+
+
+def _event_key(kind: str) -> str:
+    return f"{EVENT_KEY_PREFIX}:{kind}"
+
+
+def record_hit(kind, pk, event=None, dedup_key=None, dedup_ttl=60 * 30, extra=()):
+    """
+    Count one view/download/listen and queue its event row.
+
+    Args:
+        kind: Key of COUNTERS (e.g. "article_view")
+        pk: Primary key of the counted object
+        event: Field values for the EVENTS log row (attnames, e.g. "article_id").
+            An "ip" entry is resolved to geo fields at flush time.
+        dedup_key: Optional per-visitor key; the hit is dropped if it was
+            already seen within dedup_ttl seconds
+        extra: Additional (kind, pk) counters bumped by the same hit
+
+    Returns:
+        True if the hit was counted, False if deduplicated. Never raises —
+        analytics must not break reading.
+    """
+    counters = [(kind, pk), *extra]
+    payload = json.dumps(event, default=str) if event is not None else None
+
+    conn = get_redis_client()
+    if conn is not None:
+        try:
+            if dedup_key and not conn.set(dedup_key, 1, nx=True, ex=dedup_ttl):
+                return False
+            pipe = conn.pipeline(transaction=False)
+            for counter_kind, counter_pk in counters:
+                pipe.hincrby(_counter_key(counter_kind), str(counter_pk), 1)
+            if payload is not None:
+                pipe.xadd(
+                    _event_key(kind),
+                    {"data": payload},
+                    maxlen=EVENT_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Counter pipeline unavailable, writing directly: {e}")
+
+    # Synchronous fallback — same writes the flusher would do, just now.
+    try:
+        if dedup_key:
+            if cache.get(dedup_key):
+                return False
+            cache.set(dedup_key, True, dedup_ttl)
+        for counter_kind, counter_pk in counters:
+            apply_counts(counter_kind, {str(counter_pk): 1})
+        if payload is not None:
+            write_events(kind, [json.loads(payload)])
+        return True
+    except Exception as e:
+        logger.debug(f"Direct counter write failed for {kind}:{pk}: {e}")
+        return False
+
+
+def queue_events(kind: str, payloads: list) -> int:
+    """
+    Queue event rows for kind (a key of EVENTS) without bumping a counter.
+
+    One pipelined round-trip for the whole list; written directly when Redis
+    is unavailable. Returns the number of events accepted.
+    """
+    if not payloads:
+        return 0
+
+    conn = get_redis_client()
+    if conn is not None:
+        try:
+            pipe = conn.pipeline(transaction=False)
+            for payload in payloads:
+                pipe.xadd(
+                    _event_key(kind),
+                    {"data": json.dumps(payload, default=str)},
+                    maxlen=EVENT_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            pipe.execute()
+            return len(payloads)
+        except Exception as e:
+            logger.warning(f"Event stream unavailable, writing directly: {e}")
+
+    return write_events(kind, [json.loads(json.dumps(p, default=str)) for p in payloads])
+
+
+def apply_counts(kind: str, deltas: dict) -> int:
+    """
+    Add {pk: delta} to the counter field of kind's model in one statement.
+
+    Returns the number of rows updated.
+    """
+    if not deltas:
+        return 0
+
+    label, field_name = COUNTERS[kind]
+    model = apps.get_model(label)
+    connection = connections[router.db_for_write(model)]
+    touched = TOUCHED.get(kind)
+
+    if connection.vendor != "postgresql":
+        updated = 0
+        touch = {touched: timezone.now()} if touched else {}
+        for pk, delta in deltas.items():
+            updated += model.objects.filter(pk=pk).update(
+                **{field_name: F(field_name) + delta}, **touch
+            )
+        return updated
+
+    qn = connection.ops.quote_name
+    column = qn(model._meta.get_field(field_name).column)
+    pk_column = qn(model._meta.pk.column)
+    pk_type = model._meta.pk.db_type(connection)
+    values = ", ".join(["(%s, %s)"] * len(deltas))
+    params = []
+    for pk, delta in deltas.items():
+        params.extend([str(pk), int(delta)])
+
+    touch = f", {qn(model._meta.get_field(touched).column)} = now()" if touched else ""
+    sql = (
+        f"UPDATE {qn(model._meta.db_table)} AS t "
+        f"SET {column} = t.{column} + v.delta{touch} "
+        f"FROM (VALUES {values}) AS v(pk, delta) "
+        f"WHERE t.{pk_column} = v.pk::{pk_type}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _clean_rows(model, payloads: list, rejected: list) -> list:
+    """
+    Model instances for the payloads that can be inserted: values coerced
+    with each field's to_python/validators, and foreign keys checked with
+    one pk__in query per relation. An unknown nullable FK (a deleted user)
+    is cleared; a row with an unknown required FK (a deleted article) or an
+    invalid value is appended to `rejected` instead.
+    """
+    fields = {f.attname: f for f in model._meta.concrete_fields}
+    cleaned = []
+    for payload in payloads:
+        values = {}
+        try:
+            for name, value in payload.items():
+                field = fields.get(name)
+                if field is None or field.primary_key:
+                    continue
+                value = field.to_python(value)
+                if value not in field.empty_values:
+                    field.run_validators(value)
+                values[name] = value
+        except (ValidationError, TypeError, ValueError) as e:
+            logger.debug(f"Dropping invalid {model.__name__} event: {e}")
+            rejected.append(payload)
+            continue
+        cleaned.append((payload, values))
+
+    for field in model._meta.concrete_fields:
+        if not field.is_relation or not field.many_to_one:
+            continue
+        ids = {values[field.attname] for _, values in cleaned if values.get(field.attname) is not None}
+        if not ids:
+            continue
+        known = set(
+            field.related_model._base_manager.filter(pk__in=ids).values_list("pk", flat=True)
+        )
+        kept = []
+        for payload, values in cleaned:
+            value = values.get(field.attname)
+            if value is None or value in known:
+                kept.append((payload, values))
+            elif field.null:
+                values[field.attname] = None
+                kept.append((payload, values))
+            else:
+                rejected.append(payload)
+        cleaned = kept
+
+    return [(payload, model(**values)) for payload, values in cleaned]
+
+
+def write_events(kind: str, payloads: list, rejected: list = None) -> int:
+    """
+    bulk_create the event log rows for kind, resolving geo from "ip".
+
+    Rows that can't be written (invalid values, deleted FK targets) are
+    skipped and appended to `rejected` if given, so one bad event can't
+    block the rest. Returns the number of rows written.
+    """
+    from .geoip import lookup_geo
+
+    model = apps.get_model(EVENTS[kind])
+    attnames = {f.attname for f in model._meta.concrete_fields}
+    rejected = rejected if rejected is not None else []
+
+    for payload in payloads:
+        ip = payload.pop("ip", "")
+        if ip:
+            geo = lookup_geo(ip)
+            for field in GEO_FIELDS:
+                if field in attnames:
+                    payload.setdefault(field, geo[field])
+            if "country_code" in attnames:
+                payload.setdefault("country_code", geo["country"])
+
+    rows = _clean_rows(model, payloads, rejected)
+    using = router.db_for_write(model)
+    try:
+        with transaction.atomic(using=using):
+            model.objects.bulk_create([row for _, row in rows], batch_size=EVENT_BATCH_SIZE)
+        return len(rows)
+    except DatabaseError as e:
+        logger.warning(f"Bulk insert of {kind} events failed, inserting row by row: {e}")
+
+    written = 0
+    for payload, row in rows:
+        try:
+            with transaction.atomic(using=using):
+                row.save(force_insert=True)
+            written += 1
+        except DatabaseError as e:
+            logger.debug(f"Dropping {kind} event: {e}")
+            rejected.append(payload)
+    return written
+
+
+def _flush_counter(conn, kind: str) -> int:
+    live_key = _counter_key(kind)
+    inflight_key = f"{live_key}:inflight"
+
+    # A leftover inflight hash means the previous flush died mid-way;
+    # finish that one before taking the next batch.
+    if not conn.exists(inflight_key):
+        if not conn.exists(live_key):
+            return 0
+        conn.rename(live_key, inflight_key)
+
+    raw = conn.hgetall(inflight_key)
+    deltas = {k.decode(): int(v) for k, v in raw.items() if int(v)}
+    with transaction.atomic(using=router.db_for_write(apps.get_model(COUNTERS[kind][0]))):
+        apply_counts(kind, deltas)
+    conn.delete(inflight_key)
+    return sum(deltas.values())
+
+
+def _dead_letter(conn, kind: str, payloads: list):
+    """Park events that couldn't be written on <stream>:dead for inspection."""
+    logger.warning(f"{len(payloads)} {kind} events could not be written; moved to {_event_key(kind)}:dead")
+    try:
+        pipe = conn.pipeline(transaction=False)
+        for payload in payloads:
+            pipe.xadd(
+                f"{_event_key(kind)}:dead",
+                {"data": json.dumps(payload, default=str)},
+                maxlen=DEAD_LETTER_MAXLEN,
+                approximate=True,
+            )
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Dead-lettering {kind} events failed: {e}")
+
+
+def _flush_events(conn, kind: str, batch_size: int = EVENT_BATCH_SIZE) -> int:
+    key = _event_key(kind)
+    lock_key = f"{key}:lock"
+
+    # The minute flush and run_event_ingester may drain the same stream.
+    if not conn.set(lock_key, 1, nx=True, ex=FLUSH_LOCK_TTL):
+        return 0
+
+    written = 0
+    try:
+        while True:
+            entries = conn.xrange(key, count=batch_size)
+            if not entries:
+                break
+            payloads = []
+            for _entry_id, fields in entries:
+                try:
+                    payloads.append(json.loads(fields[b"data"]))
+                except (KeyError, ValueError):
+                    continue
+            rejected = []
+            written += write_events(kind, payloads, rejected)
+            if rejected:
+                _dead_letter(conn, kind, rejected)
+            # Always acknowledged: a bad row must not block the stream
+            conn.xdel(key, *[entry_id for entry_id, _ in entries])
+            if len(entries) < batch_size:
+                break
+    finally:
+        conn.delete(lock_key)
+    return written
+
+
+def pending_events(kind: str) -> tuple:
+    """(queued event count, age of the oldest event in ms) for kind's stream."""
+    conn = get_redis_client()
+    if conn is None:
+        return 0, 0
+    key = _event_key(kind)
+    length = conn.xlen(key)
+    if not length:
+        return 0, 0
+    oldest = conn.xrange(key, count=1)
+    if not oldest:
+        return 0, 0
+    # Stream IDs are "<unix ms>-<seq>"
+    oldest_ms = int(oldest[0][0].split(b"-")[0])
+    return length, max(0, int(time.time() * 1000) - oldest_ms)
+
+
+def drain_events(kind: str, batch_size: int = EVENT_BATCH_SIZE) -> int:
+    """Bulk-insert everything queued for kind right now."""
+    conn = get_redis_client()
+    if conn is None:
+        return 0
+    return _flush_events(conn, kind, batch_size)
+
+
+def flush_counters():
+    """
+    Apply buffered counter deltas and event rows to Postgres.
+
+    Schedule: Every minute
+    """
+    conn = get_redis_client()
+    if conn is None:
+        return "Redis unavailable — counters are written synchronously"
+
+    if not conn.set(FLUSH_LOCK_KEY, 1, nx=True, ex=FLUSH_LOCK_TTL):
+        return "Flush already running"
+
+    stats = defaultdict(int)
+    try:
+        for kind in COUNTERS:
+            try:
+                stats[f"{kind}_hits"] = _flush_counter(conn, kind)
+            except Exception as e:
+                logger.error(f"Counter flush failed for {kind}: {e}")
+        for kind in EVENTS:
+            try:
+                stats[f"{kind}_events"] = _flush_events(conn, kind)
+            except Exception as e:
+                logger.error(f"Event flush failed for {kind}: {e}")
+    finally:
+        conn.delete(FLUSH_LOCK_KEY)
+
+    summary = ", ".join(f"{k}={v}" for k, v in stats.items() if v)
+    return f"Flushed counters: {summary or 'nothing pending'}"
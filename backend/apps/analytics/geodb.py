@@ -0,0 +1,243 @@
+"""
+Local IP-range geolocation database.
+
+Two on-disk formats are supported:
+- A compiled range table (.bin) built by `manage.py refresh_geoip` from a
+  CSV of `start_ip,end_ip,country_code,country_name,region,city` rows
+- A MaxMind .mmdb file (requires the optional `maxminddb` package)
+
+The compiled table is memory-mapped and binary-searched in place, so the
+OS page cache is shared by every gunicorn worker and a lookup is a couple
+of dozen 16-byte comparisons — no network, no per-process parse step.
+
+Compiled layout (all integers big-endian):
+    header   magic "BGEO" | version u16 | record count u32 | strings offset u32
+    records  start u128 | end u128 | location offset u32   (36 bytes each,
+             sorted by start, IPv4 stored as IPv4-mapped IPv6)
+    strings  length u16 | "cc\\tcountry\\tregion\\tcity" (UTF-8), deduplicated
+"""
+import csv
+import ipaddress
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BGEO"
+VERSION = 1
+HEADER = struct.Struct(">4sHII")
+RECORD = struct.Struct(">16s16sI")
+STRING_LEN = struct.Struct(">H")
+RELOAD_CHECK_SECONDS = 60
+
+EMPTY_GEO = {"country": "", "country_name": "", "city": "", "region": ""}
+
+
+def _ip_bytes(ip: str) -> bytes:
+    """16-byte big-endian form; IPv4 is mapped into ::ffff:0:0/96."""
+    addr = ipaddress.ip_address(ip.strip())
+    if addr.version == 4:
+        addr = ipaddress.IPv6Address(f"::ffff:{addr}")
+    return addr.packed
+
+
+def _geo_dict(country="", country_name="", region="", city="") -> dict:
+    return {
+        "country": country[:2],
+        "country_name": country_name[:80],
+        "city": city[:120],
+        "region": region[:120],
+    }
+
+
+class RangeTable:
+    """Memory-mapped reader for the compiled range table."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._strings_at = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a v{VERSION} GeoIP range table")
+
+    def _start(self, i: int) -> bytes:
+        offset = HEADER.size + i * RECORD.size
+        return self._mm[offset:offset + 16]
+
+    def lookup(self, ip: str) -> Optional[dict]:
+        key = _ip_bytes(ip)
+
+        # Rightmost record whose start <= key
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._start(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+
+        _start, end, loc_offset = RECORD.unpack_from(self._mm, HEADER.size + (lo - 1) * RECORD.size)
+        if key > end:
+            return None
+
+        at = self._strings_at + loc_offset
+        (length,) = STRING_LEN.unpack_from(self._mm, at)
+        fields = self._mm[at + 2:at + 2 + length].decode("utf-8").split("\t")
+        return _geo_dict(*fields)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class MaxMindTable:
+    """Thin adapter over maxminddb's mmap reader (GeoLite2-City/Country)."""
+
+    def __init__(self, path: str):
+        import maxminddb
+
+        self.path = path
+        self._reader = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+
+    def lookup(self, ip: str) -> Optional[dict]:
+        record = self._reader.get(ip)
+        if not record:
+            return None
+        country = record.get("country") or {}
+        subdivisions = record.get("subdivisions") or [{}]
+        return _geo_dict(
+            country.get("iso_code") or "",
+            (country.get("names") or {}).get("en") or "",
+            (subdivisions[0].get("names") or {}).get("en") or "",
+            ((record.get("city") or {}).get("names") or {}).get("en") or "",
+        )
+
+    def close(self):
+        self._reader.close()
+
+
+def compile_csv(rows: Iterable[list], out_path: str) -> int:
+    """
+    Write a range table built from CSV rows to out_path.
+
+    Rows are `start_ip, end_ip, country_code[, country_name, region, city]`;
+    a header row and malformed rows are skipped. Returns the record count.
+    Point out_path at a temporary file and move it over the live database
+    only once the count has been checked (see refresh_geoip).
+    """
+    records = []
+    strings = {}
+    blob = bytearray()
+
+    for row in rows:
+        if len(row) < 3:
+            continue
+        try:
+            start, end = _ip_bytes(row[0]), _ip_bytes(row[1])
+        except ValueError:
+            continue  # Header or junk line
+        fields = [(row[i].strip() if i < len(row) else "") for i in range(2, 6)]
+        location = "\t".join(f.replace("\t", " ") for f in fields)
+        if location not in strings:
+            encoded = location.encode("utf-8")[:65535]
+            strings[location] = len(blob)
+            blob += STRING_LEN.pack(len(encoded)) + encoded
+        records.append((start, end, strings[location]))
+
+    records.sort(key=lambda r: r[0])
+    strings_at = HEADER.size + len(records) * RECORD.size
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records), strings_at))
+        for start, end, loc_offset in records:
+            f.write(RECORD.pack(start, end, loc_offset))
+        f.write(blob)
+    return len(records)
+
+
+def compile_csv_file(csv_path: str, out_path: str) -> int:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return compile_csv(csv.reader(f), out_path)
+
+
+class LocalGeoDatabase:
+    """
+    Process-wide handle on the local database.
+
+    Opens lazily, and re-opens when the file on disk is replaced (checked at
+    most once a minute) so `refresh_geoip` takes effect without restarts.
+    """
+
+    def __init__(self):
+        self._table = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path() -> str:
+        from django.conf import settings
+
+        return getattr(settings, "GEOIP_DB_PATH", "")
+
+    def _open(self, path: str):
+        if path.endswith(".mmdb"):
+            return MaxMindTable(path)
+        return RangeTable(path)
+
+    def _refresh(self):
+        path = self.path()
+        try:
+            mtime = os.stat(path).st_mtime if path else None
+        except OSError:
+            mtime = None
+
+        if mtime == self._mtime and (self._table is not None or mtime is None):
+            return
+
+        if mtime is None:
+            self._table, self._mtime = None, None
+            return
+        try:
+            table = self._open(path)
+        except Exception as e:
+            logger.warning(f"Could not open GeoIP database {path}: {e}")
+            self._mtime = mtime  # Keep serving the table we have
+            return
+
+        # Swapped in one assignment and never closed here: a lookup still
+        # reading the old table keeps it alive until it is done
+        self._table = table
+        self._mtime = mtime
+
+    @property
+    def available(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_CHECK_SECONDS:
+            with self._lock:
+                self._checked_at = now
+                self._refresh()
+        return self._table is not None
+
+    def lookup(self, ip: str) -> dict:
+        """Geo dict for ip (empty values when not covered). Requires `available`."""
+        table = self._table
+        if table is None:
+            return dict(EMPTY_GEO)
+        try:
+            return table.lookup(ip) or dict(EMPTY_GEO)
+        except ValueError:
+            return dict(EMPTY_GEO)
+
+
+local_db = LocalGeoDatabase()
@@ -1,12 +1,17 @@
 """
-IP-based geolocation lookup using free ipapi.co service.
-Caches results to avoid hitting rate limits.
+IP-based geolocation lookup.
+
+Resolves against the local range database (see geodb.py, refreshed with
+`manage.py refresh_geoip`). Only when no local database is installed does
+it fall back to the free ipapi.co service, caching results to avoid
+hitting its rate limits.
 """
 import logging
-from typing import Optional
 import requests
 from django.core.cache import cache
 
+from .geodb import local_db
+
 logger = logging.getLogger(__name__)
 
 GEO_CACHE_DURATION = 86400 * 7  # 7 days
@@ -47,6 +52,14 @@ def lookup_geo(ip: str) -> dict:
     if not ip or ip in ("127.0.0.1", "localhost", "::1") or ip.startswith("192.168."):
         return {"country": "", "country_name": "", "city": "", "region": ""}
 
+    if local_db.available:
+        return local_db.lookup(ip)
+
+    return lookup_geo_remote(ip)
+
+
+def lookup_geo_remote(ip: str) -> dict:
+    """Blocking ipapi.co lookup — only used when no local database exists."""
     cache_key = f"geo:{ip}"
     cached = cache.get(cache_key)
     if cached is not None:
@@ -1,19 +1,26 @@
 """
 Product-Market-Fit Analytics Endpoints
 
-Aggregates ArticleView + ResearchView + ResearchDownload data into
+Aggregates ArticleView + ResearchView + ResearchDownload data (read from
+the hourly rollups in .rollups) into
 actionable insights about WHAT readers are interested in, WHERE they
 come from, and WHO they are.
 """
 from datetime import timedelta
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
 from apps.news.models import ArticleView, NewsArticle
-from apps.research.models import ResearchView, ResearchDownload, ResearchReport
+from apps.research.models import ResearchReport
+
+from .rollups import views_by
+
+
+def _top(rows, limit=None):
+    return sorted(rows, key=lambda x: -x["count"])[:limit]
 
 
 @api_view(["GET"])
@@ -30,76 +37,85 @@ def content_insights(request):
     days = int(request.query_params.get("days", 30))
     since = timezone.now() - timedelta(days=days)
 
+    # Counts come from the hourly rollups plus the live partial hour; only
+    # the per-reader breakdowns below still read the raw ArticleView table.
     article_views = ArticleView.objects.filter(created_at__gte=since)
-    research_views = ResearchView.objects.filter(created_at__gte=since)
-    research_downloads = ResearchDownload.objects.filter(created_at__gte=since)
 
     # Top articles
-    top_articles = (
-        article_views.values("article__id", "article__title", "article__slug", "article__category__name")
-        .annotate(view_count=Count("id"))
-        .order_by("-view_count")[:10]
-    )
-
-    # Top research
-    top_research = (
-        research_views.values("report__id", "report__title", "report__slug", "report__report_type")
-        .annotate(view_count=Count("id"))
-        .order_by("-view_count")[:10]
-    )
-
-    # Top downloads
-    top_downloads = (
-        research_downloads.values("report__id", "report__title", "report__slug")
-        .annotate(download_count=Count("id"))
-        .order_by("-download_count")[:10]
-    )
+    by_article = views_by("article_view", since, "object_id")
+    articles = {
+        a["id"]: a
+        for a in NewsArticle.all_objects.filter(id__in=[r["object_id"] for r in by_article])
+        .values("id", "title", "slug", "category__name", "category__slug")
+    }
+    by_article = [r for r in by_article if r["object_id"] in articles]
+    top_articles = [
+        {
+            "article__id": r["object_id"],
+            "article__title": articles[r["object_id"]]["title"],
+            "article__slug": articles[r["object_id"]]["slug"],
+            "article__category__name": articles[r["object_id"]]["category__name"],
+            "view_count": r["count"],
+        }
+        for r in _top(by_article, 10)
+    ]
+
+    # Top research / downloads
+    by_report = views_by("report_view", since, "object_id")
+    by_download = views_by("report_download", since, "object_id")
+    reports = {
+        r["id"]: r
+        for r in ResearchReport.objects.filter(
+            id__in={r["object_id"] for r in by_report + by_download}
+        ).values("id", "title", "slug", "report_type")
+    }
+    top_research = [
+        {
+            "report__id": r["object_id"],
+            "report__title": reports[r["object_id"]]["title"],
+            "report__slug": reports[r["object_id"]]["slug"],
+            "report__report_type": reports[r["object_id"]]["report_type"],
+            "view_count": r["count"],
+        }
+        for r in _top([r for r in by_report if r["object_id"] in reports], 10)
+    ]
+    top_downloads = [
+        {
+            "report__id": r["object_id"],
+            "report__title": reports[r["object_id"]]["title"],
+            "report__slug": reports[r["object_id"]]["slug"],
+            "download_count": r["count"],
+        }
+        for r in _top([r for r in by_download if r["object_id"] in reports], 10)
+    ]
 
     # Geo distribution (combined article + research views)
-    article_countries = list(
-        article_views.exclude(country="")
-        .values("country", "country_name")
-        .annotate(count=Count("id"))
-    )
-    research_countries = list(
-        research_views.exclude(country="")
-        .values("country", "country_name")
-        .annotate(count=Count("id"))
-    )
-    # Merge
     country_totals = {}
-    for c in article_countries + research_countries:
-        key = c["country"]
-        if key not in country_totals:
-            country_totals[key] = {
-                "country": key,
-                "country_name": c["country_name"],
-                "count": 0,
-            }
-        country_totals[key]["count"] += c["count"]
-    geo_distribution = sorted(country_totals.values(), key=lambda x: -x["count"])[:15]
+    for kind in ("article_view", "report_view"):
+        for c in views_by(kind, since, "country", "country_name", exclude_blank=["country"]):
+            key = c["country"]
+            if key not in country_totals:
+                country_totals[key] = {
+                    "country": key,
+                    "country_name": c["country_name"],
+                    "count": 0,
+                }
+            country_totals[key]["count"] += c["count"]
+    geo_distribution = _top(country_totals.values(), 15)
 
     # Top cities
-    cities = list(
-        article_views.exclude(city="")
-        .values("city", "country_name")
-        .annotate(count=Count("id"))
-        .order_by("-count")[:10]
-    )
+    cities = _top(views_by("article_view", since, "city", "country_name", exclude_blank=["city"]), 10)
 
     # Traffic sources
-    sources = list(
-        article_views.exclude(source="")
-        .values("source")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
+    sources = _top(views_by("article_view", since, "source", exclude_blank=["source"]))
 
     # Authenticated vs anonymous
-    article_auth = article_views.filter(user__isnull=False).count()
-    article_anon = article_views.filter(user__isnull=True).count()
-    research_auth = research_views.filter(user__isnull=False).count()
-    research_anon = research_views.filter(user__isnull=True).count()
+    def auth_split(kind):
+        split = {r["authenticated"]: r["count"] for r in views_by(kind, since, "authenticated")}
+        return {"authenticated": split.get(True, 0), "anonymous": split.get(False, 0)}
+
+    article_auth = auth_split("article_view")
+    research_auth = auth_split("report_view")
 
     # Top authenticated readers (engaged users)
     top_readers = (
@@ -110,28 +126,33 @@ def content_insights(request):
     )
 
     # Daily trend (last 30 days)
-    from django.db.models.functions import TruncDate
-    daily_trend = list(
-        article_views.annotate(date=TruncDate("created_at"))
-        .values("date")
-        .annotate(views=Count("id"))
-        .order_by("date")
+    daily_trend = sorted(
+        ({"date": r["date"], "views": r["count"]} for r in views_by("article_view", since, "date")),
+        key=lambda x: x["date"],
     )
 
     # Category interest signal
-    category_interest = list(
-        article_views.exclude(article__category__isnull=True)
-        .values("article__category__name", "article__category__slug")
-        .annotate(views=Count("id"))
-        .order_by("-views")[:10]
-    )
+    category_totals = {}
+    for r in by_article:
+        article = articles[r["object_id"]]
+        if not article["category__slug"]:
+            continue
+        key = article["category__slug"]
+        if key not in category_totals:
+            category_totals[key] = {
+                "article__category__name": article["category__name"],
+                "article__category__slug": key,
+                "views": 0,
+            }
+        category_totals[key]["views"] += r["count"]
+    category_interest = sorted(category_totals.values(), key=lambda x: -x["views"])[:10]
 
     return Response({
         "period_days": days,
         "totals": {
-            "article_views": article_views.count(),
-            "research_views": research_views.count(),
-            "research_downloads": research_downloads.count(),
+            "article_views": sum(article_auth.values()),
+            "research_views": sum(research_auth.values()),
+            "research_downloads": sum(r["count"] for r in by_download),
             "unique_authenticated_readers": article_views.filter(user__isnull=False).values("user").distinct().count(),
         },
         "top_articles": list(top_articles),
@@ -141,8 +162,8 @@ def content_insights(request):
         "top_cities": cities,
         "traffic_sources": sources,
         "authenticated_breakdown": {
-            "articles": {"authenticated": article_auth, "anonymous": article_anon},
-            "research": {"authenticated": research_auth, "anonymous": research_anon},
+            "articles": article_auth,
+            "research": research_auth,
         },
         "top_readers": list(top_readers),
         "daily_trend": daily_trend,
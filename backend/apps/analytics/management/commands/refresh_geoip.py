@@ -0,0 +1,108 @@
+"""
+Download and install the local GeoIP database used by lookup_geo.
+
+Usage:
+    python manage.py refresh_geoip                          # from GEOIP_SOURCE_URL
+    python manage.py refresh_geoip --url https://.../ip-city.csv.gz
+    python manage.py refresh_geoip --file ./ip-city.csv
+    python manage.py refresh_geoip --file ./GeoLite2-City.mmdb --output data/geoip.mmdb
+
+CSV sources (optionally gzipped) are compiled into the memory-mapped range
+table; .mmdb sources are installed as-is (needs the `maxminddb` package).
+The new database is built next to the old one and only moved into place
+once it holds at least --min-ranges ranges, so a truncated or empty source
+leaves the current database alone. Running workers pick it up within a
+minute.
+"""
+import csv
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.geodb import compile_csv
+
+MIN_RANGES = 1000
+
+
+class Command(BaseCommand):
+    help = "Download/compile the local GeoIP IP-range database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Source URL (defaults to GEOIP_SOURCE_URL).")
+        parser.add_argument("--file", help="Local source file instead of downloading.")
+        parser.add_argument("--output", help="Target path (defaults to GEOIP_DB_PATH).")
+        parser.add_argument(
+            "--min-ranges", type=int, default=MIN_RANGES,
+            help=f"Refuse to install a table with fewer ranges (default {MIN_RANGES}).",
+        )
+
+    def handle(self, *args, **opts):
+        output = opts["output"] or settings.GEOIP_DB_PATH
+        source = opts["file"] or opts["url"] or settings.GEOIP_SOURCE_URL
+        if not source:
+            raise CommandError("No source given — pass --url/--file or set GEOIP_SOURCE_URL.")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            local_path = source if opts["file"] else self._download(source, tmp)
+
+            if output.endswith(".mmdb"):
+                self._install_mmdb(local_path, output)
+                self.stdout.write(self.style.SUCCESS(f"Installed MaxMind database at {output}"))
+                return
+
+            count = self._install_csv(local_path, output, opts["min_ranges"], source)
+
+        self.stdout.write(self.style.SUCCESS(f"Compiled {count} IP ranges into {output}"))
+
+    def _download(self, url, tmp_dir):
+        filename = os.path.basename(url.split("?")[0]) or "geoip.csv"
+        path = os.path.join(tmp_dir, filename)
+        self.stdout.write(f"Downloading {url}...")
+        try:
+            with requests.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with open(path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+        except requests.RequestException as e:
+            raise CommandError(f"Download failed: {e}")
+        return path
+
+    def _install_csv(self, source_path, output, min_ranges, source):
+        opener = gzip.open if source_path.endswith(".gz") else open
+        tmp_out = f"{output}.tmp"
+        try:
+            try:
+                with opener(source_path, "rb") as raw:
+                    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                    count = compile_csv(csv.reader(text), tmp_out)
+            except (OSError, UnicodeDecodeError) as e:
+                raise CommandError(f"Could not read {source}: {e}")
+            if count < max(min_ranges, 1):
+                raise CommandError(
+                    f"Source contained {count} usable IP ranges (minimum {min_ranges}); "
+                    f"keeping the current database."
+                )
+            os.replace(tmp_out, output)
+        finally:
+            if os.path.exists(tmp_out):
+                os.remove(tmp_out)
+        return count
+
+    def _install_mmdb(self, source_path, output):
+        opener = gzip.open if source_path.endswith(".gz") else open
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        tmp_out = f"{output}.tmp"
+        try:
+            with opener(source_path, "rb") as src, open(tmp_out, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_out, output)
+        finally:
+            if os.path.exists(tmp_out):
+                os.remove(tmp_out)
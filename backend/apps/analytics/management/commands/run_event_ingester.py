@@ -0,0 +1,51 @@
+"""
+Long-running worker that bulk-inserts queued frontend activity events.
+
+Usage:
+    python manage.py run_event_ingester
+    python manage.py run_event_ingester --batch-size 500 --max-wait-ms 2000
+
+Flushes the Redis `events:activity` stream into UserActivityLog whenever it
+holds --batch-size events or its oldest event is older than --max-wait-ms.
+The minute `flush_counters` schedule drains the same stream as a backstop,
+so running this worker is optional.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.counters import drain_events, get_redis_client, pending_events
+
+KIND = "activity"
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert queued analytics events every N events or T ms."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--max-wait-ms", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        batch_size, max_wait_ms = opts["batch_size"], opts["max_wait_ms"]
+        if get_redis_client() is None:
+            raise CommandError("Redis cache backend required — events are written inline without it.")
+
+        poll_seconds = max(max_wait_ms / 4, 50) / 1000
+        self.stdout.write(
+            f"Ingesting '{KIND}' events (batch {batch_size}, max wait {max_wait_ms}ms)..."
+        )
+
+        while True:
+            try:
+                queued, oldest_age_ms = pending_events(KIND)
+                if queued >= batch_size or (queued and oldest_age_ms >= max_wait_ms):
+                    written = drain_events(KIND, batch_size)
+                    if written:
+                        self.stdout.write(f"  inserted {written} events")
+                        continue
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                self.stderr.write(f"  ingest failed: {e}")
+            time.sleep(poll_seconds)
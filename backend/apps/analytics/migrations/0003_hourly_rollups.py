@@ -0,0 +1,139 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=50, unique=True, verbose_name="Name"),
+                ),
+                ("rolled_until", models.DateTimeField(verbose_name="Rolled Until")),
+            ],
+            options={
+                "verbose_name": "Rollup Watermark",
+                "verbose_name_plural": "Rollup Watermarks",
+            },
+        ),
+        migrations.CreateModel(
+            name="HourlyMetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(verbose_name="Hour")),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("user_signup", "User Signup"),
+                            ("newsletter_signup", "Newsletter Signup"),
+                            ("payment", "Completed Payment"),
+                        ],
+                        max_length=20,
+                        verbose_name="Metric",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Dimension"
+                    ),
+                ),
+                ("events", models.PositiveIntegerField(default=0)),
+                ("amount", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Hourly Metric Rollup",
+                "verbose_name_plural": "Hourly Metric Rollups",
+                "unique_together": {("metric", "hour", "dimension")},
+            },
+        ),
+        migrations.CreateModel(
+            name="HourlyViewRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(verbose_name="Hour")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("article_view", "Article View"),
+                            ("report_view", "Research View"),
+                            ("report_download", "Research Download"),
+                        ],
+                        max_length=20,
+                        verbose_name="Kind",
+                    ),
+                ),
+                ("object_id", models.UUIDField(verbose_name="Object ID")),
+                (
+                    "country",
+                    models.CharField(blank=True, max_length=2, verbose_name="Country"),
+                ),
+                (
+                    "country_name",
+                    models.CharField(
+                        blank=True, max_length=80, verbose_name="Country Name"
+                    ),
+                ),
+                (
+                    "city",
+                    models.CharField(blank=True, max_length=120, verbose_name="City"),
+                ),
+                (
+                    "source",
+                    models.CharField(blank=True, max_length=40, verbose_name="Source"),
+                ),
+                (
+                    "authenticated",
+                    models.BooleanField(default=False, verbose_name="Signed In"),
+                ),
+                ("hits", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Hourly View Rollup",
+                "verbose_name_plural": "Hourly View Rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "hour"], name="analytics_h_kind_aace23_idx"
+                    ),
+                    models.Index(
+                        fields=["kind", "object_id", "hour"],
+                        name="analytics_h_kind_a58b6b_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0003_hourly_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="systemhealth",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="analytics_health_seek_idx"
+            ),
+        ),
+    ]
@@ -443,6 +443,7 @@ class SystemHealth(TimeStampedModel):
         ordering = ["-timestamp"]
         indexes = [
             models.Index(fields=["-timestamp"]),
+            models.Index(fields=["-created_at", "-id"], name="analytics_health_seek_idx"),  # LogPagination
         ]
 
     def __str__(self):
@@ -536,3 +537,80 @@ class GeographicAnalytics(TimeStampedModel):
 
     def __str__(self):
         return f"{self.country.name}: {self.date}"
+
+
+class HourlyViewRollup(models.Model):
+    """
+    Article/research views and downloads pre-aggregated per hour.
+
+    Maintained by apps.analytics.rollups.update_rollups; one row per
+    (hour, kind, object, geo, source, signed-in) combination.
+    """
+
+    class Kind(models.TextChoices):
+        ARTICLE_VIEW = "article_view", "Article View"
+        REPORT_VIEW = "report_view", "Research View"
+        REPORT_DOWNLOAD = "report_download", "Research Download"
+
+    hour = models.DateTimeField("Hour")
+    kind = models.CharField("Kind", max_length=20, choices=Kind.choices)
+    object_id = models.UUIDField("Object ID")
+    country = models.CharField("Country", max_length=2, blank=True)
+    country_name = models.CharField("Country Name", max_length=80, blank=True)
+    city = models.CharField("City", max_length=120, blank=True)
+    source = models.CharField("Source", max_length=40, blank=True)
+    authenticated = models.BooleanField("Signed In", default=False)
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Hourly View Rollup"
+        verbose_name_plural = "Hourly View Rollups"
+        indexes = [
+            models.Index(fields=["kind", "hour"]),
+            models.Index(fields=["kind", "object_id", "hour"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} @ {self.hour}: {self.hits}"
+
+
+class HourlyMetricRollup(models.Model):
+    """
+    Signups and revenue pre-aggregated per hour.
+
+    `dimension` is the payment currency for revenue and blank otherwise;
+    `amount` is in cents.
+    """
+
+    class Metric(models.TextChoices):
+        USER_SIGNUP = "user_signup", "User Signup"
+        NEWSLETTER_SIGNUP = "newsletter_signup", "Newsletter Signup"
+        PAYMENT = "payment", "Completed Payment"
+
+    hour = models.DateTimeField("Hour")
+    metric = models.CharField("Metric", max_length=20, choices=Metric.choices)
+    dimension = models.CharField("Dimension", max_length=20, blank=True)
+    events = models.PositiveIntegerField(default=0)
+    amount = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Hourly Metric Rollup"
+        verbose_name_plural = "Hourly Metric Rollups"
+        unique_together = [["metric", "hour", "dimension"]]
+
+    def __str__(self):
+        return f"{self.metric} {self.dimension} @ {self.hour}: {self.events}"
+
+
+class RollupWatermark(models.Model):
+    """Everything created before `rolled_until` is in the rollup tables."""
+
+    name = models.CharField("Name", max_length=50, unique=True)
+    rolled_until = models.DateTimeField("Rolled Until")
+
+    class Meta:
+        verbose_name = "Rollup Watermark"
+        verbose_name_plural = "Rollup Watermarks"
+
+    def __str__(self):
+        return f"{self.name}: {self.rolled_until}"
@@ -0,0 +1,325 @@
+"""
+Hourly analytics rollups.
+
+The admin dashboards used to aggregate the raw ArticleView / ResearchView /
+ResearchDownload / User / NewsletterSubscription / Payment tables on every
+request. `update_rollups` (scheduled every 10 minutes) folds each completed
+hour into HourlyViewRollup and HourlyMetricRollup once, and advances a
+watermark in the same transaction so an hour is never counted twice.
+
+Readers (`views_by`, `metric_by`) combine the rollups below the watermark
+with a live tail: the same aggregate over raw rows created after the
+watermark, i.e. only the current partial hour.
+
+Caveats:
+- Period filters are applied at hour granularity on the rolled-up part
+- Rows inserted after their hour was rolled with a back-dated timestamp
+  (manual paid_at edits, imports) and later refunds are not reflected
+  until the affected hours are re-rolled with `reroll`
+"""
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Min, Q, Sum, Value
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "dashboard"
+SETTLE_DELAY = timedelta(minutes=2)  # Lets the counter flusher commit the hour's last rows
+CHUNK = timedelta(days=7)  # Hours rolled per transaction when catching up
+BATCH_SIZE = 1000
+
+# kind -> (event log model label, object FK attname)
+VIEW_SOURCES = {
+    "article_view": ("news.ArticleView", "article_id"),
+    "report_view": ("research.ResearchView", "report_id"),
+    "report_download": ("research.ResearchDownload", "report_id"),
+}
+VIEW_DIMENSIONS = ("object_id", "country", "country_name", "city", "source", "authenticated")
+
+# metric -> source model, timestamp field, filter, dimension field, amount field
+METRIC_SOURCES = {
+    "user_signup": {"model": "users.User", "time": "date_joined"},
+    "newsletter_signup": {"model": "engagement.NewsletterSubscription", "time": "created_at"},
+    "payment": {
+        "model": "subscriptions.Payment",
+        "time": "paid_at",
+        "filter": {"status": "completed"},
+        "dimension": "currency",
+        "amount": "amount",
+    },
+}
+
+
+def floor_hour(dt):
+    """Start of dt's hour in the current timezone (matches TruncHour)."""
+    return timezone.localtime(dt).replace(minute=0, second=0, microsecond=0)
+
+
+def rolled_until():
+    """The watermark, or None if nothing has been rolled up yet."""
+    from .models import RollupWatermark
+
+    return (
+        RollupWatermark.objects.filter(name=WATERMARK_NAME)
+        .values_list("rolled_until", flat=True)
+        .first()
+    )
+
+
+# ----------------------------------------------------------------------
+# Raw sources
+# ----------------------------------------------------------------------
+def _raw_views(kind):
+    label, fk = VIEW_SOURCES[kind]
+    model = apps.get_model(label)
+    field_names = {f.name for f in model._meta.concrete_fields}
+    qs = model.objects.order_by().annotate(
+        object_id=F(fk),
+        authenticated=ExpressionWrapper(Q(user__isnull=False), output_field=BooleanField()),
+    )
+    if "source" not in field_names:
+        qs = qs.annotate(source_value=Value(""))
+    return qs
+
+
+def _view_dimension(qs, dim):
+    # ResearchDownload has no source column
+    if dim == "source" and "source_value" in qs.query.annotations:
+        return "source_value"
+    return dim
+
+
+def _raw_metrics(metric):
+    spec = METRIC_SOURCES[metric]
+    model = apps.get_model(spec["model"])
+    qs = model.objects.order_by().filter(**spec.get("filter", {}))
+    if spec.get("dimension"):
+        qs = qs.annotate(dimension=F(spec["dimension"]))
+    else:
+        qs = qs.annotate(dimension=Value(""))
+    return qs.exclude(**{f"{spec['time']}__isnull": True})
+
+
+# ----------------------------------------------------------------------
+# Rolling
+# ----------------------------------------------------------------------
+def _roll_views(start, end):
+    from .models import HourlyViewRollup
+
+    rows = []
+    for kind in VIEW_SOURCES:
+        qs = _raw_views(kind).filter(created_at__gte=start, created_at__lt=end)
+        dims = {d: _view_dimension(qs, d) for d in VIEW_DIMENSIONS}
+        grouped = qs.values(*dims.values(), bucket=TruncHour("created_at")).annotate(n=Count("pk"))
+        for row in grouped:
+            rows.append(HourlyViewRollup(
+                hour=row["bucket"],
+                kind=kind,
+                hits=row["n"],
+                **{d: row[column] or ("" if d != "authenticated" else False) for d, column in dims.items()},
+            ))
+    HourlyViewRollup.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def _roll_metrics(start, end):
+    from .models import HourlyMetricRollup
+
+    rows = []
+    for metric, spec in METRIC_SOURCES.items():
+        time_field = spec["time"]
+        qs = _raw_metrics(metric).filter(**{f"{time_field}__gte": start, f"{time_field}__lt": end})
+        aggregates = {"n": Count("pk")}
+        if spec.get("amount"):
+            aggregates["cents"] = Sum(spec["amount"])
+        for row in qs.values("dimension", bucket=TruncHour(time_field)).annotate(**aggregates):
+            rows.append(HourlyMetricRollup(
+                hour=row["bucket"],
+                metric=metric,
+                dimension=row["dimension"] or "",
+                events=row["n"],
+                amount=row.get("cents") or 0,
+            ))
+    HourlyMetricRollup.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def _roll(start, end):
+    """Replace the rollups for [start, end) from raw rows."""
+    from .models import HourlyMetricRollup, HourlyViewRollup
+
+    HourlyViewRollup.objects.filter(hour__gte=start, hour__lt=end).delete()
+    HourlyMetricRollup.objects.filter(hour__gte=start, hour__lt=end).delete()
+    return _roll_views(start, end) + _roll_metrics(start, end)
+
+
+def _earliest_event():
+    earliest = []
+    for label, _fk in VIEW_SOURCES.values():
+        earliest.append(apps.get_model(label).objects.aggregate(t=Min("created_at"))["t"])
+    for spec in METRIC_SOURCES.values():
+        model = apps.get_model(spec["model"])
+        earliest.append(model.objects.aggregate(t=Min(spec["time"]))["t"])
+    earliest = [t for t in earliest if t is not None]
+    return floor_hour(min(earliest)) if earliest else None
+
+
+def update_rollups():
+    """
+    Roll every completed hour since the watermark into the rollup tables.
+
+    Catches up in week-sized transactions on first run or after downtime.
+
+    Schedule: Every 10 minutes
+    """
+    from .models import RollupWatermark
+
+    end = floor_hour(timezone.now() - SETTLE_DELAY)
+    rolled_hours = 0
+    rows = 0
+
+    while True:
+        with transaction.atomic():
+            mark = RollupWatermark.objects.select_for_update().filter(name=WATERMARK_NAME).first()
+            if mark is None:
+                start = _earliest_event() or end
+                mark = RollupWatermark.objects.create(name=WATERMARK_NAME, rolled_until=start)
+            start = mark.rolled_until
+            if start >= end:
+                break
+            stop = min(end, start + CHUNK)
+            rows += _roll(start, stop)
+            mark.rolled_until = stop
+            mark.save(update_fields=["rolled_until"])
+            rolled_hours += int((stop - start).total_seconds() // 3600)
+
+    if not rolled_hours:
+        return "Rollups up to date"
+    logger.info(f"Rolled up {rolled_hours} hour(s) into {rows} row(s)")
+    return f"Rolled up {rolled_hours} hour(s), {rows} rollup row(s)"
+
+
+def reroll(since):
+    """Rebuild the rollups from `since` up to the watermark (after backfills or refunds)."""
+    until = rolled_until()
+    if until is None:
+        return 0
+    start = floor_hour(since)
+    rows = 0
+    while start < until:
+        stop = min(until, start + CHUNK)
+        with transaction.atomic():
+            rows += _roll(start, stop)
+        start = stop
+    return rows
+
+
+# ----------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------
+def _grouped(qs, dims, **aggregates):
+    if not dims:
+        return [qs.aggregate(**aggregates)]
+    return qs.values(*dims).annotate(**aggregates).order_by()
+
+
+def _merge(querysets, dims, sums):
+    totals = {}
+    for qs in querysets:
+        for row in qs:
+            key = tuple(row[d] for d in dims)
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = {**{d: row[d] for d in dims}, **{s: 0 for s in sums}}
+            for s in sums:
+                entry[s] += row[s] or 0
+    return list(totals.values())
+
+
+def _tail_start(since, watermark):
+    if watermark is None:
+        return since
+    if since is None:
+        return watermark
+    return max(since, watermark)
+
+
+def views_by(kind, since=None, *dims, exclude_blank=()):
+    """
+    View/download counts for kind since `since`, grouped by dims.
+
+    dims are any of VIEW_DIMENSIONS plus "date". Returns a list of
+    {dim: value, ..., "count": n} dicts (unordered).
+    """
+    from .models import HourlyViewRollup
+
+    watermark = rolled_until()
+
+    rolled = []
+    if watermark is not None:
+        qs = HourlyViewRollup.objects.filter(kind=kind).annotate(date=TruncDate("hour"))
+        if since is not None:
+            qs = qs.filter(hour__gte=floor_hour(since))
+        for dim in exclude_blank:
+            qs = qs.exclude(**{dim: ""})
+        rolled = _grouped(qs, dims, count=Sum("hits"))
+
+    qs = _raw_views(kind).annotate(date=TruncDate("created_at"))
+    tail_start = _tail_start(since, watermark)
+    if tail_start is not None:
+        qs = qs.filter(created_at__gte=tail_start)
+    for dim in exclude_blank:
+        qs = qs.exclude(**{_view_dimension(qs, dim): ""})
+    columns = {d: _view_dimension(qs, d) for d in dims}
+    tail = [
+        {**{d: row[c] for d, c in columns.items()}, "count": row["count"]}
+        for row in _grouped(qs, list(columns.values()), count=Count("pk"))
+    ]
+
+    return _merge([rolled, tail], dims, ("count",))
+
+
+def views_total(kind, since=None):
+    return sum(row["count"] for row in views_by(kind, since))
+
+
+def metric_by(metric, since=None, *dims):
+    """
+    Event counts (and amount totals, in cents) for metric since `since`.
+
+    dims are "dimension" and/or "date". Returns a list of
+    {dim: value, ..., "count": n, "total": cents} dicts (unordered).
+    """
+    from .models import HourlyMetricRollup
+
+    spec = METRIC_SOURCES[metric]
+    watermark = rolled_until()
+
+    rolled = []
+    if watermark is not None:
+        qs = HourlyMetricRollup.objects.filter(metric=metric).annotate(date=TruncDate("hour"))
+        if since is not None:
+            qs = qs.filter(hour__gte=floor_hour(since))
+        rolled = _grouped(qs, dims, count=Sum("events"), total=Sum("amount"))
+
+    qs = _raw_metrics(metric).annotate(date=TruncDate(spec["time"]))
+    tail_start = _tail_start(since, watermark)
+    if tail_start is not None:
+        qs = qs.filter(**{f"{spec['time']}__gte": tail_start})
+    aggregates = {"count": Count("pk")}
+    if spec.get("amount"):
+        aggregates["total"] = Sum(spec["amount"])
+    tail = [{"total": 0, **row} for row in _grouped(qs, dims, **aggregates)]
+
+    return _merge([rolled, tail], dims, ("count", "total"))
+
+
+def metric_total(metric, since=None):
+    """(event count, amount total in cents) for metric since `since`."""
+    rows = metric_by(metric, since)
+    return sum(r["count"] for r in rows), sum(r["total"] for r in rows)
@@ -280,7 +280,7 @@ class TrackEventSerializer(serializers.Serializer):
     event_type = serializers.ChoiceField(
         choices=UserActivityLog.ActivityType.choices
     )
-    article_id = serializers.IntegerField(required=False)
+    article_id = serializers.UUIDField(required=False)
     company_id = serializers.UUIDField(required=False)
     url = serializers.URLField(required=False)
     referrer = serializers.URLField(required=False)
@@ -288,6 +288,21 @@ class TrackEventSerializer(serializers.Serializer):
     metadata = serializers.DictField(required=False, default=dict)
 
 
+class TrackEventBatchSerializer(serializers.Serializer):
+    """Serializer for a batch of tracked events from one client flush."""
+
+    MAX_EVENTS = 100
+
+    events = TrackEventSerializer(many=True, allow_empty=False)
+
+    def validate_events(self, value):
+        if len(value) > self.MAX_EVENTS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_EVENTS} events per batch."
+            )
+        return value
+
+
 class DateRangeSerializer(serializers.Serializer):
     """Serializer for date range queries."""
 
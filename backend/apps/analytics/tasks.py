@@ -79,83 +79,149 @@ def calculate_daily_metrics():
     return f"Calculated metrics for {yesterday}"
 
 
+CONTENT_PERFORMANCE_WATERMARK_KEY = "analytics:content_performance:watermark"
+
+# Fields rewritten on every ContentPerformance upsert
+CONTENT_PERFORMANCE_FIELDS = [
+    "total_views",
+    "unique_visitors",
+    "avg_read_time",
+    "completion_rate",
+    "total_shares",
+    "total_comments",
+    "views_7d",
+    "views_30d",
+    "trend_direction",
+    "trend_percentage",
+    "engagement_score",
+    "last_calculated",
+]
+
+
 def calculate_content_performance():
     """
     Calculate content performance metrics.
 
-    Runs every hour.
+    Runs every hour. One grouped aggregation over ArticleAnalytics for the
+    articles that changed since the last run, scores computed as arrays,
+    then a single bulk upsert into ContentPerformance.
+
+    An article is recomputed when it has analytics rows updated since the
+    watermark, or rows whose date just slid out of the 7d/30d/previous-week
+    windows (so rolling totals decay on quiet days). If the watermark is
+    lost from cache, everything is recomputed.
     """
+    import numpy as np
+    from django.core.cache import cache
+    from django.db.models import Q
     from apps.news.models import NewsArticle
     from .models import ContentPerformance, ArticleAnalytics
 
-    today = timezone.now().date()
+    run_started = timezone.now()
+    today = run_started.date()
     week_ago = today - timedelta(days=7)
+    prev_week_start = week_ago - timedelta(days=7)
     month_ago = today - timedelta(days=30)
 
-    # Get all published articles
-    articles = NewsArticle.objects.filter(status="published")
+    published = NewsArticle.objects.filter(status="published")
 
-    for article in articles:
-        perf, _ = ContentPerformance.objects.get_or_create(article=article)
-
-        # Aggregate analytics
-        analytics = ArticleAnalytics.objects.filter(article=article)
+    # Published articles without a row yet get zeros (matches the old
+    # get_or_create-for-every-article behaviour).
+    ContentPerformance.objects.bulk_create(
+        [
+            ContentPerformance(article_id=pk)
+            for pk in published.filter(performance__isnull=True).values_list("pk", flat=True)
+        ],
+        ignore_conflicts=True,
+    )
 
-        totals = analytics.aggregate(
+    analytics = ArticleAnalytics.objects.filter(article__in=published)
+
+    watermark = cache.get(CONTENT_PERFORMANCE_WATERMARK_KEY)
+    if watermark is not None:
+        last_day = watermark.date()
+        shift = timedelta(days=(today - last_day).days)
+        changed = Q(updated_at__gt=watermark)
+        if shift:
+            # Dates that crossed a window boundary since the last run
+            for boundary in (week_ago, prev_week_start, month_ago):
+                changed |= Q(date__gte=boundary - shift, date__lt=boundary)
+        article_ids = analytics.filter(changed).values("article_id").distinct()
+        analytics = analytics.filter(article_id__in=article_ids)
+
+    rows = list(
+        analytics.values("article_id").annotate(
             total_views=Sum("page_views"),
             unique_visitors=Sum("unique_visitors"),
             avg_time=Avg("avg_time_on_page"),
             avg_scroll=Avg("scroll_depth_avg"),
             total_shares=Sum("social_shares"),
             total_comments=Sum("comments"),
+            views_7d=Sum("page_views", filter=Q(date__gte=week_ago)),
+            views_30d=Sum("page_views", filter=Q(date__gte=month_ago)),
+            prev_week=Sum(
+                "page_views",
+                filter=Q(date__gte=prev_week_start, date__lt=week_ago),
+            ),
         )
+    )
+
+    if rows:
+        def column(name, dtype=float):
+            return np.array([row[name] or 0 for row in rows], dtype=dtype)
+
+        total_views = column("total_views", np.int64)
+        avg_read_time = column("avg_time").astype(np.int64)
+        avg_scroll = column("avg_scroll")
+        total_shares = column("total_shares", np.int64)
+        total_comments = column("total_comments", np.int64)
+        views_7d = column("views_7d", np.int64)
+        prev_week = column("prev_week", np.int64)
+
+        # Completion rate from scroll depth
+        completion_rate = np.minimum(avg_scroll / 100, 1) * 100
+
+        # Trend vs the previous week (stable when there's no baseline)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = np.where(prev_week > 0, (views_7d - prev_week) / prev_week * 100, 0.0)
+        change = np.clip(change, -9999.99, 9999.99)
+        direction = np.where(change > 5, "up", np.where(change < -5, "down", "stable"))
 
-        perf.total_views = totals["total_views"] or 0
-        perf.unique_visitors = totals["unique_visitors"] or 0
-        perf.avg_read_time = int(totals["avg_time"] or 0)
-        perf.total_shares = totals["total_shares"] or 0
-        perf.total_comments = totals["total_comments"] or 0
-
-        # Calculate completion rate from scroll depth
-        if totals["avg_scroll"]:
-            perf.completion_rate = min(totals["avg_scroll"] / 100, 1) * 100
-
-        # Period views
-        perf.views_7d = analytics.filter(
-            date__gte=week_ago
-        ).aggregate(total=Sum("page_views"))["total"] or 0
-
-        perf.views_30d = analytics.filter(
-            date__gte=month_ago
-        ).aggregate(total=Sum("page_views"))["total"] or 0
-
-        # Calculate trend
-        prev_week = analytics.filter(
-            date__gte=week_ago - timedelta(days=7),
-            date__lt=week_ago
-        ).aggregate(total=Sum("page_views"))["total"] or 0
-
-        if prev_week > 0:
-            change = ((perf.views_7d - prev_week) / prev_week) * 100
-            perf.trend_percentage = change
-            if change > 5:
-                perf.trend_direction = "up"
-            elif change < -5:
-                perf.trend_direction = "down"
-            else:
-                perf.trend_direction = "stable"
-
-        # Calculate engagement score
         # Weighted formula: views (30%) + read time (25%) + shares (25%) + comments (20%)
-        view_score = min(perf.total_views / 10000, 1) * 30
-        time_score = min(perf.avg_read_time / 300, 1) * 25  # 5 min max
-        share_score = min(perf.total_shares / 100, 1) * 25
-        comment_score = min(perf.total_comments / 50, 1) * 20
-        perf.engagement_score = view_score + time_score + share_score + comment_score
+        engagement_score = (
+            np.minimum(total_views / 10000, 1) * 30
+            + np.minimum(avg_read_time / 300, 1) * 25  # 5 min max
+            + np.minimum(total_shares / 100, 1) * 25
+            + np.minimum(total_comments / 50, 1) * 20
+        )
 
-        perf.save()
+        performances = [
+            ContentPerformance(
+                article_id=row["article_id"],
+                total_views=int(total_views[i]),
+                unique_visitors=row["unique_visitors"] or 0,
+                avg_read_time=int(avg_read_time[i]),
+                completion_rate=round(float(completion_rate[i]), 2),
+                total_shares=int(total_shares[i]),
+                total_comments=int(total_comments[i]),
+                views_7d=int(views_7d[i]),
+                views_30d=row["views_30d"] or 0,
+                trend_direction=str(direction[i]),
+                trend_percentage=round(float(change[i]), 2),
+                engagement_score=round(float(engagement_score[i]), 2),
+            )
+            for i, row in enumerate(rows)
+        ]
+        ContentPerformance.objects.bulk_create(
+            performances,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["article"],
+            update_fields=CONTENT_PERFORMANCE_FIELDS,
+        )
 
-    return f"Updated performance for {articles.count()} articles"
+    cache.set(CONTENT_PERFORMANCE_WATERMARK_KEY, run_started, None)
+    return f"Updated performance for {len(rows)} articles"
 
 
 def update_top_content():
@@ -0,0 +1,489 @@
+"""
+Tests for the Analytics app.
+"""
+import io
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.news.models import ArticleView, Category, NewsArticle
+
+from .models import ArticleAnalytics, ContentPerformance, UserActivityLog
+
+
+class EventWriterTests(TestCase):
+    """Test cases for writing buffered event rows."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.article = NewsArticle.objects.create(
+            title="Tracked", content="Body", excerpt="Excerpt", category=category,
+        )
+
+    def test_bad_rows_are_rejected_not_fatal(self):
+        """Deleted FK targets and invalid values are skipped, the rest written."""
+        from .counters import write_events
+
+        rejected = []
+        written = write_events("article_view", [
+            {"article_id": str(self.article.pk), "user_id": str(uuid.uuid4()), "time_on_page": "12"},
+            {"article_id": str(uuid.uuid4())},
+            {"article_id": str(self.article.pk), "time_on_page": "soon"},
+            {"article_id": "not-a-uuid"},
+        ], rejected)
+
+        self.assertEqual(written, 1)
+        self.assertEqual(len(rejected), 3)
+        view = ArticleView.objects.get()
+        self.assertIsNone(view.user_id)  # Unknown nullable FK cleared
+        self.assertEqual(view.time_on_page, 12)
+
+
+class ViewRollupTests(TestCase):
+    """Test cases for the hourly analytics rollups."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.article = NewsArticle.objects.create(
+            title="Rolled", content="Body", excerpt="Excerpt", category=category,
+        )
+
+    def test_rollup_plus_live_tail(self):
+        """Completed hours are rolled once; the current hour is read live."""
+        from .models import HourlyViewRollup
+        from .rollups import update_rollups, views_by, views_total
+
+        ArticleView.objects.bulk_create([
+            ArticleView(article=self.article, country="ZW", source="search")
+            for _ in range(3)
+        ])
+        ArticleView.objects.update(created_at=timezone.now() - timedelta(hours=3))
+        ArticleView.objects.create(article=self.article, country="ZA", source="direct")
+
+        update_rollups()
+        update_rollups()  # Second run is a no-op
+
+        self.assertEqual(HourlyViewRollup.objects.get().hits, 3)
+        self.assertEqual(views_total("article_view"), 4)
+        self.assertEqual(views_total("article_view", timezone.now() - timedelta(hours=1)), 1)
+        by_country = {r["country"]: r["count"] for r in views_by("article_view", None, "country")}
+        self.assertEqual(by_country, {"ZW": 3, "ZA": 1})
+
+
+class GeoDatabaseTests(SimpleTestCase):
+    """Test cases for the compiled GeoIP range table."""
+
+    ROWS = [
+        ["start_ip", "end_ip", "country_code", "country_name", "region", "city"],
+        ["10.0.0.0", "10.0.0.255", "NG", "Nigeria", "Lagos", "Ikeja"],
+        ["10.0.2.0", "10.0.2.255", "GH", "Ghana", "Greater Accra", "Accra"],
+        ["2001:db8::", "2001:db8::ffff", "KE", "Kenya", "Nairobi", "Nairobi"],
+        ["not-an-ip", "x", "ZZ"],
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "geoip.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _table(self):
+        from .geodb import RangeTable
+
+        table = RangeTable(self.path)
+        self.addCleanup(table.close)
+        return table
+
+    def test_range_lookup_boundaries_and_misses(self):
+        from .geodb import compile_csv
+
+        self.assertEqual(compile_csv(self.ROWS, self.path), 3)
+        table = self._table()
+
+        for ip in ("10.0.0.0", "10.0.0.128", "10.0.0.255"):
+            self.assertEqual(table.lookup(ip)["city"], "Ikeja")
+        self.assertEqual(table.lookup("10.0.2.0")["country"], "GH")
+        self.assertEqual(table.lookup("2001:db8::ffff")["country_name"], "Kenya")
+
+        # Before the first range, in the gap between ranges, after the last
+        for ip in ("9.255.255.255", "10.0.1.0", "10.0.1.255", "10.0.3.0", "2001:db8::1:0"):
+            self.assertIsNone(table.lookup(ip))
+
+    def test_rejects_foreign_file(self):
+        from .geodb import RangeTable
+
+        with open(self.path, "wb") as f:
+            f.write(b"NOPE" + bytes(16))
+        with self.assertRaises(ValueError):
+            RangeTable(self.path)
+
+    def test_refresh_geoip_compiles_csv(self):
+        from .geodb import LocalGeoDatabase
+
+        source = os.path.join(self.tmp.name, "ip-city.csv")
+        with open(source, "w", newline="", encoding="utf-8") as f:
+            f.write("\n".join(",".join(row) for row in self.ROWS))
+
+        call_command("refresh_geoip", file=source, output=self.path, min_ranges=3, stdout=io.StringIO())
+        self.assertEqual(self._table().lookup("10.0.2.10")["region"], "Greater Accra")
+
+        db = LocalGeoDatabase()
+        with self.settings(GEOIP_DB_PATH=self.path):
+            self.assertTrue(db.available)
+            self.assertEqual(db.lookup("10.0.0.1")["country"], "NG")
+            self.assertEqual(db.lookup("192.0.2.1")["country"], "")
+            self.assertEqual(db.lookup("garbage")["country"], "")
+        db._table.close()
+
+    def test_refresh_geoip_keeps_current_database_on_bad_source(self):
+        from .geodb import compile_csv
+
+        compile_csv(self.ROWS, self.path)
+        short = os.path.join(self.tmp.name, "short.csv")
+        with open(short, "w") as f:
+            f.write("start_ip,end_ip,country_code\n10.0.9.0,10.0.9.255,ZA\n")
+        empty = os.path.join(self.tmp.name, "empty.csv")
+        with open(empty, "w") as f:
+            f.write("start_ip,end_ip,country_code\n")
+
+        for source, min_ranges in ((short, 2), (empty, 0)):
+            with self.assertRaises(CommandError):
+                call_command(
+                    "refresh_geoip", file=source, output=self.path, min_ranges=min_ranges, stdout=io.StringIO(),
+                )
+
+        self.assertEqual(self._table().lookup("10.0.0.1")["country"], "NG")
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_reload_swaps_in_the_new_table(self):
+        from . import geodb
+
+        geodb.compile_csv(self.ROWS, self.path)
+        db = geodb.LocalGeoDatabase()
+        with self.settings(GEOIP_DB_PATH=self.path):
+            self.assertTrue(db.available)
+            old = db._table
+            self.addCleanup(old.close)
+
+            geodb.compile_csv([["10.0.0.0", "10.0.0.255", "ZA"]], f"{self.path}.new")
+            os.replace(f"{self.path}.new", self.path)
+            os.utime(self.path, (1, 1))
+            db._checked_at = 0.0
+            self.assertTrue(db.available)
+
+        self.assertIsNot(db._table, old)
+        self.addCleanup(db._table.close)
+        self.assertEqual(db.lookup("10.0.0.1")["country"], "ZA")
+        # A lookup still holding the old table can finish reading it
+        self.assertEqual(old.lookup("10.0.0.1")["country"], "NG")
+
+
+class StreamClient:
+    """In-memory stand-in for the Redis stream commands the flusher uses."""
+
+    def __init__(self):
+        self.keys = {}
+        self.streams = {}
+        self._seq = 0
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.keys.pop(key, None)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entry_id = f"{int(time.time() * 1000) - 5000}-{self._seq}".encode()
+        self.streams.setdefault(key, []).append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+        return entry_id
+
+    def xlen(self, key):
+        return len(self.streams.get(key, []))
+
+    def xrange(self, key, count=None):
+        return list(self.streams.get(key, [])[:count])
+
+    def xdel(self, key, *entry_ids):
+        self.streams[key] = [e for e in self.streams.get(key, []) if e[0] not in entry_ids]
+
+
+class TrackEventBatchTests(APITestCase):
+    """Test cases for the batched event tracking endpoint."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.article = NewsArticle.objects.create(
+            title="Tracked", content="Body", excerpt="Excerpt", category=category,
+        )
+        self.url = reverse("api-v1:analytics:track-batch")
+
+    def test_queued_without_touching_the_database(self):
+        """IDs are passed through as sent; unknown ones are cleared when the batch is written."""
+        unknown = uuid.uuid4()
+        events = [
+            {"event_type": "article_read", "article_id": str(self.article.pk)},
+            {"event_type": "article_read", "article_id": str(unknown)},
+        ]
+        with mock.patch("apps.analytics.views.queue_events", return_value=2) as queue:
+            with self.assertNumQueries(0):
+                response = self.client.post(self.url, {"events": events}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        rows = queue.call_args.args[1]
+        self.assertEqual([row["article_id"] for row in rows], [self.article.pk, unknown])
+
+    def test_written_inline_without_redis(self):
+        events = [
+            {"event_type": "article_read", "article_id": str(self.article.pk)},
+            {"event_type": "article_read", "article_id": str(uuid.uuid4())},
+        ]
+        response = self.client.post(self.url, {"events": events}, format="json")
+
+        self.assertEqual(response.data["accepted"], 2)
+        self.assertEqual(UserActivityLog.objects.count(), 2)
+        self.assertEqual(UserActivityLog.objects.filter(article=self.article).count(), 1)
+
+    def test_batch_limits(self):
+        response = self.client.post(self.url, {"events": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        events = [{"event_type": "page_view"}] * 101
+        response = self.client.post(self.url, {"events": events}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UserActivityLog.objects.exists())
+
+
+class EventIngesterTests(TestCase):
+    """Test cases for the run_event_ingester worker."""
+
+    def setUp(self):
+        self.conn = StreamClient()
+        for target in ("apps.analytics.counters", "apps.analytics.management.commands.run_event_ingester"):
+            patcher = mock.patch(f"{target}.get_redis_client", return_value=self.conn)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self):
+        with mock.patch(
+            "apps.analytics.management.commands.run_event_ingester.time.sleep",
+            side_effect=KeyboardInterrupt,
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("run_event_ingester", batch_size=2, max_wait_ms=1000, stdout=io.StringIO())
+
+    def test_requires_redis(self):
+        with mock.patch(
+            "apps.analytics.management.commands.run_event_ingester.get_redis_client",
+            return_value=None,
+        ):
+            with self.assertRaises(CommandError):
+                call_command("run_event_ingester", stdout=io.StringIO())
+
+    def test_drains_stream_and_dead_letters_bad_rows(self):
+        """Every entry is acknowledged; rows that can't be written go to the dead stream."""
+        for payload in (
+            {"activity_type": "page_view", "url": "https://example.com/a"},
+            {"activity_type": "search", "search_query": "x" * 600},
+            {"activity_type": "page_view", "article_id": str(uuid.uuid4())},
+        ):
+            self.conn.xadd("events:activity", {"data": json.dumps(payload)})
+        self.conn.xadd("events:activity", {"data": "{not json"})
+
+        self._run()
+
+        self.assertEqual(self.conn.xlen("events:activity"), 0)
+        self.assertEqual(UserActivityLog.objects.count(), 2)
+        self.assertIsNone(UserActivityLog.objects.get(activity_type="page_view", url="").article_id)
+        dead = self.conn.xrange("events:activity:dead")
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(json.loads(dead[0][1][b"data"])["activity_type"], "search")
+        self.assertNotIn("events:activity:lock", self.conn.keys)
+
+
+class ContentPerformanceTests(TestCase):
+    """Test cases for the hourly content performance rollup."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.article = NewsArticle.objects.create(
+            title="Measured", content="Body", excerpt="Excerpt", category=category,
+            status=NewsArticle.Status.PUBLISHED,
+        )
+        self.quiet = NewsArticle.objects.create(
+            title="Quiet", content="Body", excerpt="Excerpt", category=category,
+            status=NewsArticle.Status.PUBLISHED,
+        )
+        NewsArticle.objects.create(title="Draft", content="Body", excerpt="Excerpt", category=category)
+
+        today = timezone.now().date()
+        self.recent = ArticleAnalytics.objects.create(
+            article=self.article, date=today, hour=9, page_views=100, unique_visitors=80,
+            avg_time_on_page=120, scroll_depth_avg=60, social_shares=10, comments=5,
+        )
+        ArticleAnalytics.objects.create(
+            article=self.article, date=today - timedelta(days=10), hour=9, page_views=50,
+            unique_visitors=40, avg_time_on_page=240, scroll_depth_avg=80, comments=5,
+        )
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_aggregates_and_rerun_updates_in_place(self):
+        """The second run goes through the watermark path and upserts the changed article."""
+        from django.core.cache import cache
+        from .tasks import calculate_content_performance
+
+        self.addCleanup(cache.clear)
+
+        calculate_content_performance()
+
+        self.assertEqual(ContentPerformance.objects.count(), 2)  # Not the draft
+        perf = ContentPerformance.objects.get(article=self.article)
+        self.assertEqual(perf.total_views, 150)
+        self.assertEqual(perf.unique_visitors, 120)
+        self.assertEqual(perf.avg_read_time, 180)
+        self.assertEqual(perf.completion_rate, Decimal("70.00"))
+        self.assertEqual(perf.total_shares, 10)
+        self.assertEqual(perf.total_comments, 10)
+        self.assertEqual((perf.views_7d, perf.views_30d), (100, 150))
+        self.assertEqual(perf.trend_direction, "up")
+        self.assertEqual(perf.trend_percentage, Decimal("100.00"))
+        # 0.45 views + 15 read time + 2.5 shares + 4 comments
+        self.assertEqual(perf.engagement_score, Decimal("21.95"))
+
+        quiet = ContentPerformance.objects.get(article=self.quiet)
+        self.assertEqual((quiet.total_views, quiet.trend_direction), (0, "stable"))
+
+        self.recent.page_views = 300
+        self.recent.save()
+        calculate_content_performance()
+
+        self.assertEqual(ContentPerformance.objects.count(), 2)
+        perf = ContentPerformance.objects.get(pk=perf.pk)
+        self.assertEqual(perf.total_views, 350)
+        self.assertEqual(perf.views_7d, 300)
+        self.assertEqual(perf.trend_percentage, Decimal("500.00"))
+
+
+class SetClient:
+    """In-memory stand-in for the Redis set commands viewer_state uses."""
+
+    def __init__(self):
+        self.keys = {}
+        self._results = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        results, self._results = self._results, []
+        return results
+
+    def exists(self, key):
+        return key in self.keys
+
+    def get(self, key):
+        value = self.keys.get(key)
+        return None if value is None else str(value).encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.keys.pop(key, None)
+        self._results.append(None)
+
+    def incr(self, key):
+        self.keys[key] = int(self.keys.get(key, 0)) + 1
+        self._results.append(self.keys[key])
+
+    def expire(self, key, ttl):
+        self._results.append(True)
+
+    def sismember(self, key, member):
+        self._results.append(member in self.keys.get(key, set()))
+
+    def eval(self, script, numkeys, key, generation_key, generation, ttl, *members):
+        """POPULATE_SCRIPT: store the set only if the generation hasn't moved."""
+        if (self.get(generation_key) or b"") != generation:
+            return 0
+        self.keys[key] = set(members)
+        return 1
+
+
+class ViewerStateTests(TestCase):
+    """Test cases for the per-viewer liked/saved Redis sets."""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        self.user = get_user_model().objects.create_user(email="viewer@example.com", password="testpass123")
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.article = NewsArticle.objects.create(
+            title="Liked", content="Body", excerpt="Excerpt", category=category,
+        )
+        self.request = mock.Mock(user=self.user)
+        self.key = f"viewer_state:article_like:user:{self.user.pk}"
+        self.conn = SetClient()
+        patcher = mock.patch("apps.analytics.viewer_state.get_redis_client", return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def toggle(self):
+        from apps.news.models import ArticleLike
+
+        from .viewer_state import invalidate
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ArticleLike.objects.create(article=self.article, user=self.user)
+            invalidate(self.request, "article_like")
+
+    def test_invalidation_waits_for_commit(self):
+        from .viewer_state import ViewerState, invalidate
+
+        self.assertFalse(ViewerState(self.request).has("article_like", self.article.pk))
+        with self.captureOnCommitCallbacks() as callbacks:
+            invalidate(self.request, "article_like")
+        self.assertIn(self.key, self.conn.keys)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotIn(self.key, self.conn.keys)
+
+    def test_toggle_during_load_is_not_cached(self):
+        """A set loaded before a toggle committed is thrown away, not served stale."""
+        from .viewer_state import ViewerState
+
+        store = self.conn.eval
+
+        def toggle_then_store(*args):
+            self.toggle()  # Lands after the reader's query, before it stores the set
+            return store(*args)
+
+        with mock.patch.object(self.conn, "eval", side_effect=toggle_then_store):
+            self.assertTrue(ViewerState(self.request).has("article_like", self.article.pk))
+        self.assertNotIn(self.key, self.conn.keys)
+
+        self.assertTrue(ViewerState(self.request).has("article_like", self.article.pk))
+        self.assertIn(str(self.article.pk), self.conn.keys[self.key])
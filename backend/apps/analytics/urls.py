@@ -23,5 +23,6 @@ urlpatterns = [
     path("insights/", content_insights, name="content-insights"),
     path("comprehensive/", views.ComprehensiveAnalyticsView.as_view(), name="comprehensive"),
     path("track/", views.TrackEventView.as_view(), name="track"),
+    path("track/batch/", views.TrackEventBatchView.as_view(), name="track-batch"),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,195 @@
+"""
+Per-viewer liked/saved state, resolved in bulk.
+
+`is_liked` / `is_saved` used to be an exists() query per object per flag.
+Instead each viewer (user, or anonymous visitor key) has one Redis set per
+kind holding every object ID they liked/saved:
+
+    viewer_state:article_like:user:<user id>
+    viewer_state:report_save:visitor:<visitor key>
+
+The set is loaded from the database in one query the first time it's
+needed (a sentinel member marks "loaded, possibly empty") and expires after
+CacheTTL.LONG. A page of objects is then checked with one pipelined round
+trip. The like/save toggles call `invalidate`, which once the toggle has
+committed drops the set and bumps the viewer's generation counter
+(viewer_state:gen:<kind>:<viewer>). A reader notes the generation before
+loading from the database and only stores the set if it hasn't moved, so
+a load that raced a toggle can't put stale answers back for CacheTTL.LONG.
+
+`get_viewer_state(request)` memoizes answers on the request, so detail
+serializers and the bulk `viewer-state` endpoints share one loader. When
+Redis isn't available (dummy cache in tests, Redis outage) a page costs one
+`<target>__in` query per kind instead.
+"""
+import logging
+import uuid
+
+from django.apps import apps
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from apps.core.cache import CacheTTL
+
+from .counters import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "viewer_state"
+SENTINEL = "-"
+MAX_PAGE_IDS = 100
+
+# kind -> (model label, target FK attname)
+KINDS = {
+    "article_like": ("news.ArticleLike", "article_id"),
+    "article_save": ("news.ArticleSave", "article_id"),
+    "report_like": ("research.ResearchLike", "report_id"),
+    "report_save": ("research.ResearchSave", "report_id"),
+}
+
+# KEYS: set, generation. ARGV: generation read before the load, TTL,
+# members. Stores the set only if no invalidation happened since.
+POPULATE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def _viewer_lookup(request):
+    """(viewer key, queryset filter) for the request's user or visitor, or (None, None)."""
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}", {"user": request.user}
+    from .geoip import get_visitor_key
+
+    visitor_id = get_visitor_key(request)
+    if not visitor_id:
+        return None, None
+    return f"visitor:{visitor_id}", {"user__isnull": True, "session_key": visitor_id}
+
+
+def _key(kind: str, viewer: str) -> str:
+    return f"{KEY_PREFIX}:{kind}:{viewer}"
+
+
+def _generation_key(kind: str, viewer: str) -> str:
+    return f"{KEY_PREFIX}:gen:{kind}:{viewer}"
+
+
+def _drop(kind: str, viewer: str):
+    conn = get_redis_client()
+    if conn is None:
+        return
+    try:
+        pipe = conn.pipeline()
+        pipe.delete(_key(kind, viewer))
+        pipe.incr(_generation_key(kind, viewer))
+        pipe.expire(_generation_key(kind, viewer), CacheTTL.LONG)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Viewer state invalidation failed for {kind}: {e}")
+
+
+def invalidate(request, kind: str):
+    """Drop the viewer's set for `kind` once the like/save toggle commits."""
+    viewer, _ = _viewer_lookup(request)
+    if viewer is None:
+        return
+    transaction.on_commit(lambda: _drop(kind, viewer))
+
+
+class ViewerState:
+    """Liked/saved answers for one request's viewer."""
+
+    def __init__(self, request):
+        self.viewer, self.lookup = _viewer_lookup(request)
+        self._known = {kind: {} for kind in KINDS}
+
+    def prime(self, kind: str, ids):
+        """Resolve `kind` for every ID in `ids` not answered yet, in one round trip."""
+        known = self._known[kind]
+        missing = [str(pk) for pk in ids if str(pk) not in known]
+        if not missing:
+            return
+        if self.viewer is None:
+            known.update(dict.fromkeys(missing, False))
+            return
+        found = self._from_redis(kind, missing)
+        if found is None:
+            found = self._from_db(kind, missing)
+        for pk in missing:
+            known[pk] = pk in found
+
+    def has(self, kind: str, pk) -> bool:
+        self.prime(kind, [pk])
+        return self._known[kind][str(pk)]
+
+    def ids(self, kind: str, ids) -> list:
+        """The subset of `ids` the viewer has liked/saved, as strings, in input order."""
+        self.prime(kind, ids)
+        known = self._known[kind]
+        return [str(pk) for pk in ids if known[str(pk)]]
+
+    def _queryset(self, kind: str):
+        label, target = KINDS[kind]
+        return apps.get_model(label).objects.filter(**self.lookup), target
+
+    def _from_db(self, kind: str, ids) -> set:
+        queryset, target = self._queryset(kind)
+        return {str(pk) for pk in queryset.filter(**{f"{target}__in": ids}).values_list(target, flat=True)}
+
+    def _from_redis(self, kind: str, ids):
+        conn = get_redis_client()
+        if conn is None:
+            return None
+        key = _key(kind, self.viewer)
+        generation_key = _generation_key(kind, self.viewer)
+        try:
+            if not conn.exists(key):
+                generation = conn.get(generation_key) or b""
+                queryset, target = self._queryset(kind)
+                members = [str(pk) for pk in queryset.values_list(target, flat=True)]
+                stored = conn.eval(
+                    POPULATE_SCRIPT, 2, key, generation_key, generation, CacheTTL.LONG, SENTINEL, *members,
+                )
+                if not stored:
+                    return None  # A toggle landed mid-load; ask the database
+            pipe = conn.pipeline(transaction=False)
+            for pk in ids:
+                pipe.sismember(key, pk)
+            return {pk for pk, member in zip(ids, pipe.execute()) if member}
+        except Exception as e:
+            logger.warning(f"Viewer state lookup failed for {kind}, using the database: {e}")
+            return None
+
+
+def get_viewer_state(request) -> ViewerState:
+    """The request's ViewerState, created on first use."""
+    state = getattr(request, "_viewer_state", None)
+    if state is None:
+        state = request._viewer_state = ViewerState(request)
+    return state
+
+
+def page_state(request, prefix: str) -> dict:
+    """
+    {"liked": [...], "saved": [...]} for the comma-separated UUIDs in
+    ?ids=, for the `viewer-state` endpoints (prefix "article" / "report").
+    """
+    raw = [pk for pk in request.query_params.get("ids", "").split(",") if pk.strip()]
+    if len(raw) > MAX_PAGE_IDS:
+        raise ValidationError({"ids": f"At most {MAX_PAGE_IDS} IDs per request."})
+    try:
+        ids = [str(uuid.UUID(pk.strip())) for pk in raw]
+    except ValueError:
+        raise ValidationError({"ids": "Expected comma-separated UUIDs."})
+
+    state = get_viewer_state(request)
+    return {
+        "liked": state.ids(f"{prefix}_like", ids),
+        "saved": state.ids(f"{prefix}_save", ids),
+    }
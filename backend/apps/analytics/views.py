@@ -14,12 +14,16 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.pagination import LogPagination
 from apps.core.permissions import IsAdmin, IsEditor
 from apps.news.models import NewsArticle, ArticleView, Comment, CommentLike
+from apps.news.serializers import NewsArticleListSerializer
 from apps.users.models import User
 from apps.engagement.models import NewsletterSubscription
-from apps.subscriptions.models import Subscription, Payment
+from apps.subscriptions.models import Subscription
 
+from .counters import queue_events
+from .rollups import metric_by, metric_total, views_total
 from .models import (
     ArticleAnalytics,
     DailyMetrics,
@@ -42,6 +46,7 @@ from .serializers import (
     GeographicAnalyticsSerializer,
     AdminDashboardSerializer,
     TrackEventSerializer,
+    TrackEventBatchSerializer,
 )
 
 
@@ -270,6 +275,7 @@ class SystemHealthViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = SystemHealth.objects.all()
     serializer_class = SystemHealthSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = LogPagination
     ordering_fields = ["timestamp"]
 
     @action(detail=False, methods=["get"])
@@ -295,7 +301,7 @@ class TopContentViewSet(viewsets.ReadOnlyModelViewSet):
     ViewSet for top content rankings.
     """
 
-    queryset = TopContent.objects.all()
+    queryset = NewsArticleListSerializer.setup_queryset(TopContent.objects.all(), prefix="article__")
     serializer_class = TopContentSerializer
     permission_classes = [IsAuthenticated]
     filterset_fields = ["period", "metric_type"]
@@ -441,11 +447,22 @@ class AdminDashboardView(APIView):
         return Response(serializer.data)
 
 
+def _device_type(user_agent: str) -> str:
+    ua = user_agent.lower()
+    if "ipad" in ua or "tablet" in ua:
+        return "tablet"
+    if "mobi" in ua or "android" in ua or "iphone" in ua:
+        return "mobile"
+    return "desktop" if ua else ""
+
+
 class TrackEventView(APIView):
     """
     Endpoint for tracking user events.
 
-    Used by frontend to log user activities.
+    Used by frontend to log user activities. Events are validated here and
+    queued; UserActivityLog rows are bulk-inserted by the event ingester
+    (see apps.analytics.counters), keeping this off the primary's hot path.
     """
 
     permission_classes = [AllowAny]
@@ -454,25 +471,29 @@ class TrackEventView(APIView):
         serializer = TrackEventSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        data = serializer.validated_data
-
-        # Create activity log
-        UserActivityLog.objects.create(
-            user=request.user if request.user.is_authenticated else None,
-            session_id=request.session.session_key or "",
-            activity_type=data["event_type"],
-            article_id=data.get("article_id"),
-            company_id=data.get("company_id"),
-            url=data.get("url", ""),
-            referrer=data.get("referrer", ""),
-            search_query=data.get("search_query", ""),
-            ip_address=self._get_client_ip(request),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            metadata=data.get("metadata", {}),
-        )
+        queue_events("activity", [self._build_row(request, serializer.validated_data)])
 
         return Response({"status": "tracked"}, status=status.HTTP_201_CREATED)
 
+    def _build_row(self, request, data):
+        user_agent = request.META.get("HTTP_USER_AGENT", "")
+        ip = self._get_client_ip(request)
+        return {
+            "user_id": request.user.pk if request.user.is_authenticated else None,
+            "session_id": request.session.session_key or "",
+            "activity_type": data["event_type"],
+            "article_id": data.get("article_id"),
+            "company_id": data.get("company_id"),
+            "url": data.get("url", ""),
+            "referrer": data.get("referrer", ""),
+            "search_query": data.get("search_query", ""),
+            "ip_address": ip,
+            "ip": ip,
+            "user_agent": user_agent[:500],
+            "device_type": _device_type(user_agent),
+            "metadata": data.get("metadata", {}),
+        }
+
     def _get_client_ip(self, request):
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
         if x_forwarded_for:
@@ -480,10 +501,37 @@ class TrackEventView(APIView):
         return request.META.get("REMOTE_ADDR")
 
 
+class TrackEventBatchView(TrackEventView):
+    """
+    Batched variant of TrackEventView.
+
+    POST {"events": [{event_type, ...}, ...]} (max 100) — the client buffers
+    events and flushes them in one request instead of one POST per event.
+    """
+
+    def post(self, request):
+        serializer = TrackEventBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        rows = [
+            self._build_row(request, event)
+            for event in serializer.validated_data["events"]
+        ]
+        accepted = queue_events("activity", rows)
+
+        return Response(
+            {"status": "queued", "accepted": accepted},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
 class ComprehensiveAnalyticsView(APIView):
     """
     Live analytics from real models — no Celery dependency.
     GET ?range=7d|30d|90d|all
+
+    View, signup and revenue series come from the hourly rollups
+    (apps.analytics.rollups) merged with the live partial hour.
     """
 
     permission_classes = [IsAuthenticated, IsAdmin]
@@ -504,21 +552,28 @@ class ComprehensiveAnalyticsView(APIView):
         data = {
             "period": range_key,
             "generated_at": now.isoformat(),
-            "users": self._users(in_period),
+            "users": self._users(in_period, start),
             "content": self._content(in_period),
-            "engagement": self._engagement(in_period),
-            "newsletters": self._newsletters(in_period),
-            "subscriptions": self._subscriptions(in_period),
+            "engagement": self._engagement(in_period, start),
+            "newsletters": self._newsletters(start),
+            "subscriptions": self._subscriptions(start),
         }
         return Response(data)
 
+    @staticmethod
+    def _daily(rows):
+        return sorted(
+            ({"date": row["date"], "count": row["count"]} for row in rows),
+            key=lambda row: row["date"],
+        )
+
     # ------------------------------------------------------------------
     # Users
     # ------------------------------------------------------------------
-    def _users(self, in_period):
+    def _users(self, in_period, start):
         total = User.objects.count()
         active = in_period(User.objects, "last_login").exclude(last_login=None).count()
-        new = in_period(User.objects, "date_joined").count()
+        new, _ = metric_total("user_signup", start)
 
         role_breakdown = list(
             User.objects.values("role")
@@ -530,13 +585,7 @@ class ComprehensiveAnalyticsView(APIView):
             .annotate(count=Count("id"))
             .order_by("-count")
         )
-        registration_trend = list(
-            in_period(User.objects, "date_joined")
-            .annotate(date=TruncDate("date_joined"))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
+        registration_trend = self._daily(metric_by("user_signup", start, "date"))
 
         return {
             "total_users": total,
@@ -589,7 +638,7 @@ class ComprehensiveAnalyticsView(APIView):
     # ------------------------------------------------------------------
     # Engagement
     # ------------------------------------------------------------------
-    def _engagement(self, in_period):
+    def _engagement(self, in_period, start):
         approved = Comment.objects.filter(is_approved=True)
         total_comments = approved.count()
         new_comments = in_period(approved, "created_at").count()
@@ -616,8 +665,8 @@ class ComprehensiveAnalyticsView(APIView):
             .order_by("-comment_count")[:5]
         )
 
-        total_views_raw = ArticleView.objects.count()
-        views_in_period = in_period(ArticleView.objects, "created_at").count()
+        total_views_raw = views_total("article_view")
+        views_in_period = views_total("article_view", start)
         unique_viewers = (
             in_period(ArticleView.objects, "created_at")
             .exclude(user=None)
@@ -642,10 +691,10 @@ class ComprehensiveAnalyticsView(APIView):
     # ------------------------------------------------------------------
     # Newsletters
     # ------------------------------------------------------------------
-    def _newsletters(self, in_period):
+    def _newsletters(self, start):
         total = NewsletterSubscription.objects.count()
         active = NewsletterSubscription.objects.filter(is_active=True).count()
-        new = in_period(NewsletterSubscription.objects, "created_at").count()
+        new, _ = metric_total("newsletter_signup", start)
 
         by_type = list(
             NewsletterSubscription.objects.filter(is_active=True)
@@ -653,13 +702,7 @@ class ComprehensiveAnalyticsView(APIView):
             .annotate(count=Count("id"))
             .order_by("-count")
         )
-        trend = list(
-            in_period(NewsletterSubscription.objects, "created_at")
-            .annotate(date=TruncDate("created_at"))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
+        trend = self._daily(metric_by("newsletter_signup", start, "date"))
 
         return {
             "total_subscribers": total,
@@ -672,7 +715,7 @@ class ComprehensiveAnalyticsView(APIView):
     # ------------------------------------------------------------------
     # Subscriptions & Revenue
     # ------------------------------------------------------------------
-    def _subscriptions(self, in_period):
+    def _subscriptions(self, start):
         active_by_plan = list(
             Subscription.objects.filter(status="active")
             .values("plan__plan_type", "plan__name")
@@ -685,19 +728,15 @@ class ComprehensiveAnalyticsView(APIView):
             .order_by("-count")
         )
 
-        completed = Payment.objects.filter(status=Payment.Status.COMPLETED)
-        all_time_cents = completed.aggregate(total=Sum("amount"))["total"] or 0
-        period_payments = in_period(completed, "paid_at")
-        period_cents = period_payments.aggregate(total=Sum("amount"))["total"] or 0
+        by_currency = metric_by("payment", None, "dimension")
+        all_time_cents = sum(entry["total"] for entry in by_currency)
+        _, period_cents = metric_total("payment", start)
 
-        revenue_by_currency = list(
-            completed.values("currency")
-            .annotate(total=Sum("amount"), count=Count("id"))
-            .order_by("-total")
-        )
         # Convert cents → dollars for display
-        for entry in revenue_by_currency:
-            entry["total"] = round(entry["total"] / 100, 2)
+        revenue_by_currency = [
+            {"currency": entry["dimension"], "total": round(entry["total"] / 100, 2), "count": entry["count"]}
+            for entry in sorted(by_currency, key=lambda e: -e["total"])
+        ]
 
         mrr_cents = (
             Subscription.objects.filter(status="active")
@@ -705,15 +744,15 @@ class ComprehensiveAnalyticsView(APIView):
             or 0
         )
 
-        revenue_trend = list(
-            in_period(completed, "paid_at")
-            .annotate(date=TruncDate("paid_at"))
-            .values("date", "currency")
-            .annotate(total=Sum("amount"), count=Count("id"))
-            .order_by("date")
-        )
-        for entry in revenue_trend:
-            entry["total"] = round(entry["total"] / 100, 2)
+        revenue_trend = [
+            {
+                "date": entry["date"],
+                "currency": entry["dimension"],
+                "total": round(entry["total"] / 100, 2),
+                "count": entry["count"],
+            }
+            for entry in sorted(metric_by("payment", start, "date", "dimension"), key=lambda e: e["date"])
+        ]
 
         return {
             "active_by_plan": active_by_plan,
@@ -0,0 +1,15 @@
+"""Trigger-maintained full-text search vector + GIN index (Postgres only)."""
+from django.db import migrations
+
+from apps.search.operations import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("columnists", "0001_initial"),
+    ]
+
+    operations = [
+        AddSearchVector("Columnist", [("display_name", "A"), ("title", "B"), ("short_bio", "B"), ("full_bio", "C")]),
+    ]
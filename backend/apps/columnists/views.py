@@ -57,9 +57,8 @@ class ColumnistViewSet(viewsets.ReadOnlyModelViewSet):
         from apps.news.models import NewsArticle
         from apps.news.serializers import NewsArticleListSerializer
 
-        articles = NewsArticle.objects.filter(
-            author=columnist.user,
-            status="published"
+        articles = NewsArticleListSerializer.setup_queryset(
+            NewsArticle.objects.filter(author=columnist.user, status="published")
         ).order_by("-published_at")
 
         page = self.paginate_queryset(articles)
@@ -139,9 +138,8 @@ class ColumnViewSet(viewsets.ReadOnlyModelViewSet):
         from apps.news.serializers import NewsArticleListSerializer
 
         # Assumes NewsArticle has a column FK
-        articles = NewsArticle.objects.filter(
-            column=column,
-            status="published"
+        articles = NewsArticleListSerializer.setup_queryset(
+            NewsArticle.objects.filter(column=column, status="published")
         ).order_by("-published_at")
 
         page = self.paginate_queryset(articles)
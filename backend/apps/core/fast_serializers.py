@@ -0,0 +1,186 @@
+"""
+Fast-path serializers for hot read-only list endpoints.
+
+DRF ModelSerializer builds model instances, walks every field's
+get_attribute / to_representation per row, and re-derives field behaviour
+from model introspection. For read-only lists that cost dominates the
+request. ValuesSerializer instead:
+
+- reads plain dicts from `.values()` (no model instances)
+- compiles, once per class, a list of (output key, column, converter)
+  from the model's field types, so a row is one pass over that list
+- leaves UUIDs, dates and datetimes as native Python values for
+  ORJSONRenderer to serialize (datetimes are converted to the current
+  timezone first, exactly as DRF's DateTimeField does)
+
+Output matches the DRF serializer it replaces key-for-key and byte-for-byte
+after rendering, so clients can't tell which path served them; each fast
+serializer has a test comparing the two.
+
+Subclass usage:
+
+    class CompanyValues(ValuesSerializer):
+        model = Company
+        fields = ("id", "symbol", "exchange_code", "price_change")
+        sources = {"exchange_code": "exchange__code"}
+        extra_columns = ("current_price", "previous_close")
+
+        def get_price_change(self, row): ...
+
+Keys with a `get_<key>` method are computed from the row (like
+SerializerMethodField); everything else is a column, `sources[key]` or the
+key itself. `attach(items, rows)` runs once per page for batch lookups
+(e.g. M2M relations in one extra query).
+"""
+import decimal
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+def decimal_string(value, decimal_places, max_digits=None):
+    """Format like DRF's DecimalField (coerce_to_string, quantized)."""
+    if value is None:
+        return None
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value).strip())
+    context = decimal.getcontext().copy()
+    if max_digits is not None:
+        context.prec = max_digits
+    return "{:f}".format(value.quantize(Decimal(".1") ** decimal_places, context=context))
+
+
+def local_datetime(value):
+    """Current-timezone datetime, as DRF's DateTimeField renders it."""
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        return timezone.localtime(value)
+    return value
+
+
+def _converter(field):
+    if isinstance(field, models.DecimalField):
+        places, digits = field.decimal_places, field.max_digits
+        return lambda value: decimal_string(value, places, digits)
+    if isinstance(field, models.DateTimeField):
+        return local_datetime
+    return None
+
+
+def _resolve_field(model, path):
+    """The model field at the end of an ORM path like "exchange__code"."""
+    field = None
+    for part in path.split("__"):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    if field is not None and field.is_relation and field.many_to_one:
+        # "category" -> the FK column value (category_id)
+        return field.target_field
+    return field
+
+
+class ValuesSerializer:
+    """Read-only serializer over `.values()` rows; see module docstring."""
+
+    model = None
+    fields = ()
+    sources = {}
+    extra_columns = ()  # Columns read only by get_<key> methods
+
+    _plan = None  # Compiled per subclass on first use
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    @classmethod
+    def compile(cls):
+        if cls.__dict__.get("_plan") is None:
+            plan = []
+            columns = []
+            for key in cls.fields:
+                method = getattr(cls, f"get_{key}", None)
+                if method is not None:
+                    plan.append((key, None, method))
+                    continue
+                column = cls.sources.get(key, key)
+                plan.append((key, column, _converter(_resolve_field(cls.model, column))))
+                columns.append(column)
+            for column in cls.extra_columns:
+                if column not in columns:
+                    columns.append(column)
+            cls._columns = tuple(columns)
+            cls._plan = tuple(plan)
+        return cls._plan
+
+    @classmethod
+    def columns(cls):
+        cls.compile()
+        return cls._columns
+
+    @classmethod
+    def values(cls, queryset):
+        """queryset.values() with exactly the columns this serializer reads."""
+        return queryset.values(*cls.columns())
+
+    def to_representation(self, row):
+        item = {}
+        for key, column, convert in self.compile():
+            if column is None:
+                item[key] = convert(self, row)
+            elif convert is None:
+                item[key] = row[column]
+            else:
+                item[key] = convert(row[column])
+        return item
+
+    def attach(self, items, rows):
+        """Hook for per-page batch lookups; items and rows are parallel lists."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        items = [self.to_representation(row) for row in rows]
+        if items:
+            self.attach(items, rows)
+        return items
+
+
+class FastListMixin:
+    """
+    ViewSet mixin serving `list` through a ValuesSerializer.
+
+    Set `fast_serializer_class`, or override get_fast_serializer_class() to
+    return None for requests that need the regular serializer.
+    """
+
+    fast_serializer_class = None
+
+    def get_fast_serializer_class(self):
+        return self.fast_serializer_class
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_fast_serializer_class()
+        if serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = serializer_class(context=self.get_serializer_context())
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer_class.values(queryset)
+
+        # Keyset/cursor paginators read their sort columns from the rows
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            missing = [
+                name for name in (field.lstrip("-") for field in ordering)
+                if name not in serializer_class.columns()
+            ]
+            if missing:
+                rows = queryset.values(*serializer_class.columns(), *missing)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
@@ -0,0 +1,122 @@
+"""
+Benchmark the .values() fast-path serializers against the DRF serializers.
+
+Usage:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --rows 100 --repeat 50
+
+Seeds --rows synthetic companies, tickers and articles inside a
+transaction that is rolled back afterwards, then times one page of each
+endpoint's work (query + serialize + render) both ways and prints the
+best-of-N timings and the speedup.
+"""
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare DRF serializers with the .values() fast paths on synthetic data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50, help="Rows per page (default 50)")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case (default 20)")
+
+    def handle(self, *args, **opts):
+        rows, repeat = opts["rows"], opts["repeat"]
+        with transaction.atomic():
+            self._seed(rows)
+            self.stdout.write(f"{'case':<16}{'drf ms':>10}{'fast ms':>10}{'speedup':>10}")
+            for name, slow, fast in self._cases(rows):
+                slow_ms = self._best(slow, repeat)
+                fast_ms = self._best(fast, repeat)
+                self.stdout.write(
+                    f"{name:<16}{slow_ms:>10.2f}{fast_ms:>10.2f}{slow_ms / fast_ms:>9.1f}x"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _best(func, repeat):
+        func()  # Warm-up (plan compilation, connection)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return min(timings)
+
+    def _seed(self, rows):
+        from apps.markets.models import Company, Exchange, MarketTicker
+        from apps.news.models import Category, NewsArticle
+        from apps.users.models import User, Writer
+
+        self.tag = f"bench{int(time.time())}"
+        exchange = Exchange.objects.create(code=self.tag[-10:].upper(), name="Benchmark", country="ZA")
+        self.companies = Company.objects.bulk_create([
+            Company(
+                symbol=f"B{i:04d}", name=f"Benchmark Company {i}", exchange=exchange,
+                current_price=Decimal("100.1234") + i, previous_close=Decimal("99.5") + i, volume=i * 100,
+            )
+            for i in range(rows)
+        ])
+        now = timezone.now()
+        MarketTicker.objects.bulk_create([
+            MarketTicker(company=self.companies[i % len(self.companies)], timestamp=now,
+                         price=Decimal("10.5"), close=Decimal("10.25"), volume=i)
+            for i in range(rows)
+        ])
+
+        category = Category.objects.create(name=self.tag, slug=self.tag)
+        author = User.objects.create_user(email=f"{self.tag}@example.com", password=None)
+        writer = Writer.objects.create(full_name="Benchmark Writer", slug=self.tag)
+        self.article_ids = []
+        for i in range(rows):
+            article = NewsArticle.objects.create(
+                title=f"{self.tag} article {i}", content="Body " * 150, excerpt="Excerpt",
+                category=category, author=author, writer=writer if i % 2 else None,
+                status=NewsArticle.Status.PUBLISHED, featured_image_url="https://example.com/a.jpg",
+            )
+            article.related_companies.set(self.companies[i % rows:i % rows + 3])
+            self.article_ids.append(article.pk)
+
+    def _cases(self, rows):
+        from apps.markets.models import Company, MarketTicker
+        from apps.markets.serializers import (
+            CompanyMinimalSerializer,
+            CompanyMinimalValues,
+            MarketTickerSerializer,
+            MarketTickerValues,
+        )
+        from apps.news.models import NewsArticle
+        from apps.news.serializers import NewsArticleListSerializer, NewsArticleListValues
+
+        request = Request(APIRequestFactory().get("/"))
+        context = {"request": request}
+        companies = Company.objects.filter(symbol__startswith="B").order_by("symbol")[:rows]
+        tickers = MarketTicker.objects.filter(company__in=self.companies).order_by("-timestamp")[:rows]
+        articles = NewsArticle.objects.filter(pk__in=self.article_ids).order_by("-published_at")[:rows]
+
+        def drf(serializer, queryset):
+            return lambda: JSONRenderer().render(serializer(queryset.all(), many=True, context=context).data)
+
+        def fast(serializer, queryset):
+            return lambda: ORJSONRenderer().render(
+                serializer(context=context).serialize(serializer.values(queryset.all()))
+            )
+
+        return [
+            ("companies", drf(CompanyMinimalSerializer, companies.select_related("exchange")),
+             fast(CompanyMinimalValues, companies)),
+            ("tickers", drf(MarketTickerSerializer, tickers.select_related("company")),
+             fast(MarketTickerValues, tickers)),
+            ("news list", drf(NewsArticleListSerializer, NewsArticleListSerializer.setup_queryset(articles)),
+             fast(NewsArticleListValues, articles)),
+        ]
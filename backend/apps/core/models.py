@@ -5,6 +5,7 @@ Provides:
 - TimeStampedModel: Automatic created_at/updated_at fields
 - UUIDModel: UUID primary key for better security
 - SoftDeleteModel: Soft deletion support
+- TrackedFieldsMixin: Remembers loaded values of selected fields
 """
 import uuid
 
@@ -111,3 +112,43 @@ class BaseModel(UUIDModel, TimeStampedModel, SoftDeleteModel):
     class Meta:
         abstract = True
         ordering = ["-created_at"]
+
+
+class TrackedFieldsMixin:
+    """
+    Remembers the values of `tracked_fields` as loaded from the database,
+    so save hooks can see what changed without re-fetching the row.
+
+    Snapshots are taken in from_db() (deferred fields are skipped) and
+    refreshed after every save. Instances that weren't loaded from the
+    database have no snapshot; `loaded_value` returns MISSING for them.
+    """
+
+    tracked_fields = ()
+    MISSING = object()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self, names=None):
+        names = self.tracked_fields if names is None else set(self.tracked_fields).intersection(names)
+        deferred = self.get_deferred_fields()
+        loaded = getattr(self, "_loaded_values", {})
+        loaded.update({name: getattr(self, name) for name in names if name not in deferred})
+        self._loaded_values = loaded
+
+    def loaded_value(self, name):
+        """The field's value when loaded or last saved, or MISSING if unknown."""
+        return getattr(self, "_loaded_values", {}).get(name, self.MISSING)
+
+    def has_changed(self, name) -> bool:
+        loaded = self.loaded_value(name)
+        return loaded is self.MISSING or loaded != getattr(self, name)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # A partial save only wrote update_fields
+        self._snapshot_tracked_fields(kwargs.get("update_fields"))
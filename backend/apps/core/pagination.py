@@ -2,9 +2,67 @@
 Custom Pagination Classes
 
 Provides standardized pagination for all API endpoints.
+
+Large, append-mostly tables (the news feed, logs) use KeysetPagination:
+each page is `WHERE (sort key) < (last row's key) ORDER BY sort key LIMIT n`
+on a unique (timestamp, id) key, so page 500 costs the same as page 1 and
+rows sharing a timestamp are never skipped or repeated. Counts are skipped
+or estimated (see estimated_count) instead of running COUNT(*) per page.
 """
-from rest_framework.pagination import CursorPagination, PageNumberPagination
+import base64
+import json
+from urllib import parse
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Tables below this size are counted exactly
+ESTIMATE_COUNT_THRESHOLD = 100_000
+
+
+def estimated_count(queryset):
+    """
+    Planner row estimate (pg_class.reltuples) for an unfiltered queryset
+    on Postgres, or None when it can't be estimated that way.
+    """
+    query = queryset.query
+    connection = connections[queryset.db]
+    if (
+        connection.vendor != "postgresql"
+        or query.where
+        or query.distinct
+        or query.is_sliced
+        or query.combinator
+    ):
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # -1 / 0 until the table has been analyzed
+    if not row or row[0] is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator that uses the planner estimate for large unfiltered tables."""
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, "query"):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= ESTIMATE_COUNT_THRESHOLD:
+                return estimate
+        return super().count
 
 
 class StandardResultsPagination(PageNumberPagination):
@@ -25,6 +83,7 @@ class StandardResultsPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    django_paginator_class = EstimatedCountPaginator
 
     def get_paginated_response(self, data):
         return Response(
@@ -63,16 +122,256 @@ class MarketDataPagination(CursorPagination):
         )
 
 
-class InfiniteScrollPagination(CursorPagination):
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on a unique ordering.
+
+    `ordering` must end in a unique column (normally the primary key);
+    NULL sorts as the largest value. A view's OrderingFilter may
+    override the ordering with concrete fields; the primary key is then
+    appended as the tie-breaker.
+
+    Query params:
+    - cursor: opaque position from a previous response's next/previous link
+    - page_size
+    - offset: skip ahead on the first page only (e.g. a client that
+      rendered the first 18 rows server-side asks for the rest), capped at
+      max_offset; deeper positions must use the cursor
+    - count=exact: include COUNT(*); otherwise "count" is a planner
+      estimate for unfiltered tables, or null
+
+    Response format:
+    {
+        "count": 1234 | null,
+        "next": "http://api/endpoint/?cursor=...",
+        "previous": null,
+        "results": [...]
+    }
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    offset_query_param = "offset"
+    max_offset = 500
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        values, reverse = self.decode_cursor(request)
+        offset = 0 if values is not None else self.get_offset(request)
+
+        self.count = self.get_count(queryset, request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(queryset.model, ordering, values))
+        queryset = queryset.order_by(*self._order_expressions(ordering))
+
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None or offset > 0
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_offset(self, request):
+        try:
+            offset = int(request.query_params.get(self.offset_query_param, 0))
+        except ValueError:
+            return 0
+        return min(max(offset, 0), self.max_offset)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(self.ordering)
+        for backend in getattr(view, "filter_backends", []):
+            if not hasattr(backend, "get_ordering"):
+                continue
+            requested = backend().get_ordering(request, queryset, view)
+            if requested and self._is_keyset_safe(queryset.model, requested):
+                pk = queryset.model._meta.pk.name
+                requested = tuple(requested)
+                if requested[-1].lstrip("-") not in (pk, "pk"):
+                    direction = "-" if requested[-1].startswith("-") else ""
+                    requested += (f"{direction}{pk}",)
+                ordering = requested
+            break
+        return ordering
+
+    @staticmethod
+    def _is_keyset_safe(model, ordering):
+        concrete = {f.name for f in model._meta.concrete_fields} | {"pk"}
+        return all(field.lstrip("-") in concrete for field in ordering)
+
+    def get_count(self, queryset, request):
+        if request.query_params.get(self.count_query_param) == "exact":
+            return queryset.count()
+        return estimated_count(queryset)
+
+    # ------------------------------------------------------------------
+    # Seek predicate
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _order_expressions(ordering):
+        # NULL sorts as the largest value (Postgres' native order), so plain
+        # b-tree indexes serve the ordering in either direction.
+        expressions = []
+        for field in ordering:
+            name = field.lstrip("-")
+            if field.startswith("-"):
+                expressions.append(F(name).desc(nulls_first=True))
+            else:
+                expressions.append(F(name).asc(nulls_last=True))
+        return expressions
+
+    @staticmethod
+    def _seek(model, ordering, values):
+        """
+        Rows strictly after `values` in `ordering`: the row comparison
+        (a, b) > (x, y) expanded per column, so mixed directions and NULLs
+        work on every backend.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            nullable = model._meta.get_field(name).null
+            descending = field.startswith("-")
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if descending else None
+                current = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nullable and not descending:
+                    after |= Q(**{f"{name}__isnull": True})
+                current = Q(**{name: value})
+            if after is not None:
+                condition |= equal & after
+            equal &= current
+
+        # Redundant bound on the leading column so the planner can range-scan
+        # an index on it instead of evaluating the OR for every row.
+        field, value = ordering[0], values[0]
+        name = field.lstrip("-")
+        if value is not None and (field.startswith("-") or not model._meta.get_field(name).null):
+            condition &= Q(**{f"{name}__{'lte' if field.startswith('-') else 'gte'}": value})
+        return condition
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+    def _position(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            # Fast-path list endpoints paginate .values() dicts
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif value is not None and not isinstance(value, (int, float, str, bool)):
+                value = str(value)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, values, reverse=False):
+        payload = {"v": values}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        token = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        url = remove_query_param(self.base_url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(parse.unquote(token) + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            values = payload["v"]
+            assert isinstance(values, list) and len(values) == len(self.ordering)
+        except Exception:
+            raise NotFound("Invalid cursor")
+        return values, bool(payload.get("r"))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class InfiniteScrollPagination(KeysetPagination):
     """
     Infinite scroll pagination for news feeds.
 
     Optimized for mobile-friendly infinite scroll UX.
-    Supports page_size query param for larger batch requests.
+    Supports page_size query param for larger batch requests, and `offset`
+    for the homepage's "load more" handoff after its server-rendered page.
     """
 
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
-    ordering = "-published_at"
+    ordering = ("-published_at", "-id")
     cursor_query_param = "cursor"
+
+
+class LogPagination(KeysetPagination):
+    """Keyset pagination for append-only log tables, newest first."""
+
+    page_size = 50
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
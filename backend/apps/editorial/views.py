@@ -19,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 from apps.core.permissions import IsEditor, IsAdmin
 from apps.news.models import NewsArticle
+from apps.news.serializers import NewsArticleListSerializer
 
 from .models import (
     ContentBucket,
@@ -88,9 +89,10 @@ class ContentBucketViewSet(viewsets.ModelViewSet):
     def articles(self, request, slug=None):
         """Get articles in this bucket."""
         bucket = self.get_object()
-        bucket_articles = BucketArticle.objects.filter(
-            bucket=bucket
-        ).select_related("article", "added_by").order_by("order")
+        bucket_articles = NewsArticleListSerializer.setup_queryset(
+            BucketArticle.objects.filter(bucket=bucket).select_related("added_by"),
+            prefix="article__",
+        ).order_by("order")
 
         page = self.paginate_queryset(bucket_articles)
         if page is not None:
@@ -323,24 +325,12 @@ class EditorialAssignmentViewSet(viewsets.ModelViewSet):
         if mine_only:
             qs = qs.filter(assignee=self.request.user)
         # EditorialAssignmentSerializer nests the full NewsArticleListSerializer
-        # for `article`, which in turn serializes category, author (+profile),
-        # writer, and M2M tags/related_companies. Without prefetching those
-        # nested relations we fire 5+ queries PER assignment (N+1). The admin
-        # dashboard calls /assignments/ twice on mount (pending + in_progress),
-        # so a page with 20 assignments previously ran ~200 queries. With the
-        # prefetch chain below it runs ~8 regardless of row count.
-        return qs.select_related(
-            "article",
-            "article__category",
-            "article__author",
-            "article__author__profile",
-            "article__writer",
-            "assignee",
-            "assigned_by",
-        ).prefetch_related(
-            "article__tags",
-            "article__related_companies",
-        )
+        # for `article`. Without its relations loaded up front we fire 5+
+        # queries PER assignment (N+1); the admin dashboard calls
+        # /assignments/ twice on mount (pending + in_progress). Loading them
+        # via the serializer's own declaration keeps the count fixed.
+        qs = qs.select_related("assignee", "assigned_by")
+        return NewsArticleListSerializer.setup_queryset(qs, prefix="article__")
 
     @action(detail=False, methods=["get"])
     def my_assignments(self, request):
@@ -448,7 +438,8 @@ class ContentCalendarViewSet(viewsets.ModelViewSet):
         if end_date:
             qs = qs.filter(scheduled_date__lte=end_date)
 
-        return qs.select_related("article", "bucket", "assigned_to", "created_by")
+        qs = qs.select_related("bucket", "assigned_to", "created_by")
+        return NewsArticleListSerializer.setup_queryset(qs, prefix="article__")
 
     @action(detail=False, methods=["get"])
     def week(self, request):
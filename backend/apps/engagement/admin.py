@@ -3,7 +3,13 @@ Engagement Admin Configuration
 """
 from django.contrib import admin
 
-from .models import NewsletterSubscription, Notification, PriceAlert
+from .models import (
+    NewsletterCampaign,
+    NewsletterDelivery,
+    NewsletterSubscription,
+    Notification,
+    PriceAlert,
+)
 
 
 @admin.register(NewsletterSubscription)
@@ -14,6 +20,33 @@ class NewsletterSubscriptionAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
 
 
+@admin.register(NewsletterCampaign)
+class NewsletterCampaignAdmin(admin.ModelAdmin):
+    list_display = [
+        "key",
+        "newsletter_type",
+        "status",
+        "shards_done",
+        "shard_count",
+        "sent_count",
+        "failed_count",
+        "created_at",
+        "completed_at",
+    ]
+    list_filter = ["newsletter_type", "status"]
+    search_fields = ["key", "subject"]
+    date_hierarchy = "created_at"
+    readonly_fields = ["cursor", "shard_count", "shards_done", "sent_count", "failed_count", "completed_at"]
+
+
+@admin.register(NewsletterDelivery)
+class NewsletterDeliveryAdmin(admin.ModelAdmin):
+    list_display = ["campaign", "subscription", "status", "created_at"]
+    list_filter = ["status"]
+    search_fields = ["campaign__key", "subscription__email"]
+    raw_id_fields = ["campaign", "subscription"]
+
+
 @admin.register(PriceAlert)
 class PriceAlertAdmin(admin.ModelAdmin):
     list_display = [
@@ -0,0 +1,332 @@
+"""
+Newsletter delivery engine.
+
+`deliver_newsletter` renders the HTML and text bodies once, with
+UNSUBSCRIBE_TOKEN where the per-recipient unsubscribe URL goes, stores
+them on a NewsletterCampaign row and fans the send out over the django-q
+workers:
+
+- the scheduler walks active, verified subscribers in ID order and cuts
+  them into shards of SHARD_SIZE consecutive IDs (one indexed keyset query
+  per shard boundary); each shard is one `send_shard` task, enqueued in
+  the same transaction that advances the campaign's cursor and
+  shard_count, so an interrupted scheduler resumes without gaps or
+  duplicate shards
+- a shard streams its ID range in keyset batches of BATCH_SIZE and sends
+  through one mail backend connection (SMTP session / anymail HTTP
+  session) for the whole shard
+- before sending a batch the shard claims its recipients by inserting
+  pending NewsletterDelivery rows; (campaign, subscription) is unique, so
+  a recipient already claimed by another run of the shard is skipped and
+  nobody receives a campaign twice
+- a finished shard records a NewsletterShard marker, unique per
+  (campaign, shard), and only a newly recorded marker advances
+  shards_done, so a re-delivered shard task neither sends nor counts
+  twice; the last shard to finish aggregates sent/failed from the
+  delivery rows and marks the campaign completed
+
+Throughput scales with Q_CLUSTER workers, and no task comes near the
+cluster timeout. A recipient the server refuses is recorded as failed.
+A connection-level error releases the shard's unsent claims and re-queues
+the shard (up to MAX_SHARD_ATTEMPTS); the retry skips everyone already
+delivered. Calling `deliver_newsletter` again with the same key only
+finishes an interrupted schedule.
+"""
+import logging
+import smtplib
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+SHARD_SIZE = 500
+BATCH_SIZE = 200
+MAX_SHARD_ATTEMPTS = 3
+UNSUBSCRIBE_TOKEN = "%%UNSUBSCRIBE_URL%%"
+
+
+def unsubscribe_url(token: str) -> str:
+    frontend_url = getattr(settings, "FRONTEND_URL", "https://bgfi.global")
+    return f"{frontend_url}/newsletter/unsubscribe?token={token}"
+
+
+def _refused_errors() -> tuple:
+    """Per-recipient errors: count as failed and move on."""
+    errors = (smtplib.SMTPRecipientsRefused,)
+    try:
+        from anymail.exceptions import AnymailRecipientsRefused
+
+        errors += (AnymailRecipientsRefused,)
+    except ImportError:
+        pass
+    return errors
+
+
+def get_campaign(key, newsletter_type, subject, template, context, from_email=None):
+    """The campaign for `key`, rendering its bodies on first use."""
+    from .models import NewsletterCampaign
+
+    campaign = NewsletterCampaign.objects.filter(key=key).first()
+    if campaign is not None:
+        return campaign
+
+    context = {**context, "unsubscribe_url": UNSUBSCRIBE_TOKEN}
+    campaign, _ = NewsletterCampaign.objects.get_or_create(
+        key=key,
+        defaults={
+            "newsletter_type": newsletter_type,
+            "subject": subject[:255],
+            "from_email": from_email or settings.DEFAULT_FROM_EMAIL,
+            "html_body": render_to_string(f"{template}.html", context),
+            "text_body": render_to_string(f"{template}.txt", context),
+        },
+    )
+    return campaign
+
+
+def subscribers(newsletter_type):
+    from .models import NewsletterSubscription
+
+    return NewsletterSubscription.objects.filter(
+        newsletter_type=newsletter_type,
+        is_active=True,
+        is_verified=True,
+    )
+
+
+def build_message(campaign, email, token, connection=None):
+    url = unsubscribe_url(token)
+    message = EmailMultiAlternatives(
+        subject=campaign.subject,
+        body=campaign.text_body.replace(UNSUBSCRIBE_TOKEN, url),
+        from_email=campaign.from_email,
+        to=[email],
+        headers={"List-Unsubscribe": f"<{url}>"},
+        connection=connection,
+    )
+    message.attach_alternative(campaign.html_body.replace(UNSUBSCRIBE_TOKEN, escape(url)), "text/html")
+    return message
+
+
+def send_batch(campaign, recipients, connection) -> tuple:
+    """
+    Send to [(subscription id, email, unsubscribe token)] over an open
+    connection. Returns (sent ids, failed ids, error or None); sending stops
+    at the first connection-level error.
+    """
+    refused = _refused_errors()
+    sent, failed = [], []
+    for pk, email, token in recipients:
+        try:
+            connection.send_messages([build_message(campaign, email, token, connection)])
+        except refused as e:
+            logger.warning(f"Newsletter {campaign.key}: recipient refused {email}: {e}")
+            failed.append(pk)
+            continue
+        except Exception as e:
+            return sent, failed, e
+        sent.append(pk)
+    return sent, failed, None
+
+
+# =========================
+# Claims
+# =========================
+
+def claim_recipients(campaign, recipients, claim: str) -> list:
+    """The recipients this run may send to: those nobody has claimed yet."""
+    from .models import NewsletterDelivery
+
+    ids = [pk for pk, _, _ in recipients]
+    NewsletterDelivery.objects.bulk_create(
+        [NewsletterDelivery(campaign=campaign, subscription_id=pk, claim=claim) for pk in ids],
+        ignore_conflicts=True,
+    )
+    mine = set(
+        NewsletterDelivery.objects.filter(
+            campaign=campaign, claim=claim, subscription_id__in=ids
+        ).values_list("subscription_id", flat=True)
+    )
+    return [recipient for recipient in recipients if recipient[0] in mine]
+
+
+def _record(campaign, claim: str, ids, status):
+    from .models import NewsletterDelivery
+
+    if ids:
+        NewsletterDelivery.objects.filter(
+            campaign=campaign, claim=claim, subscription_id__in=ids
+        ).update(status=status)
+
+
+def release_claims(campaign, claim: str):
+    """Un-claim this run's recipients that were never sent, so a retry picks them up."""
+    from .models import NewsletterDelivery
+
+    NewsletterDelivery.objects.filter(
+        campaign=campaign, claim=claim, status=NewsletterDelivery.Status.PENDING
+    ).delete()
+
+
+# =========================
+# Shards
+# =========================
+
+def _shard_task_name(campaign, after, attempt=1) -> str:
+    name = f"newsletter:{campaign.key}:after:{after or 'start'}"
+    return name if attempt == 1 else f"{name}:attempt:{attempt}"
+
+
+def send_shard(campaign_id, after, upto, attempt=1):
+    """
+    django-q task: send campaign `campaign_id` to subscribers with
+    after < id <= upto (after "" for the first shard).
+    """
+    from django_q.tasks import async_task
+
+    from .models import NewsletterCampaign, NewsletterDelivery, NewsletterShard
+
+    campaign = NewsletterCampaign.objects.filter(pk=campaign_id).first()
+    if campaign is None:
+        return f"Campaign {campaign_id} not found"
+    if NewsletterShard.objects.filter(campaign=campaign, after=after or "").exists():
+        return f"Shard after {after or 'start'} already finished"
+
+    claim = uuid.uuid4().hex
+    queryset = subscribers(campaign.newsletter_type).filter(id__lte=upto).order_by("id")
+    cursor = after
+    sent = failed = 0
+    try:
+        with get_connection() as connection:
+            while True:
+                batch = queryset.filter(id__gt=cursor) if cursor else queryset
+                recipients = list(batch.values_list("id", "email", "unsubscribe_token")[:BATCH_SIZE])
+                if not recipients:
+                    break
+                cursor = recipients[-1][0]
+                sent_ids, failed_ids, error = send_batch(
+                    campaign, claim_recipients(campaign, recipients, claim), connection
+                )
+                _record(campaign, claim, sent_ids, NewsletterDelivery.Status.SENT)
+                _record(campaign, claim, failed_ids, NewsletterDelivery.Status.FAILED)
+                sent += len(sent_ids)
+                failed += len(failed_ids)
+                if error is not None:
+                    raise error
+    except Exception as e:
+        release_claims(campaign, claim)
+        if attempt < MAX_SHARD_ATTEMPTS:
+            logger.warning(f"Newsletter {campaign.key} shard after {after or 'start'} failed (attempt {attempt}), re-queued: {e}")
+            async_task(
+                "apps.engagement.delivery.send_shard",
+                campaign_id, after, upto, attempt=attempt + 1,
+                task_name=_shard_task_name(campaign, after, attempt + 1),
+                group=campaign.key,
+            )
+            return f"Shard re-queued after {sent} sent: {e}"
+        logger.error(f"Newsletter {campaign.key} shard after {after or 'start'} gave up after {attempt} attempts: {e}")
+        finish_shard(campaign_id, after)
+        raise
+
+    finish_shard(campaign_id, after)
+    return f"Sent {sent}, failed {failed}"
+
+
+def finish_shard(campaign_id, after) -> bool:
+    """Count the shard towards shards_done once, however often it runs; False if already counted."""
+    from .models import NewsletterCampaign, NewsletterShard
+
+    with transaction.atomic():
+        _, created = NewsletterShard.objects.get_or_create(campaign_id=campaign_id, after=after or "")
+        if created:
+            NewsletterCampaign.objects.filter(pk=campaign_id).update(shards_done=F("shards_done") + 1)
+    complete_if_done(campaign_id)
+    return created
+
+
+def complete_if_done(campaign_id) -> bool:
+    """
+    Mark the campaign completed once it's fully scheduled and every shard
+    has reported, and aggregate its delivery stats. The conditional update
+    lets exactly one caller win.
+    """
+    from .models import NewsletterCampaign, NewsletterDelivery
+
+    won = NewsletterCampaign.objects.filter(
+        pk=campaign_id,
+        status=NewsletterCampaign.Status.SENDING,
+        shards_done__gte=F("shard_count"),
+    ).update(status=NewsletterCampaign.Status.COMPLETED, completed_at=timezone.now())
+    if not won:
+        return False
+
+    counts = dict(
+        NewsletterDelivery.objects.filter(campaign_id=campaign_id)
+        .values("status")
+        .annotate(n=Count("id"))
+        .values_list("status", "n")
+    )
+    NewsletterCampaign.objects.filter(pk=campaign_id).update(
+        sent_count=counts.get(NewsletterDelivery.Status.SENT, 0),
+        failed_count=counts.get(NewsletterDelivery.Status.FAILED, 0),
+    )
+    logger.info(
+        f"Newsletter campaign {campaign_id}: sent {counts.get(NewsletterDelivery.Status.SENT, 0)}, "
+        f"failed {counts.get(NewsletterDelivery.Status.FAILED, 0)}, "
+        f"unconfirmed {counts.get(NewsletterDelivery.Status.PENDING, 0)}"
+    )
+    return True
+
+
+def schedule_shards(campaign, shard_size=SHARD_SIZE):
+    """Cut the remaining subscribers into shards and enqueue one task per shard."""
+    from django_q.tasks import async_task
+
+    from .models import NewsletterCampaign
+
+    ids = subscribers(campaign.newsletter_type).order_by("id").values_list("id", flat=True)
+    cursor = campaign.cursor
+    while True:
+        remaining = ids.filter(id__gt=cursor) if cursor else ids
+        upto = next(iter(remaining[shard_size - 1:shard_size]), None) or remaining.last()
+        if upto is None:
+            break
+        with transaction.atomic():
+            NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+                cursor=str(upto), shard_count=F("shard_count") + 1
+            )
+            async_task(
+                "apps.engagement.delivery.send_shard",
+                campaign.pk, cursor, str(upto),
+                task_name=_shard_task_name(campaign, cursor),
+                group=campaign.key,
+            )
+        cursor = str(upto)
+
+    NewsletterCampaign.objects.filter(
+        pk=campaign.pk, status=NewsletterCampaign.Status.SCHEDULING
+    ).update(status=NewsletterCampaign.Status.SENDING)
+    complete_if_done(campaign.pk)
+
+
+def deliver_newsletter(key, newsletter_type, subject, template, context, from_email=None, shard_size=None):
+    """
+    Send `template` ("emails/morning_brief" -> .html + .txt) to every active,
+    verified subscriber of newsletter_type, once per key. Returns the
+    campaign; shards are sent by the cluster workers.
+    """
+    from .models import NewsletterCampaign
+
+    campaign = get_campaign(key, newsletter_type, subject, template, context, from_email)
+    if campaign.status == NewsletterCampaign.Status.SCHEDULING:
+        schedule_shards(campaign, shard_size or getattr(settings, "NEWSLETTER_SHARD_SIZE", SHARD_SIZE))
+        campaign.refresh_from_db()
+        logger.info(f"Newsletter {key}: {campaign.shard_count} shards queued")
+    return campaign
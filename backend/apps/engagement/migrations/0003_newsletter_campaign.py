@@ -0,0 +1,108 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("engagement", "0002_alter_newslettersubscription_newsletter_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterCampaign",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="Timestamp when the record was created",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when the record was last updated",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Identifies the send, e.g. morning_brief:2026-01-05",
+                        max_length=200,
+                        unique=True,
+                        verbose_name="Key",
+                    ),
+                ),
+                (
+                    "newsletter_type",
+                    models.CharField(
+                        choices=[
+                            ("morning_brief", "Morning Brief"),
+                            ("evening_wrap", "Evening Wrap"),
+                            ("weekly_digest", "Weekly Digest"),
+                            ("breaking_news", "Breaking News"),
+                            ("earnings", "Earnings Alerts"),
+                            ("finance_africa_quarterly", "Finance Africa Quarterly"),
+                            ("finance_africa_insights", "Finance Africa Insights"),
+                            ("afrifin_analytics", "AfriFin Analytics"),
+                        ],
+                        max_length=30,
+                        verbose_name="Newsletter Type",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                ("from_email", models.CharField(max_length=255, verbose_name="From")),
+                ("html_body", models.TextField(verbose_name="HTML Body")),
+                ("text_body", models.TextField(verbose_name="Text Body")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("sending", "Sending"), ("completed", "Completed")],
+                        default="sending",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "cursor",
+                    models.CharField(
+                        blank=True,
+                        help_text="Last subscription ID handled",
+                        max_length=64,
+                        verbose_name="Cursor",
+                    ),
+                ),
+                (
+                    "sent_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Sent"),
+                ),
+                (
+                    "failed_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Failed"),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Completed At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Newsletter Campaign",
+                "verbose_name_plural": "Newsletter Campaigns",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("engagement", "0003_newsletter_campaign"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newslettercampaign",
+            name="shard_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Shards"),
+        ),
+        migrations.AddField(
+            model_name="newslettercampaign",
+            name="shards_done",
+            field=models.PositiveIntegerField(default=0, verbose_name="Shards Done"),
+        ),
+        migrations.AlterField(
+            model_name="newslettercampaign",
+            name="cursor",
+            field=models.CharField(
+                blank=True,
+                help_text="Last subscription ID assigned to a shard",
+                max_length=64,
+                verbose_name="Cursor",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="newslettercampaign",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("scheduling", "Scheduling"),
+                    ("sending", "Sending"),
+                    ("completed", "Completed"),
+                ],
+                default="scheduling",
+                max_length=20,
+                verbose_name="Status",
+            ),
+        ),
+        migrations.CreateModel(
+            name="NewsletterDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="Timestamp when the record was created",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when the record was last updated",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "claim",
+                    models.CharField(
+                        help_text="Shard run that claimed this recipient",
+                        max_length=32,
+                        verbose_name="Claim",
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="engagement.newslettercampaign",
+                    ),
+                ),
+                (
+                    "subscription",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="engagement.newslettersubscription",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Newsletter Delivery",
+                "verbose_name_plural": "Newsletter Deliveries",
+                "unique_together": {("campaign", "subscription")},
+            },
+        ),
+    ]
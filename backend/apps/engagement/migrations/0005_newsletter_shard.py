@@ -0,0 +1,64 @@
+# Generated by Django 5.0.14 on 2026-10-19 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("engagement", "0004_newsletter_delivery_shards"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="Timestamp when the record was created",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when the record was last updated",
+                    ),
+                ),
+                (
+                    "after",
+                    models.CharField(
+                        blank=True,
+                        help_text="Subscription ID the shard starts after (blank for the first shard)",
+                        max_length=64,
+                        verbose_name="After",
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shards",
+                        to="engagement.newslettercampaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Newsletter Shard",
+                "verbose_name_plural": "Newsletter Shards",
+                "unique_together": {("campaign", "after")},
+            },
+        ),
+    ]
@@ -3,6 +3,9 @@ Engagement Models
 
 Newsletter subscriptions and price alerts:
 - NewsletterSubscription: Email newsletter subscriptions
+- NewsletterCampaign: One newsletter send and its delivery progress
+- NewsletterDelivery: One recipient of a campaign (the idempotency key)
+- NewsletterShard: A finished shard of a campaign
 - PriceAlert: User-defined price alerts
 - Notification: In-app notifications
 """
@@ -97,6 +100,166 @@ class NewsletterSubscription(BaseModel):
         return f"{self.email} - {self.get_newsletter_type_display()}"
 
 
+class NewsletterCampaign(TimeStampedModel):
+    """
+    One newsletter send (a morning brief, a breaking-news alert, ...).
+
+    The shared body is rendered once and stored with an unsubscribe
+    placeholder, so every shard and retry delivers exactly the same
+    content. Recipients are split into shards of consecutive subscription
+    IDs; `cursor` is the last subscription ID assigned to a shard, letting
+    an interrupted scheduler continue where it stopped. See
+    apps.engagement.delivery.
+    """
+
+    class Status(models.TextChoices):
+        SCHEDULING = "scheduling", "Scheduling"
+        SENDING = "sending", "Sending"
+        COMPLETED = "completed", "Completed"
+
+    key = models.CharField(
+        "Key",
+        max_length=200,
+        unique=True,
+        help_text="Identifies the send, e.g. morning_brief:2026-01-05",
+    )
+    newsletter_type = models.CharField(
+        "Newsletter Type",
+        max_length=30,
+        choices=NewsletterSubscription.NewsletterType.choices,
+    )
+    subject = models.CharField(
+        "Subject",
+        max_length=255,
+    )
+    from_email = models.CharField(
+        "From",
+        max_length=255,
+    )
+    html_body = models.TextField(
+        "HTML Body",
+    )
+    text_body = models.TextField(
+        "Text Body",
+    )
+    status = models.CharField(
+        "Status",
+        max_length=20,
+        choices=Status.choices,
+        default=Status.SCHEDULING,
+    )
+    cursor = models.CharField(
+        "Cursor",
+        max_length=64,
+        blank=True,
+        help_text="Last subscription ID assigned to a shard",
+    )
+    shard_count = models.PositiveIntegerField(
+        "Shards",
+        default=0,
+    )
+    shards_done = models.PositiveIntegerField(
+        "Shards Done",
+        default=0,
+    )
+    sent_count = models.PositiveIntegerField(
+        "Sent",
+        default=0,
+    )
+    failed_count = models.PositiveIntegerField(
+        "Failed",
+        default=0,
+    )
+    completed_at = models.DateTimeField(
+        "Completed At",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = "Newsletter Campaign"
+        verbose_name_plural = "Newsletter Campaigns"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.key} ({self.get_status_display()})"
+
+
+class NewsletterDelivery(TimeStampedModel):
+    """
+    One subscriber of a campaign.
+
+    The row is claimed (inserted as pending) before the message is sent,
+    and (campaign, subscription) is unique, so a subscriber receives a
+    campaign at most once however many times a shard runs.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    campaign = models.ForeignKey(
+        NewsletterCampaign,
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+    )
+    subscription = models.ForeignKey(
+        NewsletterSubscription,
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+    )
+    status = models.CharField(
+        "Status",
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    claim = models.CharField(
+        "Claim",
+        max_length=32,
+        help_text="Shard run that claimed this recipient",
+    )
+
+    class Meta:
+        verbose_name = "Newsletter Delivery"
+        verbose_name_plural = "Newsletter Deliveries"
+        unique_together = [["campaign", "subscription"]]
+
+    def __str__(self):
+        return f"{self.campaign.key} -> {self.subscription.email} ({self.get_status_display()})"
+
+
+class NewsletterShard(TimeStampedModel):
+    """
+    A campaign shard that has finished (sent, or given up on).
+
+    Shards are identified by the subscription ID they start after, and
+    (campaign, after) is unique, so a shard that runs twice is only counted
+    towards the campaign's shards_done once.
+    """
+
+    campaign = models.ForeignKey(
+        NewsletterCampaign,
+        on_delete=models.CASCADE,
+        related_name="shards",
+    )
+    after = models.CharField(
+        "After",
+        max_length=64,
+        blank=True,
+        help_text="Subscription ID the shard starts after (blank for the first shard)",
+    )
+
+    class Meta:
+        verbose_name = "Newsletter Shard"
+        verbose_name_plural = "Newsletter Shards"
+        unique_together = [["campaign", "after"]]
+
+    def __str__(self):
+        return f"{self.campaign.key} after {self.after or 'start'}"
+
+
 class PriceAlert(BaseModel):
     """
     User-defined price alerts.
@@ -14,6 +14,8 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from .delivery import deliver_newsletter
+
 
 def send_verification_email(subscription_id: str):
     """
@@ -71,13 +73,6 @@ def send_morning_brief():
 
     from .models import NewsletterSubscription
 
-    # Get active morning brief subscribers
-    subscriptions = NewsletterSubscription.objects.filter(
-        newsletter_type=NewsletterSubscription.NewsletterType.MORNING_BRIEF,
-        is_active=True,
-        is_verified=True,
-    )
-
     # Get market data
     indices = MarketIndex.objects.all()[:5]
     top_gainers = sorted(
@@ -97,26 +92,15 @@ def send_morning_brief():
         "top_losers": top_losers,
     }
 
-    frontend_url = getattr(settings, "FRONTEND_URL", "https://bgfi.global")
-
-    for subscription in subscriptions:
-        context["unsubscribe_url"] = (
-            f"{frontend_url}/newsletter/unsubscribe?token={subscription.unsubscribe_token}"
-        )
-
-        html_content = render_to_string("emails/morning_brief.html", context)
-        text_content = render_to_string("emails/morning_brief.txt", context)
-
-        send_mail(
-            subject=f"Morning Market Brief - {context['date']}",
-            message=text_content,
-            html_message=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[subscription.email],
-            fail_silently=True,
-        )
+    campaign = deliver_newsletter(
+        key=f"morning_brief:{timezone.localdate():%Y-%m-%d}",
+        newsletter_type=NewsletterSubscription.NewsletterType.MORNING_BRIEF,
+        subject=f"Morning Market Brief - {context['date']}",
+        template="emails/morning_brief",
+        context=context,
+    )
 
-    return f"Sent morning brief to {subscriptions.count()} subscribers"
+    return f"Morning brief {campaign.key}: {campaign.shard_count} shards ({campaign.get_status_display()})"
 
 
 def send_evening_wrap():
@@ -130,12 +114,6 @@ def send_evening_wrap():
 
     from .models import NewsletterSubscription
 
-    subscriptions = NewsletterSubscription.objects.filter(
-        newsletter_type=NewsletterSubscription.NewsletterType.EVENING_WRAP,
-        is_active=True,
-        is_verified=True,
-    )
-
     indices = MarketIndex.objects.all()[:5]
     most_active = Company.objects.filter(is_active=True).order_by("-volume")[:5]
     top_stories = NewsArticle.objects.filter(
@@ -150,26 +128,15 @@ def send_evening_wrap():
         "top_stories": top_stories,
     }
 
-    frontend_url = getattr(settings, "FRONTEND_URL", "https://bgfi.global")
-
-    for subscription in subscriptions:
-        context["unsubscribe_url"] = (
-            f"{frontend_url}/newsletter/unsubscribe?token={subscription.unsubscribe_token}"
-        )
-
-        html_content = render_to_string("emails/evening_wrap.html", context)
-        text_content = render_to_string("emails/evening_wrap.txt", context)
-
-        send_mail(
-            subject=f"Evening Market Wrap - {context['date']}",
-            message=text_content,
-            html_message=html_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[subscription.email],
-            fail_silently=True,
-        )
+    campaign = deliver_newsletter(
+        key=f"evening_wrap:{timezone.localdate():%Y-%m-%d}",
+        newsletter_type=NewsletterSubscription.NewsletterType.EVENING_WRAP,
+        subject=f"Evening Market Wrap - {context['date']}",
+        template="emails/evening_wrap",
+        context=context,
+    )
 
-    return f"Sent evening wrap to {subscriptions.count()} subscribers"
+    return f"Evening wrap {campaign.key}: {campaign.shard_count} shards ({campaign.get_status_display()})"
 
 
 def process_price_alerts():
@@ -243,38 +210,18 @@ def send_breaking_news_alert(article_id: str):
         return "Article not found or not breaking news"
 
     # Email subscribers (newsletter subscriptions are opt-in, so no preference check needed)
-    subscriptions = NewsletterSubscription.objects.filter(
-        newsletter_type=NewsletterSubscription.NewsletterType.BREAKING_NEWS,
-        is_active=True,
-        is_verified=True,
-    )
-
-    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "BGFI <publish@bgfi.global>")
     frontend_url = getattr(settings, "FRONTEND_URL", "https://bgfi.global")
-    article_url = f"{frontend_url}/article/{article.slug}"
-
-    for subscription in subscriptions:
-        unsubscribe_url = (
-            f"{frontend_url}/newsletter/unsubscribe?token={subscription.unsubscribe_token}"
-        )
-
-        context = {
+    campaign = deliver_newsletter(
+        key=f"breaking_news:{article.id}",
+        newsletter_type=NewsletterSubscription.NewsletterType.BREAKING_NEWS,
+        subject=f"BREAKING: {article.title}",
+        template="emails/breaking_news",
+        context={
             "article": article,
-            "article_url": article_url,
-            "unsubscribe_url": unsubscribe_url,
-        }
-
-        html_content = render_to_string("emails/breaking_news.html", context)
-        text_content = render_to_string("emails/breaking_news.txt", context)
-
-        send_mail(
-            subject=f"BREAKING: {article.title}",
-            message=text_content,
-            html_message=html_content,
-            from_email=from_email,
-            recipient_list=[subscription.email],
-            fail_silently=True,
-        )
+            "article_url": f"{frontend_url}/article/{article.slug}",
+        },
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "BGFI <publish@bgfi.global>"),
+    )
 
     # Create in-app notifications for users who watch related companies
     # Only for users who have breaking_news notifications enabled
@@ -312,4 +259,4 @@ def send_breaking_news_alert(article_id: str):
     if notifications:
         Notification.objects.bulk_create(notifications)
 
-    return f"Sent breaking news to {subscriptions.count()} email subscribers and {len(notifications)} app users"
+    return f"Breaking news email in {campaign.shard_count} shards ({campaign.get_status_display()}), notified {len(notifications)} app users"
@@ -0,0 +1,178 @@
+"""
+Tests for the Engagement app.
+"""
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from .delivery import (
+    UNSUBSCRIBE_TOKEN,
+    deliver_newsletter,
+    finish_shard,
+    get_campaign,
+    send_shard,
+    unsubscribe_url,
+)
+from .models import NewsletterCampaign, NewsletterDelivery, NewsletterShard, NewsletterSubscription
+
+EVENING_WRAP = NewsletterSubscription.NewsletterType.EVENING_WRAP
+
+
+class RefusingBackend(EmailBackend):
+    """Refuses one address, like an SMTP server rejecting RCPT TO."""
+
+    refused = "bounce@example.com"
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.refused in message.to:
+                raise smtplib.SMTPRecipientsRefused({self.refused: (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+class FlakyBackend(EmailBackend):
+    """Drops the connection once, after `fail_after` messages."""
+
+    fail_after = 2
+    sent = 0
+
+    def send_messages(self, messages):
+        if FlakyBackend.sent == FlakyBackend.fail_after:
+            FlakyBackend.sent += 1
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        FlakyBackend.sent += len(messages)
+        return super().send_messages(messages)
+
+
+class NewsletterDeliveryTests(TestCase):
+    """Test cases for the sharded newsletter delivery engine."""
+
+    def setUp(self):
+        self.subscribers = [
+            NewsletterSubscription.objects.create(
+                email=f"reader{i}@example.com", newsletter_type=EVENING_WRAP,
+                is_verified=True, unsubscribe_token=f"token-{i}",
+            )
+            for i in range(5)
+        ]
+        NewsletterSubscription.objects.create(email="unverified@example.com", newsletter_type=EVENING_WRAP)
+        NewsletterSubscription.objects.create(
+            email="gone@example.com", newsletter_type=EVENING_WRAP, is_verified=True, is_active=False,
+        )
+        NewsletterSubscription.objects.create(
+            email="morning@example.com", is_verified=True,
+            newsletter_type=NewsletterSubscription.NewsletterType.MORNING_BRIEF,
+        )
+
+    def deliver(self, key="evening_wrap:test"):
+        return deliver_newsletter(
+            key=key,
+            newsletter_type=EVENING_WRAP,
+            subject="Evening Market Wrap",
+            template="emails/evening_wrap",
+            context={"date": "October 19, 2026", "indices": [], "most_active": [], "top_stories": []},
+            shard_size=2,
+        )
+
+    def test_each_recipient_gets_their_own_unsubscribe_url(self):
+        campaign = self.deliver()
+
+        self.assertEqual(len(mail.outbox), 5)
+        for message in mail.outbox:
+            subscriber = next(s for s in self.subscribers if s.email == message.to[0])
+            url = unsubscribe_url(subscriber.unsubscribe_token)
+            html = message.alternatives[0][0]
+            self.assertIn(f"Unsubscribe: {url}", message.body)
+            self.assertIn(f'href="{url}"', html)
+            self.assertNotIn(UNSUBSCRIBE_TOKEN, message.body + html)
+            self.assertEqual(message.extra_headers["List-Unsubscribe"], f"<{url}>")
+            self.assertEqual(message.subject, "Evening Market Wrap")
+
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, NewsletterCampaign.Status.COMPLETED)
+        self.assertEqual((campaign.shard_count, campaign.shards_done), (3, 3))
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (5, 0))
+
+    @override_settings(EMAIL_BACKEND="apps.engagement.tests.RefusingBackend")
+    def test_refused_recipient_counts_as_failed(self):
+        self.subscribers[2].email = RefusingBackend.refused
+        self.subscribers[2].save()
+
+        campaign = self.deliver()
+
+        self.assertEqual(len(mail.outbox), 4)
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (4, 1))
+        self.assertEqual(
+            NewsletterDelivery.objects.get(status=NewsletterDelivery.Status.FAILED).subscription,
+            self.subscribers[2],
+        )
+
+    @override_settings(EMAIL_BACKEND="apps.engagement.tests.FlakyBackend")
+    def test_connection_error_resumes_from_checkpoint(self):
+        """The re-queued shard skips recipients already delivered and sends the rest once."""
+        FlakyBackend.sent = 0
+
+        campaign = self.deliver()
+
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, sorted(s.email for s in self.subscribers))
+        campaign.refresh_from_db()
+        self.assertEqual(campaign.status, NewsletterCampaign.Status.COMPLETED)
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (5, 0))
+        self.assertFalse(NewsletterDelivery.objects.filter(status=NewsletterDelivery.Status.PENDING).exists())
+
+    def test_completed_key_is_a_no_op(self):
+        campaign = self.deliver()
+        mail.outbox.clear()
+
+        again = self.deliver()
+
+        self.assertEqual(again.pk, campaign.pk)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(NewsletterCampaign.objects.count(), 1)
+        self.assertEqual(NewsletterDelivery.objects.count(), 5)
+
+    def test_duplicate_shard_run_sends_and_counts_nothing(self):
+        """A re-delivered shard task neither re-sends nor advances shards_done."""
+        campaign = self.deliver()
+        mail.outbox.clear()
+        first_upto = str(sorted(s.pk for s in self.subscribers)[1])
+
+        self.assertEqual(send_shard(campaign.pk, "", first_upto), "Shard after start already finished")
+        self.assertFalse(finish_shard(campaign.pk, ""))
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(NewsletterShard.objects.filter(campaign=campaign).count(), 3)
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.shard_count, campaign.shards_done), (3, 3))
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (5, 0))
+
+    @override_settings(EMAIL_BACKEND="apps.engagement.tests.FlakyBackend")
+    def test_connection_error_requeues_the_shard(self):
+        FlakyBackend.sent = FlakyBackend.fail_after = 1
+        self.addCleanup(setattr, FlakyBackend, "fail_after", 2)
+        campaign = get_campaign(
+            "evening_wrap:retry", EVENING_WRAP, "Evening Market Wrap", "emails/evening_wrap", {},
+        )
+        NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+            status=NewsletterCampaign.Status.SENDING, shard_count=1,
+        )
+        upto = str(max(s.pk for s in self.subscribers))
+
+        with mock.patch("django_q.tasks.async_task") as async_task:
+            result = send_shard(campaign.pk, "", upto)
+
+        self.assertTrue(result.startswith("Shard re-queued"))
+        args, kwargs = async_task.call_args
+        self.assertEqual(args, ("apps.engagement.delivery.send_shard", campaign.pk, "", upto))
+        self.assertEqual(kwargs["attempt"], 2)
+        self.assertTrue(kwargs["task_name"].endswith(":attempt:2"))
+        # Unsent claims released, the shard not counted as finished
+        self.assertFalse(NewsletterDelivery.objects.filter(campaign=campaign).exists())
+        self.assertFalse(NewsletterShard.objects.exists())
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.status, campaign.shards_done), (NewsletterCampaign.Status.SENDING, 0))
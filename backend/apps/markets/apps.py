@@ -5,3 +5,7 @@ class MarketsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.markets"
     verbose_name = "Markets"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.markets.signals  # noqa: F401
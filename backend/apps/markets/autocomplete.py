@@ -0,0 +1,252 @@
+"""
+In-memory company/ticker autocomplete.
+
+Typeahead fires on every keystroke, so instead of `icontains` scans each
+worker keeps a small index of active companies:
+- a sorted array of symbols and a sorted array of name words, both
+  binary-searched for exact/prefix matches
+- a trigram -> companies map for fuzzy matches (typos, partial names)
+
+Ranking: exact symbol, symbol prefix, name prefix, name word prefix, then
+fuzzy by trigram similarity; ties go to the larger market cap.
+
+The index is rebuilt when the "company_autocomplete" cache version moves
+(bumped by apps.markets.signals when a company's symbol, names, exchange or
+active flag change — not on price ticks), checked at most every few
+seconds, and at least hourly as a backstop for queryset.update() edits.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+
+from apps.core.cache import CacheVersionManager
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "company_autocomplete"
+VERSION_CHECK_SECONDS = 5
+MAX_AGE_SECONDS = 60 * 60
+FUZZY_THRESHOLD = 0.3
+MAX_CANDIDATES = 200  # Fuzzy candidates scored per query
+COMMON_GRAM_MIN = 50
+
+# Rank values, best first
+EXACT_SYMBOL, SYMBOL_PREFIX, NAME_PREFIX, WORD_PREFIX, FUZZY = range(5)
+MATCH_TYPES = {
+    EXACT_SYMBOL: "symbol",
+    SYMBOL_PREFIX: "symbol_prefix",
+    NAME_PREFIX: "name_prefix",
+    WORD_PREFIX: "word_prefix",
+    FUZZY: "fuzzy",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTINEL = "\uffff"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_range(keys: list, prefix: str) -> range:
+    lo = bisect.bisect_left(keys, (prefix,))
+    hi = bisect.bisect_left(keys, (prefix + _SENTINEL,))
+    return range(lo, hi)
+
+
+INDEXED_FIELDS = ("symbol", "name", "short_name", "exchange_id", "is_active")
+
+
+def attributes_key(company) -> tuple:
+    """The indexed field values (read from __dict__ so deferred fields aren't loaded)."""
+    return tuple(company.__dict__.get(field) for field in INDEXED_FIELDS)
+
+
+class CompanyIndex:
+    """Immutable snapshot of the active company universe."""
+
+    def __init__(self, rows):
+        # rows: (id, symbol, name, short_name, exchange code, market cap)
+        self.entries = []
+        self.symbols = []  # (symbol, idx)
+        self.names = []  # (normalized full name, idx)
+        self.words = []  # (word, idx)
+        self.trigrams = defaultdict(list)
+        self.entry_words = []  # idx -> set of name words
+        self.entry_trigrams = []  # idx -> [trigram set per symbol/name word]
+
+        for idx, (pk, symbol, name, short_name, exchange, market_cap) in enumerate(rows):
+            self.entries.append({
+                "id": pk,
+                "symbol": symbol,
+                "name": name,
+                "short_name": short_name,
+                "exchange": exchange,
+                "market_cap": market_cap or 0,
+            })
+            self.symbols.append((symbol.lower(), idx))
+
+            names = {_normalize(name), _normalize(short_name)} - {""}
+            words = set()
+            for full in names:
+                self.names.append((full, idx))
+                words.update(full.split())
+            self.words.extend((word, idx) for word in words)
+            self.entry_words.append(words)
+
+            token_grams = [_trigrams(token) for token in words | {_normalize(symbol)}]
+            self.entry_trigrams.append(token_grams)
+            for gram in set().union(*token_grams):
+                self.trigrams[gram].append(idx)
+
+        self.market_caps = [entry["market_cap"] for entry in self.entries]
+        self.symbols.sort()
+        self.names.sort()
+        self.words.sort()
+
+    def _fuzzy(self, words: list, exclude: set) -> dict:
+        """
+        Word-level trigram similarity (like pg_trgm's word_similarity):
+        each query word is scored against its best-matching symbol/name
+        word, and the scores are averaged.
+        """
+        query_grams = [_trigrams(word) for word in words]
+        present = [g for g in set().union(*query_grams) if g in self.trigrams]
+        # Grams shared by a large part of the universe ("ing", " li") only
+        # add work; use them only when nothing more specific exists.
+        common = max(COMMON_GRAM_MIN, len(self.entries) // 4)
+        informative = [g for g in present if len(self.trigrams[g]) <= common] or present
+        counts = Counter(chain.from_iterable(self.trigrams[g] for g in informative))
+
+        scores = {}
+        for idx, _count in counts.most_common(MAX_CANDIDATES + len(exclude)):
+            if idx in exclude:
+                continue
+            similarity = sum(
+                max(len(grams & token) / len(grams | token) for token in self.entry_trigrams[idx])
+                for grams in query_grams
+            ) / len(query_grams)
+            if similarity >= FUZZY_THRESHOLD:
+                scores[idx] = similarity
+        return scores
+
+    def search(self, text: str, limit: int = 10, exchange: str = "") -> list:
+        symbol_query = text.strip().lower()
+        query = _normalize(text)
+        if not query:
+            return []
+        words = query.split()
+        *leading, last_word = words
+
+        def symbol_hits(exact):
+            for i in _prefix_range(self.symbols, symbol_query):
+                symbol, idx = self.symbols[i]
+                if (symbol == symbol_query) == exact:
+                    yield idx
+
+        def word_hits():
+            hits = (self.words[i][1] for i in _prefix_range(self.words, last_word))
+            if not leading:
+                return hits
+            # Multi-word queries: earlier words must appear in the name too
+            return (idx for idx in hits if self.entry_words[idx].issuperset(leading))
+
+        tiers = [
+            (EXACT_SYMBOL, symbol_hits(True)),
+            (SYMBOL_PREFIX, symbol_hits(False)),
+            (NAME_PREFIX, (self.names[i][1] for i in _prefix_range(self.names, query))),
+            (WORD_PREFIX, word_hits()),
+        ]
+
+        results = []
+        taken = set()
+
+        def take(rank, candidates, scores=None):
+            pool = set(candidates) - taken
+            if exchange:
+                pool = {idx for idx in pool if self.entries[idx]["exchange"] == exchange}
+            if scores:
+                key = lambda idx: (-scores[idx], -self.market_caps[idx])  # noqa: E731
+            else:
+                key = self.market_caps.__getitem__
+            best = (heapq.nsmallest if scores else heapq.nlargest)(limit - len(results), pool, key=key)
+            for idx in best:
+                taken.add(idx)
+                entry = dict(self.entries[idx])
+                entry.pop("market_cap")
+                entry["match"] = MATCH_TYPES[rank]
+                entry["score"] = round(scores[idx], 3) if scores else 1.0
+                results.append(entry)
+
+        # Better tiers first; later tiers only fill remaining slots
+        for rank, candidates in tiers:
+            if len(results) >= limit:
+                return results
+            take(rank, candidates)
+        if len(results) < limit:
+            scores = self._fuzzy(words, taken)
+            take(FUZZY, scores, scores)
+        return results
+
+
+class CompanyAutocomplete:
+    """Process-wide, lazily (re)built CompanyIndex."""
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load():
+        from .models import Company
+
+        rows = (
+            Company.objects.filter(is_active=True)
+            .order_by()
+            .values_list("id", "symbol", "name", "short_name", "exchange__code", "market_cap")
+        )
+        return CompanyIndex(list(rows))
+
+    def index(self) -> CompanyIndex:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < VERSION_CHECK_SECONDS:
+            return self._index
+
+        with self._lock:
+            self._checked_at = now
+            version = CacheVersionManager.get_version(VERSION_PREFIX)
+            stale = now - self._built_at >= MAX_AGE_SECONDS
+            if self._index is None or version != self._version or stale:
+                started = time.perf_counter()
+                self._index = self._load()
+                self._version = version
+                self._built_at = now
+                logger.debug(
+                    f"Company autocomplete index built: {len(self._index.entries)} companies "
+                    f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+        return self._index
+
+    def search(self, text: str, limit: int = 10, exchange: str = "") -> list:
+        return self.index().search(text, limit, exchange.upper())
+
+    def invalidate(self):
+        """Rebuild here on next use and in other workers on their next version check."""
+        CacheVersionManager.increment_version(VERSION_PREFIX)
+        self._index = None
+
+
+company_autocomplete = CompanyAutocomplete()
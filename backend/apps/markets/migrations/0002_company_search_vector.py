@@ -0,0 +1,15 @@
+"""Trigger-maintained full-text search vector + GIN index (Postgres only)."""
+from django.db import migrations
+
+from apps.search.operations import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("markets", "0001_initial"),
+    ]
+
+    operations = [
+        AddSearchVector("Company", [("symbol", "A"), ("name", "A"), ("short_name", "A"), ("description", "C")]),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("markets", "0002_company_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="logo_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive derivatives (apps.media.derivatives)",
+                verbose_name="Logo Variants",
+            ),
+        ),
+    ]
@@ -194,6 +194,13 @@ class Company(BaseModel):
         null=True,
         blank=True,
     )
+    logo_variants = models.JSONField(
+        "Logo Variants",
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Responsive derivatives (apps.media.derivatives)",
+    )
     website = models.URLField(
         "Website",
         blank=True,
@@ -3,8 +3,12 @@ Market Serializers
 
 Provides serialization for market data models.
 """
+from decimal import Decimal
+
 from rest_framework import serializers
 
+from apps.core.fast_serializers import ValuesSerializer, decimal_string
+
 from .models import Company, Exchange, MarketIndex, MarketTicker, Sector
 
 
@@ -64,6 +68,60 @@ class CompanyMinimalSerializer(serializers.ModelSerializer):
             "volume",
         ]
 
+    # Columns read by the fields above (the price properties need previous_close)
+    only_fields = (
+        "id",
+        "symbol",
+        "name",
+        "short_name",
+        "exchange__code",
+        "current_price",
+        "previous_close",
+        "volume",
+    )
+
+    @classmethod
+    def setup_queryset(cls, queryset):
+        """Load exactly what this serializer reads, in one query."""
+        return queryset.select_related("exchange").only(*cls.only_fields)
+
+
+class CompanyMinimalValues(ValuesSerializer):
+    """Fast path for CompanyMinimalSerializer over .values() rows."""
+
+    model = Company
+    fields = (
+        "id",
+        "symbol",
+        "name",
+        "short_name",
+        "exchange_code",
+        "current_price",
+        "price_change",
+        "price_change_percent",
+        "is_up",
+        "volume",
+    )
+    sources = {"exchange_code": "exchange__code"}
+    extra_columns = ("previous_close",)
+
+    # Same arithmetic as Company.price_change / price_change_percent / is_up
+    def get_price_change(self, row):
+        return decimal_string(row["current_price"] - row["previous_close"], 4, 18)
+
+    @staticmethod
+    def change_percent(row):
+        previous = row["previous_close"]
+        if previous == 0:
+            return Decimal("0")
+        return ((row["current_price"] - previous) / previous) * 100
+
+    def get_price_change_percent(self, row):
+        return decimal_string(self.change_percent(row), 2, 8)
+
+    def get_is_up(self, row):
+        return row["current_price"] > row["previous_close"]
+
 
 class CompanySerializer(serializers.ModelSerializer):
     """Full serializer for Company model."""
@@ -79,6 +137,7 @@ class CompanySerializer(serializers.ModelSerializer):
     is_up = serializers.BooleanField(read_only=True)
     is_down = serializers.BooleanField(read_only=True)
     display_name = serializers.CharField(read_only=True)
+    logo_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Company
@@ -93,6 +152,7 @@ class CompanySerializer(serializers.ModelSerializer):
             "sector",
             "description",
             "logo",
+            "logo_srcset",
             "website",
             "founded_year",
             "employees",
@@ -119,6 +179,11 @@ class CompanySerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    def get_logo_srcset(self, obj):
+        from apps.media.derivatives import srcset
+
+        return srcset(obj.logo.name, obj.logo_variants, obj.logo.storage, self.context.get("request"))
+
 
 class MarketTickerSerializer(serializers.ModelSerializer):
     """Serializer for MarketTicker model."""
@@ -142,6 +207,26 @@ class MarketTickerSerializer(serializers.ModelSerializer):
         ]
 
 
+class MarketTickerValues(ValuesSerializer):
+    """Fast path for MarketTickerSerializer over .values() rows."""
+
+    model = MarketTicker
+    fields = (
+        "id",
+        "symbol",
+        "timestamp",
+        "price",
+        "open_price",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "trade_count",
+        "interval",
+    )
+    sources = {"symbol": "company__symbol"}
+
+
 class MarketTickerChartSerializer(serializers.ModelSerializer):
     """Optimized serializer for chart data (minimal fields)."""
 
@@ -0,0 +1,33 @@
+"""
+Markets app Django signals.
+
+Handles:
+- Company autocomplete index invalidation
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .autocomplete import INDEXED_FIELDS, attributes_key, company_autocomplete
+from .models import Company
+
+
+@receiver(post_init, sender=Company)
+def remember_indexed_fields(sender, instance, **kwargs):
+    """Snapshot the indexed fields so price-only saves can be told apart."""
+    instance._autocomplete_key = attributes_key(instance)
+
+
+@receiver(post_save, sender=Company)
+def invalidate_autocomplete_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Rebuild the autocomplete index when a company's searchable fields change."""
+    key = attributes_key(instance)
+    if update_fields is not None and not set(update_fields) & {f.removesuffix("_id") for f in INDEXED_FIELDS}:
+        return
+    if created or key != getattr(instance, "_autocomplete_key", None):
+        company_autocomplete.invalidate()
+    instance._autocomplete_key = key
+
+
+@receiver(post_delete, sender=Company)
+def invalidate_autocomplete_on_delete(sender, instance, **kwargs):
+    company_autocomplete.invalidate()
@@ -90,3 +90,55 @@ class MarketsAPITests(APITestCase):
         """Test sector-company relationship."""
         tech_companies = self.sector.companies.all()
         self.assertEqual(tech_companies.count(), 1)
+
+    def test_company_autocomplete(self):
+        """Autocomplete ranks exact symbol, then prefixes, then fuzzy matches."""
+        Company.objects.create(symbol="NPNX", name="Other Holdings", exchange=self.exchange)
+        Company.objects.create(symbol="PRX", name="Prosus NV", exchange=self.exchange)
+
+        response = self.client.get("/api/v1/markets/companies/autocomplete/", {"q": "npn"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["symbol"] for r in results], ["NPN", "NPNX"])
+        self.assertEqual([r["match"] for r in results], ["symbol", "symbol_prefix"])
+
+        response = self.client.get("/api/v1/markets/companies/autocomplete/", {"q": "naspers"})
+        self.assertEqual(response.data["results"][0]["match"], "name_prefix")
+
+        response = self.client.get("/api/v1/markets/companies/autocomplete/", {"q": "nasprs"})
+        self.assertEqual(response.data["results"][0]["symbol"], "NPN")
+        self.assertEqual(response.data["results"][0]["match"], "fuzzy")
+
+    def test_fast_serializers_match_drf(self):
+        """The .values() fast paths render byte-identical JSON to the DRF serializers."""
+        from django.utils import timezone
+        from rest_framework.renderers import JSONRenderer
+        from apps.core.renderers import ORJSONRenderer
+        from .serializers import (
+            CompanyMinimalSerializer,
+            CompanyMinimalValues,
+            MarketTickerSerializer,
+            MarketTickerValues,
+        )
+
+        Company.objects.filter(pk=self.company.pk).update(
+            current_price=Decimal("101.2345"), previous_close=Decimal("97.1"), volume=1200,
+        )
+        Company.objects.create(symbol="ZERO", name="Unpriced", exchange=self.exchange)
+        MarketTicker.objects.create(
+            company=self.company, timestamp=timezone.now(),
+            price=Decimal("101.2345"), close=Decimal("101.2"), volume=50,
+        )
+
+        cases = [
+            (Company.objects.select_related("exchange"), CompanyMinimalSerializer, CompanyMinimalValues),
+            (MarketTicker.objects.select_related("company"), MarketTickerSerializer, MarketTickerValues),
+        ]
+        for queryset, drf_serializer, fast_serializer in cases:
+            expected = JSONRenderer().render(drf_serializer(queryset, many=True).data)
+            actual = ORJSONRenderer().render(fast_serializer().serialize(fast_serializer.values(queryset)))
+            self.assertEqual(actual, expected, fast_serializer.__name__)
+
+        response = self.client.get("/api/v1/markets/companies/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["price_change_percent"], "4.26")
@@ -11,6 +11,7 @@ from django_filters import rest_framework as filters
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
 from apps.core.cache import (
@@ -20,16 +21,21 @@ from apps.core.cache import (
     cache_response,
     cache_ticker_tape,
 )
+from apps.core.fast_serializers import FastListMixin
 from apps.core.pagination import MarketDataPagination
+from apps.core.renderers import ORJSONRenderer
 
+from .autocomplete import company_autocomplete
 from .models import Company, Exchange, MarketIndex, MarketTicker, Sector
 from .serializers import (
     CompanyMinimalSerializer,
+    CompanyMinimalValues,
     CompanySerializer,
     ExchangeSerializer,
     MarketIndexSerializer,
     MarketTickerChartSerializer,
     MarketTickerSerializer,
+    MarketTickerValues,
     SectorSerializer,
     TickerTapeSerializer,
 )
@@ -79,7 +85,7 @@ class SectorViewSet(viewsets.ReadOnlyModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
+class CompanyViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Company model.
 
@@ -90,10 +96,13 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /companies/gainers/ - Top gainers
     - GET /companies/losers/ - Top losers
     - GET /companies/most-active/ - Most traded
+    - GET /companies/autocomplete/?q= - Ticker/name typeahead
     """
 
     queryset = Company.objects.filter(is_active=True).select_related("exchange", "sector")
     serializer_class = CompanySerializer
+    fast_serializer_class = CompanyMinimalValues  # list
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [AllowAny]
     filterset_class = CompanyFilter
     search_fields = ["symbol", "name", "short_name"]
@@ -142,6 +151,27 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
             }
         )
 
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """
+        Typeahead over active companies, served from an in-memory index.
+
+        Query params: q (required), limit (default 10, max 25), exchange.
+        Results are ranked exact symbol > symbol prefix > name prefix >
+        name word prefix > fuzzy.
+        """
+        text = request.query_params.get("q", "")
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 25)
+        except ValueError:
+            limit = 10
+        exchange = request.query_params.get("exchange", "")
+
+        return Response({
+            "query": text,
+            "results": company_autocomplete.search(text, limit, exchange),
+        })
+
     @action(detail=False, methods=["get"])
     @cache_response(ttl=CacheTTL.SHORT, key_prefix="market_gainers")
     def gainers(self, request):
@@ -154,11 +184,10 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(exchange__code=exchange)
 
         # Order by price change percent (calculated in Python for accuracy)
-        companies = list(queryset)
-        companies.sort(key=lambda x: x.price_change_percent, reverse=True)
+        rows = list(CompanyMinimalValues.values(queryset))
+        rows.sort(key=CompanyMinimalValues.change_percent, reverse=True)
 
-        serializer = CompanyMinimalSerializer(companies[:limit], many=True)
-        return Response(serializer.data)
+        return Response(CompanyMinimalValues().serialize(rows[:limit]))
 
     @action(detail=False, methods=["get"])
     @cache_response(ttl=CacheTTL.SHORT, key_prefix="market_losers")
@@ -171,11 +200,10 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
         if exchange:
             queryset = queryset.filter(exchange__code=exchange)
 
-        companies = list(queryset)
-        companies.sort(key=lambda x: x.price_change_percent)
+        rows = list(CompanyMinimalValues.values(queryset))
+        rows.sort(key=CompanyMinimalValues.change_percent)
 
-        serializer = CompanyMinimalSerializer(companies[:limit], many=True)
-        return Response(serializer.data)
+        return Response(CompanyMinimalValues().serialize(rows[:limit]))
 
     @action(detail=False, methods=["get"], url_path="most-active")
     @cache_response(ttl=CacheTTL.SHORT, key_prefix="market_active")
@@ -188,8 +216,8 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
         if exchange:
             queryset = queryset.filter(exchange__code=exchange)
 
-        serializer = CompanyMinimalSerializer(queryset[:limit], many=True)
-        return Response(serializer.data)
+        rows = CompanyMinimalValues.values(queryset[:limit])
+        return Response(CompanyMinimalValues().serialize(rows))
 
     @action(detail=False, methods=["get"])
     @cache_ticker_tape
@@ -212,11 +240,13 @@ class CompanyViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class MarketTickerViewSet(viewsets.ReadOnlyModelViewSet):
+class MarketTickerViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for MarketTicker historical data."""
 
     queryset = MarketTicker.objects.all()
     serializer_class = MarketTickerSerializer
+    fast_serializer_class = MarketTickerValues  # list
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [AllowAny]
     pagination_class = MarketDataPagination
     filterset_fields = ["company", "interval"]
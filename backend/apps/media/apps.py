@@ -5,3 +5,7 @@ class MediaConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.media"
     verbose_name = "Media (Videos & Podcasts)"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.media.signals  # noqa: F401
@@ -0,0 +1,271 @@
+"""
+Responsive image derivatives.
+
+Uploaded images used to be served only as uploaded, so feed pages
+downloaded full-resolution originals. After an upload is committed,
+`generate_derivatives` (a django-q task queued by apps.media.signals)
+writes resized copies next to the original in the field's storage
+(MediaStorage in production):
+
+    news/2026/03/harbour.jpg
+    news/2026/03/harbour.320w.webp
+    news/2026/03/harbour.640w.webp
+    news/2026/03/harbour.320w.avif      (when an AVIF encoder is installed)
+    ...
+
+Widths are the WIDTHS buckets narrower than the original, plus the original
+width. The result is stored on the model's variants JSONField:
+
+    {"source": <original name>, "width": 1600, "height": 900,
+     "blurhash": "LEHV6nWB2yk8...", "variants": {"webp": {"320": <name>, ...}}}
+
+Serializers turn it into srcset strings with `srcset()` (as
+`<field>_srcset`, None until the variants exist). "source" ties
+the variants to one upload: a new upload regenerates (and the old files are
+deleted), a save that doesn't change the image is a no-op.
+
+WebP is always produced. AVIF needs an encoder Pillow < 11 doesn't ship
+(pillow-avif-plugin); without one only WebP is written. The blurhash is
+encoded here from a 32px thumbnail, so it needs no extra package.
+"""
+import logging
+import math
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+QUALITY = {"webp": 80, "avif": 55}
+BLURHASH_COMPONENTS = (4, 3)
+BLURHASH_SAMPLE = 32
+
+# model label -> (image field, variants JSONField)
+IMAGE_FIELDS = {
+    "media.MediaFile": ("file", "variants"),
+    "markets.Company": ("logo", "logo_variants"),
+    "news.NewsArticle": ("featured_image", "featured_image_variants"),
+    "users.UserProfile": ("avatar", "avatar_variants"),
+}
+
+
+def formats() -> list:
+    """Output formats the installed Pillow can encode."""
+    from PIL import Image, features
+
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+    except ImportError:
+        pass
+    found = ["webp"] if features.check("webp") else []
+    if ".avif" in Image.registered_extensions():
+        found.append("avif")
+    return found
+
+
+def variant_widths(width: int) -> list:
+    widths = [w for w in WIDTHS if w < width]
+    if width <= WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def variant_name(name: str, width: int, fmt: str) -> str:
+    stem, _ = os.path.splitext(name)
+    return f"{stem}.{width}w.{fmt}"
+
+
+# =========================
+# Blurhash
+# =========================
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+_SRGB_TO_LINEAR = [
+    v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+    for v in (i / 255 for i in range(256))
+]
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exp: float) -> float:
+    return math.copysign(abs(value) ** exp, value)
+
+
+def blurhash(image, components=BLURHASH_COMPONENTS) -> str:
+    """Blurhash (https://blurha.sh) of a PIL image, computed on a small thumbnail."""
+    cx, cy = components
+    thumb = image.convert("RGB")
+    thumb.thumbnail((BLURHASH_SAMPLE, BLURHASH_SAMPLE))
+    width, height = thumb.size
+    pixels = [
+        (_SRGB_TO_LINEAR[r], _SRGB_TO_LINEAR[g], _SRGB_TO_LINEAR[b])
+        for r, g, b in thumb.getdata()
+    ]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(cx)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(cy)]
+
+    factors = []
+    for j in range(cy):
+        for i in range(cx):
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = cos_y[j][y]
+                for x in range(width):
+                    basis = cos_x[i][x] * basis_y
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((cx - 1) + (cy - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(c) for factor in ac for c in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+    result += _base83(
+        (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4
+    )
+    for factor in ac:
+        r, g, b = (
+            max(0, min(18, int(_sign_pow(c / max_value, 0.5) * 9 + 9.5))) for c in factor
+        )
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+# =========================
+# Generation
+# =========================
+
+def _encode(image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    options = {"quality": QUALITY[fmt]}
+    if fmt == "webp":
+        options["method"] = 4
+    image.save(buffer, fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def _delete_variants(storage, data):
+    for names in (data or {}).get("variants", {}).values():
+        for name in names.values():
+            try:
+                storage.delete(name)
+            except Exception as e:
+                logger.warning(f"Could not delete old image variant {name}: {e}")
+
+
+def build_variants(storage, name: str) -> dict:
+    """Write the derivatives of stored image `name`; returns the variants record."""
+    from PIL import Image, ImageOps
+
+    with storage.open(name, "rb") as fh:
+        image = Image.open(fh)
+        image.draft("RGB", (WIDTHS[-1], WIDTHS[-1]))  # JPEG: decode at reduced scale
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    width, height = image.size
+
+    outputs = formats()
+    variants = {fmt: {} for fmt in outputs}
+    current = image
+    # Largest first, each size resized from the previous one
+    for target in sorted(variant_widths(width), reverse=True):
+        if target < current.width:
+            current = current.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS
+            )
+        for fmt in outputs:
+            variants[fmt][str(target)] = storage.save(
+                variant_name(name, target, fmt), ContentFile(_encode(current, fmt))
+            )
+
+    return {
+        "source": name,
+        "width": width,
+        "height": height,
+        "blurhash": blurhash(image),
+        "variants": variants,
+    }
+
+
+def generate_derivatives(label: str, pk):
+    """django-q task: (re)build the variants of one object's image field."""
+    from PIL import UnidentifiedImageError
+
+    model = apps.get_model(label)
+    field_name, variants_field = IMAGE_FIELDS[label]
+    obj = model._base_manager.filter(pk=pk).first()
+    if obj is None:
+        return f"{label} {pk} not found"
+    file = getattr(obj, field_name)
+    previous = getattr(obj, variants_field) or {}
+    if not file:
+        return "No image"
+    if previous.get("source") == file.name:
+        return "Up to date"
+
+    try:
+        data = build_variants(file.storage, file.name)
+    except (OSError, UnidentifiedImageError, ValueError) as e:
+        logger.warning(f"Image variants for {label} {pk} failed: {e}")
+        data = {"source": file.name}
+
+    # Only if the image wasn't replaced meanwhile (that upload queues its own run)
+    updated = model._base_manager.filter(pk=pk, **{field_name: file.name}).update(
+        **{variants_field: data}
+    )
+    if updated:
+        _delete_variants(file.storage, previous)
+    else:
+        _delete_variants(file.storage, data)
+    count = sum(len(names) for names in data.get("variants", {}).values())
+    return f"{label} {pk}: {count} variants"
+
+
+# =========================
+# Serialization
+# =========================
+
+def srcset(name, data, storage, request=None):
+    """
+    {"webp": "<url> 320w, ...", "avif": ..., "blurhash", "width", "height"}
+    for the variants record of stored image `name`, or None until its
+    derivatives exist.
+    """
+    if not name or not data or data.get("source") != name or not data.get("variants"):
+        return None
+
+    def url(variant):
+        location = storage.url(variant)
+        return request.build_absolute_uri(location) if request else location
+
+    result = {
+        fmt: ", ".join(f"{url(names[w])} {w}w" for w in sorted(names, key=int))
+        for fmt, names in data["variants"].items()
+        if names
+    }
+    result.update(blurhash=data.get("blurhash"), width=data.get("width"), height=data.get("height"))
+    return result
@@ -0,0 +1,164 @@
+"""
+File downloads that don't stream bytes through Django.
+
+`serve_file` answers a download request for a FieldFile in one of three
+ways, cheapest first:
+
+- S3/Spaces storage: 302 to a presigned GET URL valid for
+  DOWNLOAD_URL_TTL seconds, with the Content-Disposition baked into the
+  signature. Spaces serves the bytes (and Range requests) itself, and the
+  link stops working shortly after, so private and premium files aren't
+  exposed through a permanent public URL.
+- Local storage with MEDIA_ACCEL_REDIRECT set (the nginx "internal"
+  location that aliases MEDIA_ROOT, e.g. "/protected-media/"): an empty
+  response with X-Accel-Redirect, so nginx sends the file with sendfile
+  and handles Range.
+- Otherwise (development, tests): the file streamed from Django, honouring
+  a single "Range: bytes=..." request so audio seeking and PDF viewers
+  work.
+
+Download/listen tracking is not done here; callers record it through
+apps.analytics.counters (`record_hit`), which buffers it in Redis.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.http import content_disposition_header
+
+DOWNLOAD_URL_TTL = 5 * 60
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _ttl() -> int:
+    return getattr(settings, "DOWNLOAD_URL_TTL", DOWNLOAD_URL_TTL)
+
+
+def _is_s3(storage) -> bool:
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+def content_type_for(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def presigned_url(file, filename=None, as_attachment=True, expire=None) -> str:
+    """Short-lived signed GET URL for a file in S3/Spaces storage."""
+    from storages.utils import clean_name
+
+    storage = file.storage
+    params = {
+        "Bucket": storage.bucket_name,
+        "Key": storage._normalize_name(clean_name(file.name)),
+        "ResponseContentDisposition": content_disposition_header(
+            as_attachment, filename or os.path.basename(file.name)
+        ),
+    }
+    # Signed with the real credentials even when the storage hands out
+    # unsigned public URLs (AWS_QUERYSTRING_AUTH = False)
+    return storage.connection.meta.client.generate_presigned_url(
+        "get_object", Params=params, ExpiresIn=expire or _ttl()
+    )
+
+
+def file_url(file, filename=None, as_attachment=True, request=None) -> str:
+    """URL a client can fetch the file from directly: presigned on S3, else the storage URL."""
+    if _is_s3(file.storage):
+        return presigned_url(file, filename, as_attachment)
+    url = file.url
+    return request.build_absolute_uri(url) if request else url
+
+
+def parse_range(header: str, size: int):
+    """
+    (first, last) byte offsets for a single-range "bytes=" header, None when
+    the header is absent or not one we handle (serve the whole file), or
+    ValueError when the range can't be satisfied.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if start:
+        first = int(start)
+        last = min(int(end), size - 1) if end else size - 1
+    else:
+        # Suffix range: the last N bytes
+        first = max(0, size - int(end))
+        last = size - 1
+    if first > last or first >= size:
+        raise ValueError(header)
+    return first, last
+
+
+def _read(fh, first: int, length: int):
+    try:
+        fh.seek(first)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def ranged_response(request, file, filename=None, as_attachment=True):
+    """Stream the file from Django, answering Range requests with 206."""
+    filename = filename or os.path.basename(file.name)
+    size = file.size
+    try:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    first, last = byte_range or (0, size - 1)
+    length = max(0, last - first + 1)
+    response = StreamingHttpResponse(
+        _read(file.storage.open(file.name, "rb"), first, length),
+        status=206 if byte_range else 200,
+        content_type=content_type_for(filename),
+    )
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {first}-{last}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def accel_response(file, filename=None, as_attachment=True):
+    """Hand the file to nginx through its internal MEDIA_ACCEL_REDIRECT location."""
+    filename = filename or os.path.basename(file.name)
+    prefix = settings.MEDIA_ACCEL_REDIRECT.rstrip("/")
+    response = HttpResponse(content_type=content_type_for(filename))
+    response["X-Accel-Redirect"] = f"{prefix}/{quote(file.name)}"
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def serve_file(request, file, filename=None, as_attachment=True):
+    """Response for downloading `file` (a FieldFile); see the module docstring."""
+    if _is_s3(file.storage):
+        return HttpResponseRedirect(presigned_url(file, filename, as_attachment))
+    if getattr(settings, "MEDIA_ACCEL_REDIRECT", ""):
+        return accel_response(file, filename, as_attachment)
+    return ranged_response(request, file, filename, as_attachment)
+
+
+def is_first_request(request) -> bool:
+    """False for Range requests continuing a download, so they aren't tracked again."""
+    match = _RANGE_RE.match((request.META.get("HTTP_RANGE") or "").strip())
+    return not match or match.group(1) == "0"
@@ -6,7 +6,7 @@ Provides intelligent image selection for articles without featured images:
 2. Falls back to curated African images for known subjects
 3. Searches Unsplash for relevant images
 4. Falls back to category-based default images
-5. Ensures image variety using session-level dedup
+5. Ensures image variety using cycle-level dedup shared by all workers
 """
 import hashlib
 import logging
@@ -18,6 +18,9 @@ import requests
 from django.conf import settings
 from django.core.cache import cache
 
+from . import image_store
+from .image_store import KeyQuota, UsedImageURLs
+
 logger = logging.getLogger(__name__)
 
 
@@ -130,12 +133,15 @@ class UnsplashService:
 
     Supports multiple API keys — when one is rate-limited (403), automatically
     rotates to the next key. This doubles (or more) effective rate limits.
+    Search results, key usage and rate-limited keys are shared by every
+    worker through apps.media.image_store.
     """
 
     BASE_URL = "https://api.unsplash.com"
 
     def __init__(self):
         self._keys = None
+        self._quota = None
         self._current_key_idx = 0
 
     @property
@@ -156,65 +162,60 @@ class UnsplashService:
         """Check if at least one Unsplash key is configured."""
         return len(self.api_keys) > 0
 
-    def _get_current_key(self) -> str:
-        """Get the current active API key."""
-        if not self.api_keys:
-            return ""
-        return self.api_keys[self._current_key_idx % len(self.api_keys)]
-
-    def _rotate_key(self) -> bool:
-        """Rotate to the next API key. Returns True if a new key is available."""
-        if len(self.api_keys) <= 1:
+    @property
+    def quota(self) -> KeyQuota:
+        if self._quota is None:
+            self._quota = KeyQuota(len(self.api_keys))
+        return self._quota
+
+    def remaining_calls(self):
+        """API calls left this hour across all keys and workers, or None when unknown."""
+        return self.quota.remaining()
+
+    def _select_key(self) -> Optional[int]:
+        """Index of the least-used key that isn't rate limited, or None if none is left."""
+        return self.quota.pick(self._current_key_idx)
+
+    def _rotate_key(self, idx: int) -> bool:
+        """Take key `idx` out of rotation. Returns True if another key is available."""
+        if self.quota.mark_exhausted(idx):
+            # Every worker skips this key for the next hour
+            next_idx = self._select_key()
+        elif len(self.api_keys) <= 1:
+            return False
+        else:
+            next_idx = (idx + 1) % len(self.api_keys)
+        if next_idx is None:
             return False
-        old_idx = self._current_key_idx
-        self._current_key_idx = (self._current_key_idx + 1) % len(self.api_keys)
-        logger.info(f"Rotated Unsplash API key: {old_idx} -> {self._current_key_idx}")
+        # Only where the next search starts without Redis; concurrent
+        # searches keep their own index
+        self._current_key_idx = next_idx
+        logger.info(f"Rotated Unsplash API key: {idx} -> {next_idx}")
         return True
 
-    def _get_cache_key(self, query: str, orientation: str = "landscape") -> str:
-        """Generate a deterministic cache key for a query."""
-        key_str = f"unsplash:{query}:{orientation}"
-        hash_str = hashlib.md5(key_str.encode()).hexdigest()
-        return f"unsplash_image_{hash_str}"
-
-    def search_photo(
-        self,
-        query: str,
-        orientation: str = "landscape",
-        use_cache: bool = True,
-        page: int = 1,
-        per_page: int = 10,
-        article_id: str = None,
-    ) -> Optional[dict]:
-        """
-        Search for photos matching the query. Auto-rotates API keys on rate limit.
-
-        Args:
-            query: Search terms (e.g., "stock market trading")
-            orientation: Image orientation (landscape, portrait, squarish)
-            use_cache: Whether to use cached results
-            page: Page number for pagination
-            per_page: Number of results per page
-            article_id: Optional article ID for deterministic randomization
-
-        Returns:
-            Dict with image URLs and attribution, or None
-        """
-        if not self.is_configured:
-            return None
-
-        # Check cache first
-        cache_key = self._get_cache_key(f"{query}:{article_id or ''}", orientation)
-        if use_cache and article_id:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                logger.debug(f"Unsplash cache hit for: {query}")
-                return cached
+    @staticmethod
+    def _compact(photo: dict) -> dict:
+        """The parts of a search result we use, in the same shape (kept small for the store)."""
+        return {
+            "id": photo["id"],
+            "alt_description": photo.get("alt_description") or "",
+            "description": photo.get("description") or "",
+            "urls": {size: photo["urls"][size] for size in ("raw", "full", "regular", "small", "thumb")},
+            "user": {"name": photo["user"]["name"], "links": {"html": photo["user"]["links"]["html"]}},
+            "links": {"html": photo["links"]["html"]},
+        }
 
+    def _search(self, query, orientation, page, per_page):
+        """Raw search results from the API, or None if every key failed."""
         # Try each API key (rotate on 403)
         attempts = len(self.api_keys)
         for attempt in range(attempts):
-            current_key = self._get_current_key()
+            # A local, not self._current_key_idx: set_article_images searches
+            # from several threads on one service
+            idx = self._select_key()
+            if idx is None:
+                logger.error("All Unsplash API keys rate limited")
+                return None
             try:
                 response = requests.get(
                     f"{self.BASE_URL}/search/photos",
@@ -226,91 +227,27 @@ class UnsplashService:
                         "content_filter": "high",
                     },
                     headers={
-                        "Authorization": f"Client-ID {current_key}",
+                        "Authorization": f"Client-ID {self.api_keys[idx]}",
                         "Accept-Version": "v1",
                     },
                     timeout=10,
                 )
+                self.quota.record_call(idx)
 
                 # Rate limited — rotate to next key and retry
                 if response.status_code == 403:
-                    logger.warning(f"Unsplash key {self._current_key_idx} rate limited, rotating...")
-                    if self._rotate_key():
+                    logger.warning(f"Unsplash key {idx} rate limited, rotating...")
+                    if self._rotate_key(idx):
                         continue  # retry with next key
                     else:
                         logger.error("All Unsplash API keys rate limited")
                         return None
 
                 response.raise_for_status()
-                data = response.json()
-
-                results = data.get("results", [])
-                if not results:
-                    logger.info(f"No Unsplash results for: {query}")
-                    return None
-
-                # Filter out blocked images and Western/American images
-                WESTERN_BLOCKLIST = [
-                    'wall street', 'new york', 'manhattan', 'times square',
-                    'bank of america', 'federal reserve', 'capitol hill',
-                    'london city', 'canary wharf', 'tokyo', 'shanghai',
-                ]
-                blocked_ids = getattr(ArticleImageService, 'BLOCKED_IMAGE_IDS', set())
-                filtered = [
-                    p for p in results
-                    if not any(bid in p.get("id", "") for bid in blocked_ids)
-                    and not any(
-                        term in (p.get("alt_description", "") or "").lower()
-                        or term in (p.get("description", "") or "").lower()
-                        for term in WESTERN_BLOCKLIST
-                    )
-                ]
-                # Use filtered results if any remain, otherwise use all
-                pool = filtered if filtered else results
-
-                # Pick image — deterministic if article_id provided
-                if article_id:
-                    seed = int(hashlib.md5(article_id.encode()).hexdigest()[:8], 16)
-                    random.seed(seed)
-                photo = random.choice(pool)
-                if article_id:
-                    random.seed()
-
-                result = {
-                    "id": photo["id"],
-                    "url_raw": photo["urls"]["raw"],
-                    "url_full": photo["urls"]["full"],
-                    "url_regular": photo["urls"]["regular"],
-                    "url_small": photo["urls"]["small"],
-                    "url_thumb": photo["urls"]["thumb"],
-                    "url": f"{photo['urls']['raw']}&w=800&h=450&fit=crop&auto=format",
-                    "alt_description": photo.get("alt_description", ""),
-                    "photographer": photo["user"]["name"],
-                    "photographer_url": photo["user"]["links"]["html"],
-                    "unsplash_url": photo["links"]["html"],
-                    "attribution": (
-                        f'Photo by <a href="{photo["user"]["links"]["html"]}?utm_source=bardiq&utm_medium=referral">'
-                        f'{photo["user"]["name"]}</a> on '
-                        f'<a href="https://unsplash.com/?utm_source=bardiq&utm_medium=referral">Unsplash</a>'
-                    ),
-                    "all_results": [
-                        {
-                            "id": p["id"],
-                            "url": f"{p['urls']['raw']}&w=800&h=450&fit=crop&auto=format",
-                            "photographer": p["user"]["name"],
-                            "alt_description": p.get("alt_description", ""),
-                        }
-                        for p in results
-                    ],
-                }
-
-                if use_cache and article_id:
-                    cache.set(cache_key, result, IMAGE_CACHE_DURATION)
-
-                return result
+                return [self._compact(photo) for photo in response.json().get("results", [])]
 
             except requests.exceptions.RequestException as e:
-                if "403" in str(e) and self._rotate_key():
+                if "403" in str(e) and self._rotate_key(idx):
                     continue
                 logger.error(f"Unsplash API request failed: {e}")
                 return None
@@ -320,6 +257,101 @@ class UnsplashService:
 
         return None
 
+    def search_photo(
+        self,
+        query: str,
+        orientation: str = "landscape",
+        use_cache: bool = True,
+        page: int = 1,
+        per_page: int = 10,
+        article_id: str = None,
+    ) -> Optional[dict]:
+        """
+        Search for photos matching the query. Auto-rotates API keys on rate limit.
+
+        Args:
+            query: Search terms (e.g., "stock market trading")
+            orientation: Image orientation (landscape, portrait, squarish)
+            use_cache: Whether to read the shared search result store
+                (fresh results are always written to it)
+            page: Page number for pagination
+            per_page: Number of results per page
+            article_id: Optional article ID for deterministic randomization
+
+        Returns:
+            Dict with image URLs and attribution, or None
+        """
+        if not self.is_configured:
+            return None
+
+        results = image_store.get_results(query, orientation, page, per_page) if use_cache else None
+        if results is not None:
+            logger.debug(f"Unsplash cache hit for: {query}")
+        else:
+            results = self._search(query, orientation, page, per_page)
+            if results is None:
+                return None
+            image_store.set_results(query, results, orientation, page, per_page)
+
+        if not results:
+            logger.info(f"No Unsplash results for: {query}")
+            return None
+
+        # Filter out blocked images and Western/American images
+        WESTERN_BLOCKLIST = [
+            'wall street', 'new york', 'manhattan', 'times square',
+            'bank of america', 'federal reserve', 'capitol hill',
+            'london city', 'canary wharf', 'tokyo', 'shanghai',
+        ]
+        blocked_ids = getattr(ArticleImageService, 'BLOCKED_IMAGE_IDS', set())
+        filtered = [
+            p for p in results
+            if not any(bid in p.get("id", "") for bid in blocked_ids)
+            and not any(
+                term in (p.get("alt_description", "") or "").lower()
+                or term in (p.get("description", "") or "").lower()
+                for term in WESTERN_BLOCKLIST
+            )
+        ]
+        # Use filtered results if any remain, otherwise use all
+        pool = filtered if filtered else results
+
+        # Pick image — deterministic if article_id provided
+        if article_id:
+            seed = int(hashlib.md5(article_id.encode()).hexdigest()[:8], 16)
+            random.seed(seed)
+        photo = random.choice(pool)
+        if article_id:
+            random.seed()
+
+        return {
+            "id": photo["id"],
+            "url_raw": photo["urls"]["raw"],
+            "url_full": photo["urls"]["full"],
+            "url_regular": photo["urls"]["regular"],
+            "url_small": photo["urls"]["small"],
+            "url_thumb": photo["urls"]["thumb"],
+            "url": f"{photo['urls']['raw']}&w=800&h=450&fit=crop&auto=format",
+            "alt_description": photo.get("alt_description", ""),
+            "photographer": photo["user"]["name"],
+            "photographer_url": photo["user"]["links"]["html"],
+            "unsplash_url": photo["links"]["html"],
+            "attribution": (
+                f'Photo by <a href="{photo["user"]["links"]["html"]}?utm_source=bardiq&utm_medium=referral">'
+                f'{photo["user"]["name"]}</a> on '
+                f'<a href="https://unsplash.com/?utm_source=bardiq&utm_medium=referral">Unsplash</a>'
+            ),
+            "all_results": [
+                {
+                    "id": p["id"],
+                    "url": f"{p['urls']['raw']}&w=800&h=450&fit=crop&auto=format",
+                    "photographer": p["user"]["name"],
+                    "alt_description": p.get("alt_description", ""),
+                }
+                for p in results
+            ],
+        }
+
 
 class ArticleImageService:
     """
@@ -328,12 +360,12 @@ class ArticleImageService:
     Provides relevant images for articles that don't have featured images
     by analyzing article content and category.
 
-    Tracks used URLs within a session to prevent duplicate images in the same feed.
+    Tracks used URLs within a feed cycle to prevent duplicate images in the same feed.
     """
 
-    # Class-level URL tracker — shared across all instances within a process
+    # Used URL tracker — shared by all workers through Redis (per process without it)
     # Reset with ArticleImageService.reset_session() at the start of each feed cycle
-    _session_used_urls: set[str] = set()
+    _session_used_urls = UsedImageURLs()
 
     @classmethod
     def reset_session(cls):
@@ -342,7 +374,7 @@ class ArticleImageService:
 
     def _pick_unused(self, urls: list[str], title: str) -> str | None:
         """Pick a URL from the list that hasn't been used yet in this session."""
-        unused = [u for u in urls if u not in self._used_urls]
+        unused = self._used_urls.unused(urls)
         if unused:
             picked = unused[hash(title) % len(unused)]
         elif urls:
@@ -784,7 +816,7 @@ class ArticleImageService:
                     chosen_url = unsplash_result["url"]
                     all_results = unsplash_result.get("all_results", [])
                     if all_results and chosen_url in self._used_urls:
-                        unused = [r["url"] for r in all_results if r["url"] not in self._used_urls]
+                        unused = self._used_urls.unused([r["url"] for r in all_results])
                         if unused:
                             chosen_url = unused[0]
 
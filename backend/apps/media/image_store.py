@@ -0,0 +1,196 @@
+"""
+Shared Unsplash state for every worker process.
+
+- Search results: each (query, orientation, page, per_page) search is
+  stored in the cache (Redis) for RESULTS_TTL, empty results for
+  EMPTY_RESULTS_TTL, so the same topic is searched once per day across
+  all workers and cycles instead of once per call.
+- Used image URLs: a Redis set of image URLs handed out this feed cycle,
+  so two workers don't pick the same photo for different articles.
+- API keys: calls per key per clock hour are counted in Redis, and a key
+  that answers 403 is marked exhausted for an hour for everyone. Each
+  call goes to the non-exhausted key with the fewest calls this hour.
+
+Without Redis (dummy cache in tests, Redis outage) the used-URL set and
+key choice fall back to per-process state.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.analytics.counters import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RESULTS_TTL = 24 * 60 * 60
+EMPTY_RESULTS_TTL = 60 * 60
+USED_URLS_TTL = 6 * 60 * 60
+EXHAUSTED_TTL = 60 * 60
+
+USED_URLS_KEY = "unsplash:used_urls"
+CALLS_KEY = "unsplash:calls:{}:{}"  # key index, hour
+EXHAUSTED_KEY = "unsplash:exhausted:{}"  # key index
+
+
+# =========================
+# Search results
+# =========================
+
+def results_cache_key(query: str, orientation: str, page: int, per_page: int) -> str:
+    key = f"{query.strip().lower()}|{orientation}|{page}|{per_page}"
+    return f"unsplash:search:{hashlib.md5(key.encode()).hexdigest()}"
+
+
+def get_results(query, orientation="landscape", page=1, per_page=10):
+    """Stored raw results for a search ([] if it found nothing), or None if not stored."""
+    return cache.get(results_cache_key(query, orientation, page, per_page))
+
+
+def set_results(query, results, orientation="landscape", page=1, per_page=10):
+    ttl = RESULTS_TTL if results else EMPTY_RESULTS_TTL
+    cache.set(results_cache_key(query, orientation, page, per_page), results, ttl)
+
+
+# =========================
+# Used image URLs
+# =========================
+
+class UsedImageURLs:
+    """Set-like view of the image URLs used this cycle, shared through Redis."""
+
+    _local: set[str] = set()
+
+    def _redis(self):
+        return get_redis_client()
+
+    def __contains__(self, url) -> bool:
+        conn = self._redis()
+        if conn is not None:
+            try:
+                return bool(conn.sismember(USED_URLS_KEY, url))
+            except Exception as e:
+                logger.warning(f"Used image URL lookup failed: {e}")
+        return url in self._local
+
+    def unused(self, urls) -> list:
+        """The URLs not used yet, in order, in one round trip."""
+        conn = self._redis()
+        if conn is not None and urls:
+            try:
+                pipe = conn.pipeline(transaction=False)
+                for url in urls:
+                    pipe.sismember(USED_URLS_KEY, url)
+                return [url for url, used in zip(urls, pipe.execute()) if not used]
+            except Exception as e:
+                logger.warning(f"Used image URL lookup failed: {e}")
+        return [url for url in urls if url not in self._local]
+
+    def add(self, url):
+        self._local.add(url)
+        conn = self._redis()
+        if conn is None:
+            return
+        try:
+            pipe = conn.pipeline()
+            pipe.sadd(USED_URLS_KEY, url)
+            pipe.expire(USED_URLS_KEY, USED_URLS_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Recording used image URL failed: {e}")
+
+    def clear(self):
+        self._local.clear()
+        conn = self._redis()
+        if conn is None:
+            return
+        try:
+            conn.delete(USED_URLS_KEY)
+        except Exception as e:
+            logger.warning(f"Clearing used image URLs failed: {e}")
+
+
+# =========================
+# API key quota
+# =========================
+
+def hourly_limit() -> int:
+    return getattr(settings, "UNSPLASH_HOURLY_LIMIT", 50)
+
+
+def _hour() -> str:
+    return timezone.now().strftime("%Y%m%d%H")
+
+
+class KeyQuota:
+    """Cluster-wide call counts and exhaustion marks for `key_count` API keys."""
+
+    def __init__(self, key_count: int):
+        self.key_count = key_count
+
+    def _state(self, conn):
+        """[(calls this hour, exhausted)] per key, in one round trip."""
+        hour = _hour()
+        pipe = conn.pipeline(transaction=False)
+        for idx in range(self.key_count):
+            pipe.get(CALLS_KEY.format(idx, hour))
+            pipe.exists(EXHAUSTED_KEY.format(idx))
+        values = pipe.execute()
+        return [(int(values[i] or 0), bool(values[i + 1])) for i in range(0, len(values), 2)]
+
+    def pick(self, fallback: int):
+        """
+        Index of the key to use next: the non-exhausted key with the fewest
+        calls this hour, None if every key is exhausted, or `fallback`
+        without Redis.
+        """
+        conn = get_redis_client()
+        if conn is None or not self.key_count:
+            return fallback
+        try:
+            state = self._state(conn)
+        except Exception as e:
+            logger.warning(f"Unsplash quota lookup failed: {e}")
+            return fallback
+        available = [(calls, idx) for idx, (calls, exhausted) in enumerate(state) if not exhausted]
+        return min(available)[1] if available else None
+
+    def record_call(self, idx: int):
+        conn = get_redis_client()
+        if conn is None:
+            return
+        key = CALLS_KEY.format(idx, _hour())
+        try:
+            pipe = conn.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, 2 * 60 * 60)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Recording Unsplash call failed: {e}")
+
+    def mark_exhausted(self, idx: int) -> bool:
+        """Take key `idx` out of rotation for an hour; False without Redis."""
+        conn = get_redis_client()
+        if conn is None:
+            return False
+        try:
+            conn.set(EXHAUSTED_KEY.format(idx), 1, ex=EXHAUSTED_TTL)
+            return True
+        except Exception as e:
+            logger.warning(f"Marking Unsplash key exhausted failed: {e}")
+            return False
+
+    def remaining(self):
+        """Calls left this hour across all keys, or None when unknown."""
+        conn = get_redis_client()
+        if conn is None:
+            return None
+        try:
+            state = self._state(conn)
+        except Exception as e:
+            logger.warning(f"Unsplash quota lookup failed: {e}")
+            return None
+        limit = hourly_limit()
+        return sum(max(0, limit - calls) for calls, exhausted in state if not exhausted)
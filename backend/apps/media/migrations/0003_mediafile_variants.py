@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("media", "0002_add_media_file_model"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediafile",
+            name="variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive derivatives (apps.media.derivatives)",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("media", "0003_mediafile_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediafile",
+            name="download_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -27,10 +27,17 @@ class MediaFile(TimeStampedModel):
     # Image specific
     width = models.PositiveIntegerField(null=True, blank=True)
     height = models.PositiveIntegerField(null=True, blank=True)
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Responsive derivatives (apps.media.derivatives)",
+    )
 
     # Metadata
     alt_text = models.CharField(max_length=255, blank=True)
     caption = models.TextField(blank=True)
+    download_count = models.PositiveIntegerField(default=0, editable=False)
 
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -9,6 +9,7 @@ from .models import Video, VideoCategory, PodcastShow, PodcastEpisode, YouTubeCh
 class MediaFileSerializer(serializers.ModelSerializer):
     """Serializer for MediaFile model."""
     url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     size_display = serializers.CharField(read_only=True)
     dimensions = serializers.CharField(read_only=True)
     uploaded_by_name = serializers.CharField(source="uploaded_by.full_name", read_only=True)
@@ -20,6 +21,7 @@ class MediaFileSerializer(serializers.ModelSerializer):
             "name",
             "file",
             "url",
+            "srcset",
             "file_type",
             "mime_type",
             "size",
@@ -29,12 +31,13 @@ class MediaFileSerializer(serializers.ModelSerializer):
             "dimensions",
             "alt_text",
             "caption",
+            "download_count",
             "uploaded_by",
             "uploaded_by_name",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "url", "size", "mime_type", "width", "height", "uploaded_by", "created_at", "updated_at"]
+        read_only_fields = ["id", "url", "size", "mime_type", "width", "height", "download_count", "uploaded_by", "created_at", "updated_at"]
 
     def get_url(self, obj):
         request = self.context.get("request")
@@ -42,6 +45,11 @@ class MediaFileSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.file.url)
         return obj.url
 
+    def get_srcset(self, obj):
+        from .derivatives import srcset
+
+        return srcset(obj.file.name, obj.variants, obj.file.storage, self.context.get("request"))
+
 
 class MediaFileUploadSerializer(serializers.ModelSerializer):
     """Serializer for uploading media files."""
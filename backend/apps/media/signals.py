@@ -0,0 +1,43 @@
+"""
+Media app Django signals.
+
+Handles:
+- Queueing responsive image derivatives after an image upload
+  (every model/field in apps.media.derivatives.IMAGE_FIELDS)
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .derivatives import IMAGE_FIELDS
+
+
+def queue_image_derivatives(sender, instance, update_fields=None, **kwargs):
+    """Build variants in the background when the image field holds a new upload."""
+    field_name, variants_field = IMAGE_FIELDS[sender._meta.label]
+    if update_fields is not None and field_name not in update_fields:
+        return
+    if getattr(instance, "file_type", "image") != "image":
+        return
+    file = getattr(instance, field_name)
+    if not file or (getattr(instance, variants_field) or {}).get("source") == file.name:
+        return
+
+    label, pk = sender._meta.label, str(instance.pk)
+
+    def enqueue():
+        from django_q.tasks import async_task
+
+        async_task(
+            "apps.media.derivatives.generate_derivatives",
+            label,
+            pk,
+            task_name=f"image-variants-{label}-{pk}",
+        )
+
+    transaction.on_commit(enqueue)
+
+
+for _label in IMAGE_FIELDS:
+    post_save.connect(
+        queue_image_derivatives, sender=_label, dispatch_uid=f"image-derivatives:{_label}"
+    )
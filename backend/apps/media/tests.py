@@ -387,3 +387,133 @@ class MediaFileModelTests(TestCase):
         """Test string representation."""
         media_file = MediaFile(name="example.jpg")
         self.assertEqual(str(media_file), "example.jpg")
+
+
+@override_settings(
+    UNSPLASH_ACCESS_KEY="key-1",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class UnsplashSearchStoreTests(TestCase):
+    """Search results are shared through the cache, whatever the caller."""
+
+    def test_identical_searches_hit_the_api_once(self):
+        from unittest import mock
+
+        from .image_service import UnsplashService
+
+        photo = {
+            "id": "abc",
+            "alt_description": "port cranes",
+            "description": None,
+            "urls": {size: f"https://images.unsplash.com/{size}?ixid=1" for size in ("raw", "full", "regular", "small", "thumb")},
+            "user": {"name": "A. Photographer", "links": {"html": "https://unsplash.com/@a"}},
+            "links": {"html": "https://unsplash.com/photos/abc"},
+        }
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"results": [photo]}
+
+        with mock.patch("apps.media.image_service.requests.get", return_value=response) as get:
+            first = UnsplashService().search_photo("shipping port containers", article_id="a1")
+            second = UnsplashService().search_photo("shipping port containers")
+            UnsplashService().search_photo("shipping port containers", use_cache=False)
+
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(first["url"], second["url"])
+        self.assertEqual(first["photographer"], "A. Photographer")
+
+
+@override_settings(UNSPLASH_ACCESS_KEY="key-1", UNSPLASH_ACCESS_KEY_2="key-2", UNSPLASH_ACCESS_KEY_3="")
+class UnsplashKeyRotationTests(TestCase):
+    """A search keeps using, recording and rotating away from its own key."""
+
+    def test_rotation_ignores_other_threads(self):
+        from unittest import mock
+
+        from .image_service import UnsplashService
+        from .image_store import KeyQuota
+
+        service = UnsplashService()
+        limited = mock.Mock(status_code=403)
+        ok = mock.Mock(status_code=200)
+        ok.json.return_value = {"results": []}
+
+        def get(url, params, headers, timeout):
+            if get.calls == 0:
+                service._current_key_idx = 1  # Another search rotated meanwhile
+            get.calls += 1
+            return limited if headers["Authorization"] == "Client-ID key-1" else ok
+        get.calls = 0
+
+        with mock.patch("apps.media.image_service.requests.get", side_effect=get) as requests_get, \
+                mock.patch.object(KeyQuota, "record_call") as record_call:
+            results = service._search("harbour", "landscape", 1, 10)
+
+        self.assertEqual(results, [])
+        used = [call.kwargs["headers"]["Authorization"] for call in requests_get.call_args_list]
+        self.assertEqual(used, ["Client-ID key-1", "Client-ID key-2"])
+        self.assertEqual([call.args[0] for call in record_call.call_args_list], [0, 1])
+
+
+@override_settings(MEDIA_ROOT="/tmp/test_media/")
+class ImageDerivativeTests(TestCase):
+    """Uploaded images get resized WebP variants and a blurhash."""
+
+    def test_variants_generated_after_upload(self):
+        from .derivatives import generate_derivatives, srcset
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media_file = MediaFile.objects.create(
+                file=create_test_image("wide.jpg", size=(700, 350)),
+                name="wide.jpg",
+                file_type="image",
+            )
+        media_file.refresh_from_db()
+
+        data = media_file.variants
+        self.assertEqual(data["source"], media_file.file.name)
+        self.assertEqual(sorted(data["variants"]["webp"], key=int), ["320", "640", "700"])
+        self.assertEqual(len(data["blurhash"]), 28)
+        self.assertIn("320w", srcset(media_file.file.name, data, media_file.file.storage)["webp"])
+        self.assertEqual(generate_derivatives("media.MediaFile", media_file.pk), "Up to date")
+
+
+@override_settings(MEDIA_ROOT="/tmp/test_media/")
+class MediaDownloadTests(APITestCase):
+    """Library downloads honour Range requests and count each download once."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="dl@example.com", password="testpass123")
+        self.client.force_authenticate(self.user)
+        self.media_file = MediaFile.objects.create(
+            file=create_test_pdf("report.pdf"),
+            name="report.pdf",
+            file_type="document",
+        )
+        self.url = f"/api/v1/media/library/{self.media_file.pk}/download/"
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_range_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(self._body(response), b"%PDF-1.4 test content")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5-7")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 5-7/21")
+        self.assertEqual(self._body(response), b"1.4")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-")
+        self.assertEqual(response.status_code, 416)
+
+        self.media_file.refresh_from_db()
+        self.assertEqual(self.media_file.download_count, 1)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT="/protected-media/")
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.media_file.file.name}")
+        self.assertEqual(response.content, b"")
@@ -1,7 +1,6 @@
 """
 Media Views - Videos, Podcasts, and Media Library
 """
-from django.http import FileResponse
 from django.utils.text import slugify
 from django.utils import timezone
 
@@ -57,19 +56,20 @@ class MediaFileViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"])
     def download(self, request, pk=None):
-        """Download a file."""
+        """Download a file (presigned redirect, X-Accel-Redirect or ranged stream)."""
+        from apps.analytics.counters import record_hit
+
+        from .downloads import is_first_request, serve_file
+
         media_file = self.get_object()
         if not media_file.file:
             return Response(
                 {"error": "File not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        response = FileResponse(
-            media_file.file.open("rb"),
-            as_attachment=True,
-            filename=media_file.name
-        )
-        return response
+        if is_first_request(request):
+            record_hit("media_download", media_file.pk)
+        return serve_file(request, media_file.file, filename=media_file.name)
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
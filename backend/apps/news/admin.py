@@ -3,6 +3,7 @@ News Admin Configuration
 """
 from django.contrib import admin
 
+from .comments import invalidate_thread
 from .models import Category, NewsArticle, Tag, Comment, CommentLike
 
 
@@ -96,10 +97,12 @@ class CommentAdmin(admin.ModelAdmin):
     @admin.action(description="Approve selected comments")
     def approve_comments(self, request, queryset):
         queryset.update(is_approved=True)
+        invalidate_thread(*queryset.values_list("article_id", flat=True))
 
     @admin.action(description="Unapprove selected comments")
     def unapprove_comments(self, request, queryset):
         queryset.update(is_approved=False)
+        invalidate_thread(*queryset.values_list("article_id", flat=True))
 
 
 @admin.register(CommentLike)
@@ -0,0 +1,113 @@
+"""
+Comment threads for an article.
+
+An article's discussion is loaded in one query (every visible comment,
+with author and profile joined) and assembled into top-level comments
+with their replies in memory, instead of a replies / reply_count / likes
+query per comment. The public (approved-only) thread is serialized once
+and cached per article; viewer-specific flags (is_liked, can_edit,
+can_delete) are overlaid per request from one query for the viewer's
+liked comment IDs.
+
+The cache is dropped by apps.news.signals whenever a comment of the
+article is saved or deleted (create, edit, approve, like count) and by
+the admin approve/unapprove actions, which use queryset.update().
+"""
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.core.cache import CacheTTL
+
+CACHE_KEY = "comments:thread:{}"
+
+
+def thread_cache_key(article_id) -> str:
+    return CACHE_KEY.format(article_id)
+
+
+def invalidate_thread(*article_ids):
+    """Drop the cached thread of each article."""
+    cache.delete_many([thread_cache_key(article_id) for article_id in set(article_ids)])
+
+
+def build_thread(article_id, include_unapproved=False) -> list:
+    """
+    Serialized top-level comments for an article, newest first, each with
+    its approved replies oldest first. Viewer flags are left False.
+
+    With include_unapproved (staff moderation), unapproved top-level
+    comments are listed too; replies are always approved only.
+    """
+    from .models import Comment
+    from .serializers import CommentSerializer
+
+    visible = Q(is_approved=True)
+    if include_unapproved:
+        visible |= Q(parent__isnull=True)
+    comments = list(
+        Comment.objects.filter(visible, article_id=article_id)
+        .select_related("author", "author__profile")
+        .order_by("created_at")
+    )
+
+    replies = {}
+    reply_counts = {}
+    for comment in comments:
+        if comment.parent_id is not None and comment.is_approved:
+            replies.setdefault(comment.parent_id, []).append(comment)
+            reply_counts[comment.parent_id] = reply_counts.get(comment.parent_id, 0) + 1
+
+    serializer_context = {"reply_counts": reply_counts}
+    thread = []
+    for comment in reversed(comments):
+        if comment.parent_id is not None:
+            continue
+        node = CommentSerializer(comment, context=serializer_context).data
+        node["replies"] = CommentSerializer(
+            replies.get(comment.pk, []), many=True, context=serializer_context
+        ).data
+        thread.append(node)
+    return thread
+
+
+def get_thread(article_id, include_unapproved=False) -> list:
+    """The article's thread; the public variant is served from cache."""
+    if include_unapproved:
+        return build_thread(article_id, include_unapproved=True)
+    key = thread_cache_key(article_id)
+    thread = cache.get(key)
+    if thread is None:
+        thread = build_thread(article_id)
+        cache.set(key, thread, CacheTTL.MEDIUM)
+    return thread
+
+
+def render_thread(nodes, article_id, user) -> list:
+    """Copies of thread nodes with is_liked / can_edit / can_delete for the viewer."""
+    if not user.is_authenticated:
+        return nodes
+
+    from .models import CommentLike
+
+    liked = {
+        str(comment_id)
+        for comment_id in CommentLike.objects.filter(
+            user=user, comment__article_id=article_id
+        ).values_list("comment_id", flat=True)
+    }
+    user_id = str(user.pk)
+
+    def personalize(node):
+        node = dict(node)
+        own = str(node["author"]["id"]) == user_id
+        node["is_liked"] = str(node["id"]) in liked
+        node["can_edit"] = own
+        node["can_delete"] = own or user.is_staff
+        return node
+
+    rendered = []
+    for node in nodes:
+        item = personalize(node)
+        item["replies"] = [personalize(reply) for reply in node["replies"]]
+        rendered.append(item)
+    return rendered
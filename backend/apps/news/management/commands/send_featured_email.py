@@ -9,6 +9,7 @@ Usage:
     python manage.py send_featured_email --sync          # send inline (no worker)
 """
 from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
 
 from apps.news.models import NewsArticle
 
@@ -60,15 +61,18 @@ class Command(BaseCommand):
             f"Sending '{article.title}' to {subscriber_count} subscriber(s)..."
         )
 
+        # A fresh campaign key per invocation: this is a deliberate re-send
+        campaign_key = f"featured_article:{article.id}:cli:{timezone.now():%Y%m%d%H%M%S}"
         if sync:
             from apps.news.signals import _send_featured_article_emails
-            _send_featured_article_emails(str(article.id))
+            _send_featured_article_emails(str(article.id), campaign_key)
             self.stdout.write(self.style.SUCCESS("Done (sync)."))
         else:
             from django_q.tasks import async_task
             async_task(
                 "apps.news.signals._send_featured_article_emails",
                 str(article.id),
+                campaign_key,
                 task_name=f"featured-article-cli-{article.slug}",
             )
             self.stdout.write(self.style.SUCCESS("Queued (django-q worker will deliver)."))
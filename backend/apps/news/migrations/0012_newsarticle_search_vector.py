@@ -0,0 +1,15 @@
+"""Trigger-maintained full-text search vector + GIN index (Postgres only)."""
+from django.db import migrations
+
+from apps.search.operations import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0011_newsarticle_writer"),
+    ]
+
+    operations = [
+        AddSearchVector("NewsArticle", [("title", "A"), ("excerpt", "B"), ("content", "C")]),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def backfill_feed_eligibility(apps, schema_editor):
+    NewsArticle = apps.get_model("news", "NewsArticle")
+    articles = NewsArticle._base_manager.all()
+    articles.update(content_length=Length("content"))
+    articles.filter(
+        models.Q(source="editorial") | models.Q(content_length__gte=500),
+        models.Q(featured_image__gt="") | models.Q(featured_image_url__gt=""),
+    ).update(is_feed_eligible=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0012_newsarticle_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsarticle",
+            name="content_length",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Content Length"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsarticle",
+            name="is_feed_eligible",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Editorial or 500+ chars of content, and has an image",
+                verbose_name="Feed Eligible",
+            ),
+        ),
+        migrations.RunPython(backfill_feed_eligibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(
+                condition=models.Q(("is_feed_eligible", True)),
+                fields=["is_feed_eligible", "status", "-priority", "-published_at"],
+                name="news_article_feed_idx",
+            ),
+        ),
+    ]
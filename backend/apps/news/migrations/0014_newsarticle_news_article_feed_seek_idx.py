@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0013_newsarticle_feed_eligibility"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newsarticle",
+            index=models.Index(
+                condition=models.Q(("is_feed_eligible", True)),
+                fields=["status", "-published_at", "-id"],
+                name="news_article_feed_seek_idx",
+            ),
+        ),
+    ]
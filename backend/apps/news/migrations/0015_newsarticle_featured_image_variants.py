@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("news", "0014_newsarticle_news_article_feed_seek_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsarticle",
+            name="featured_image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive derivatives (apps.media.derivatives)",
+                verbose_name="Featured Image Variants",
+            ),
+        ),
+    ]
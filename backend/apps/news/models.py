@@ -12,7 +12,7 @@ from django.utils import timezone
 from django.utils.text import slugify
 from ckeditor_uploader.fields import RichTextUploadingField
 
-from apps.core.models import BaseModel, TimeStampedModel
+from apps.core.models import BaseModel, TimeStampedModel, TrackedFieldsMixin
 
 
 class Category(TimeStampedModel):
@@ -104,7 +104,7 @@ class Tag(TimeStampedModel):
         super().save(*args, **kwargs)
 
 
-class NewsArticle(BaseModel):
+class NewsArticle(TrackedFieldsMixin, BaseModel):
     """
     Main news article model.
 
@@ -175,6 +175,13 @@ class NewsArticle(BaseModel):
         null=True,
         blank=True,
     )
+    featured_image_variants = models.JSONField(
+        "Featured Image Variants",
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Responsive derivatives (apps.media.derivatives)",
+    )
     featured_image_url = models.URLField(
         "Featured Image URL",
         max_length=500,
@@ -320,6 +327,21 @@ class NewsArticle(BaseModel):
         default=5,
     )
 
+    # =========================
+    # Feed (maintained by save())
+    # =========================
+    content_length = models.PositiveIntegerField(
+        "Content Length",
+        default=0,
+        editable=False,
+    )
+    is_feed_eligible = models.BooleanField(
+        "Feed Eligible",
+        default=False,
+        editable=False,
+        help_text="Editorial or 500+ chars of content, and has an image",
+    )
+
     # =========================
     # SEO
     # =========================
@@ -346,12 +368,72 @@ class NewsArticle(BaseModel):
             models.Index(fields=["is_featured", "status"]),
             models.Index(fields=["source", "status"]),
             models.Index(fields=["-priority", "-published_at"]),
+            # Reader feed: WHERE is_feed_eligible AND status = 'published'
+            # ORDER BY priority DESC, published_at DESC
+            models.Index(
+                fields=["is_feed_eligible", "status", "-priority", "-published_at"],
+                condition=models.Q(is_feed_eligible=True),
+                name="news_article_feed_idx",
+            ),
+            # Keyset pages of the reader feed (InfiniteScrollPagination)
+            models.Index(
+                fields=["status", "-published_at", "-id"],
+                condition=models.Q(is_feed_eligible=True),
+                name="news_article_feed_seek_idx",
+            ),
         ]
 
+    # Scraped stubs shorter than this stay off the reader feed
+    FEED_MIN_CONTENT_LENGTH = 500
+    # Fields is_feed_eligible / content_length are derived from
+    FEED_SOURCE_FIELDS = {"content", "source", "featured_image", "featured_image_url"}
+    # Previous values read by apps.news.signals (alert on transitions)
+    tracked_fields = ("is_breaking", "is_featured")
+    # Fields whose save must go through save() and its signals
+    # (slug dedupe, published_at, alerts, sitemap refresh)
+    SAVE_ONLY_FIELDS = {"title", "slug", "status", "published_at", "is_breaking", "is_featured"}
+
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
+    def refresh_feed_eligibility(self, recount=True):
+        """
+        Recompute content_length and is_feed_eligible from the current field
+        values. recount=False keeps the stored content_length (the content
+        isn't being written, and may not be loaded).
+        """
+        if recount:
+            self.content_length = len(self.content or "")
+        has_image = bool(self.featured_image) or bool(self.featured_image_url)
+        long_enough = (
+            self.source == self.Source.EDITORIAL
+            or self.content_length >= self.FEED_MIN_CONTENT_LENGTH
+        )
+        self.is_feed_eligible = has_image and long_enough
+
+    def refresh_read_time(self):
+        """Calculate read time (average 200 words per minute)."""
+        if self.content:
+            word_count = len(self.content.split())
+            self.read_time_minutes = max(1, word_count // 200)
+
+    def refresh_priority(self):
+        """
+        Auto-set priority based on source (editorial content ranks higher),
+        so in-house content appears above aggregated content.
+        """
+        if self.source == self.Source.EDITORIAL:
+            base_priority = 10
+        elif self.source == self.Source.SYNDICATED:
+            base_priority = 5
+        else:
+            base_priority = 0
+
+        # Only set if priority hasn't been manually adjusted
+        if self.priority in [0, 5, 10]:
+            self.priority = base_priority
+
+    def unique_slug(self) -> str:
         # Normalize: use explicit slug if provided, else derive from title.
         # Always run through slugify so user-entered slugs with spaces/symbols
         # get cleaned ("My URL!" → "my-url"), then dedupe on collision.
@@ -363,32 +445,68 @@ class NewsArticle(BaseModel):
             suffix = f"-{i}"
             slug = f"{base[:290 - len(suffix)]}{suffix}"
             i += 1
-        self.slug = slug
+        return slug
 
+    def save(self, *args, **kwargs):
+        # A partial save (update_fields) only recomputes what depends on the
+        # fields being written, and writes the derived fields with them; a
+        # full save recomputes everything.
+        update_fields = kwargs.get("update_fields")
+        touched = None if update_fields is None else set(update_fields)
+
+        def touches(fields):
+            return touched is None or not touched.isdisjoint(fields)
+
+        derived = set()
+        if touches(self.FEED_SOURCE_FIELDS):
+            self.refresh_feed_eligibility(recount=touches({"content"}))
+            derived |= {"content_length", "is_feed_eligible"}
+        if touches({"slug", "title"}):
+            self.slug = self.unique_slug()
+            derived.add("slug")
         # Auto-set published_at when status changes to published
-        if self.status == self.Status.PUBLISHED and not self.published_at:
+        if touches({"status"}) and self.status == self.Status.PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
-
-        # Auto-set priority based on source (editorial content ranks higher)
-        # This ensures in-house content appears above aggregated content
-        if self.source == self.Source.EDITORIAL:
-            base_priority = 10
-        elif self.source == self.Source.SYNDICATED:
-            base_priority = 5
-        else:
-            base_priority = 0
-
-        # Only set if priority hasn't been manually adjusted
-        if self.priority == 0 or self.priority in [0, 5, 10]:
-            self.priority = base_priority
-
-        # Calculate read time (average 200 words per minute)
-        if self.content:
-            word_count = len(self.content.split())
-            self.read_time_minutes = max(1, word_count // 200)
-
+            derived.add("published_at")
+        if touches({"source", "priority"}):
+            self.refresh_priority()
+            derived.add("priority")
+        if touches({"content"}):
+            self.refresh_read_time()
+            derived.add("read_time_minutes")
+
+        if touched is not None:
+            kwargs["update_fields"] = touched | derived
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_save(cls, articles, fields, batch_size=500):
+        """
+        Write `fields` of many articles with bulk_update (one UPDATE per
+        batch), for maintenance and scraper jobs. Feed flags and read time
+        are recomputed as in save(); updated_at is bumped. No signals are
+        sent, so fields in SAVE_ONLY_FIELDS are refused.
+        """
+        fields = set(fields)
+        refused = fields & cls.SAVE_ONLY_FIELDS
+        if refused:
+            raise ValueError(f"bulk_save can't write {sorted(refused)}; use save()")
+
+        now = timezone.now()
+        for article in articles:
+            if fields & cls.FEED_SOURCE_FIELDS:
+                article.refresh_feed_eligibility(recount="content" in fields)
+            if "content" in fields:
+                article.refresh_read_time()
+            article.updated_at = now
+
+        if fields & cls.FEED_SOURCE_FIELDS:
+            fields |= {"content_length", "is_feed_eligible"}
+        if "content" in fields:
+            fields.add("read_time_minutes")
+        fields.add("updated_at")
+        return cls.objects.bulk_update(articles, sorted(fields), batch_size=batch_size)
+
     def publish(self):
         """Publish the article."""
         self.status = self.Status.PUBLISHED
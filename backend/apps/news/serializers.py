@@ -1,10 +1,17 @@
 """
 News Serializers
+
+List/detail serializers declare the relations they read (select_related
+fields plus Prefetch objects) and expose `setup_queryset(queryset, prefix)`,
+so every endpoint that renders them — directly or nested under another
+model via `prefix="article__"` — loads a page in a fixed number of queries.
 """
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from apps.core.fast_serializers import ValuesSerializer
 from apps.markets.models import Company
-from apps.markets.serializers import CompanyMinimalSerializer
+from apps.markets.serializers import CompanyMinimalSerializer, CompanyMinimalValues
 from apps.users.models import Writer
 from apps.users.serializers import (
     UserSerializer,
@@ -43,6 +50,43 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug"]
 
 
+class EagerLoadingMixin:
+    """Serializer-declared select_related / prefetch_related requirements."""
+
+    select_related_fields = ()
+    prefetch_fields = ()
+
+    @classmethod
+    def get_prefetches(cls):
+        """Prefetch lookups (strings or Prefetch objects) for this serializer."""
+        return list(cls.prefetch_fields)
+
+    @classmethod
+    def setup_queryset(cls, queryset, prefix=""):
+        """Apply this serializer's relations to queryset (rooted at `prefix`)."""
+        prefetches = []
+        for lookup in cls.get_prefetches():
+            if isinstance(lookup, Prefetch):
+                lookup = Prefetch(
+                    prefix + lookup.prefetch_through,
+                    queryset=lookup.queryset,
+                    to_attr=lookup.to_attr,
+                )
+            else:
+                lookup = prefix + lookup
+            prefetches.append(lookup)
+        return queryset.select_related(
+            *(prefix + field for field in cls.select_related_fields)
+        ).prefetch_related(*prefetches)
+
+
+def related_companies_prefetch():
+    return Prefetch(
+        "related_companies",
+        queryset=CompanyMinimalSerializer.setup_queryset(Company.objects.all()),
+    )
+
+
 # Guaranteed fallback — Unsplash direct URL that never 404s
 ULTIMATE_FALLBACK_IMAGE = "https://images.unsplash.com/photo-1486406146926-c627a92ad1ab?w=800&h=450&fit=crop"
 
@@ -62,7 +106,15 @@ def _get_featured_image(obj, context):
     return ULTIMATE_FALLBACK_IMAGE
 
 
-class NewsArticleAdminListSerializer(serializers.ModelSerializer):
+def _get_featured_image_srcset(name, variants, context):
+    """Responsive WebP/AVIF srcset of the uploaded featured image, once its variants exist."""
+    from apps.media.derivatives import srcset
+
+    storage = NewsArticle._meta.get_field("featured_image").storage
+    return srcset(name, variants, storage, context.get("request"))
+
+
+class NewsArticleAdminListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Minimal serializer for the admin articles table.
 
@@ -77,6 +129,8 @@ class NewsArticleAdminListSerializer(serializers.ModelSerializer):
     category_slug = serializers.CharField(source="category.slug", read_only=True)
     author_name = serializers.SerializerMethodField()
 
+    select_related_fields = ("category", "author", "writer")
+
     class Meta:
         model = NewsArticle
         fields = [
@@ -126,15 +180,22 @@ class NewsArticleAdminListSerializer(serializers.ModelSerializer):
         return data
 
 
-class NewsArticleListSerializer(serializers.ModelSerializer):
+class NewsArticleListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for article listings."""
 
     category = CategorySerializer(read_only=True)
     author = serializers.SerializerMethodField()
     related_companies = CompanyMinimalSerializer(many=True, read_only=True)
     featured_image = serializers.SerializerMethodField()
+    featured_image_srcset = serializers.SerializerMethodField()
     image_attribution = serializers.SerializerMethodField()
 
+    select_related_fields = ("category", "writer", "author", "author__profile")
+
+    @classmethod
+    def get_prefetches(cls):
+        return [related_companies_prefetch()]
+
     class Meta:
         model = NewsArticle
         fields = [
@@ -144,6 +205,7 @@ class NewsArticleListSerializer(serializers.ModelSerializer):
             "subtitle",
             "excerpt",
             "featured_image",
+            "featured_image_srcset",
             "image_attribution",
             "category",
             "content_type",
@@ -192,12 +254,135 @@ class NewsArticleListSerializer(serializers.ModelSerializer):
         """Return image URL — never null, never 404."""
         return _get_featured_image(obj, self.context)
 
+    def get_featured_image_srcset(self, obj):
+        return _get_featured_image_srcset(obj.featured_image.name, obj.featured_image_variants, self.context)
+
     def get_image_attribution(self, obj):
         """Return image attribution. No longer makes API calls."""
         return None
 
 
-class NewsArticleDetailSerializer(serializers.ModelSerializer):
+class NewsArticleListValues(ValuesSerializer):
+    """
+    Fast path for NewsArticleListSerializer over .values() rows.
+
+    Category, writer, author and profile come from the same row via joins;
+    related_companies is one extra query per page.
+    """
+
+    model = NewsArticle
+    fields = (
+        "id",
+        "title",
+        "slug",
+        "subtitle",
+        "excerpt",
+        "featured_image",
+        "featured_image_srcset",
+        "image_attribution",
+        "category",
+        "content_type",
+        "status",
+        "source",
+        "external_url",
+        "external_source_name",
+        "author",
+        "published_at",
+        "created_at",
+        "is_featured",
+        "is_breaking",
+        "is_premium",
+        "view_count",
+        "likes_count",
+        "saves_count",
+        "read_time_minutes",
+        "related_companies",
+    )
+    category_fields = ("id", "name", "slug", "description", "color", "icon", "is_active", "order")
+    extra_columns = (
+        "featured_image",
+        "featured_image_url",
+        "featured_image_variants",
+        *(f"category__{field}" for field in category_fields),
+        "writer_id",
+        "writer__full_name",
+        "writer__avatar",
+        "writer__avatar_url",
+        "writer__title",
+        "writer__organization",
+        "author_id",
+        "author__email",
+        "author__first_name",
+        "author__last_name",
+        "author__profile__avatar",
+    )
+
+    def get_featured_image(self, row):
+        # Same rules as _get_featured_image, from the stored file name
+        name = row["featured_image"]
+        if name:
+            url = NewsArticle._meta.get_field("featured_image").storage.url(name)
+            request = self.context.get("request")
+            return request.build_absolute_uri(url) if request else url
+        return row["featured_image_url"] or ULTIMATE_FALLBACK_IMAGE
+
+    def get_featured_image_srcset(self, row):
+        return _get_featured_image_srcset(row["featured_image"], row["featured_image_variants"], self.context)
+
+    def get_image_attribution(self, row):
+        return None
+
+    def get_category(self, row):
+        category = {field: row[f"category__{field}"] for field in self.category_fields}
+        category["article_count"] = 0
+        return category
+
+    def get_author(self, row):
+        if row["writer_id"]:
+            avatar = row["writer__avatar"]
+            if avatar:
+                avatar = Writer._meta.get_field("avatar").storage.url(avatar)
+            return {
+                "id": str(row["writer_id"]),
+                "full_name": row["writer__full_name"],
+                "avatar": avatar or row["writer__avatar_url"] or None,
+                "title": row["writer__title"],
+                "organization": row["writer__organization"],
+                "is_writer": True,
+            }
+        if row["author_id"]:
+            email = row["author__email"]
+            avatar = row["author__profile__avatar"]
+            full_name = f"{row['author__first_name']} {row['author__last_name']}".strip()
+            return {
+                "id": str(row["author_id"]),
+                "email": email,
+                "full_name": full_name or email,
+                "avatar": self._profile_avatar_url(avatar) if avatar else None,
+                "is_writer": False,
+            }
+        return None
+
+    @staticmethod
+    def _profile_avatar_url(name):
+        from apps.users.models import UserProfile
+
+        return UserProfile._meta.get_field("avatar").storage.url(name)
+
+    def get_related_companies(self, row):
+        return []  # Filled in by attach()
+
+    def attach(self, items, rows):
+        companies = CompanyMinimalValues()
+        by_article = {item["id"]: item["related_companies"] for item in items}
+        linked = Company.objects.filter(news_articles__in=list(by_article)).values(
+            "news_articles", *CompanyMinimalValues.columns()
+        )
+        for row in linked:
+            by_article[row["news_articles"]].append(companies.to_representation(row))
+
+
+class NewsArticleDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for full article details."""
 
     category = CategorySerializer(read_only=True)
@@ -209,10 +394,20 @@ class NewsArticleDetailSerializer(serializers.ModelSerializer):
     editor = UserSerializer(read_only=True)
     related_companies = CompanyMinimalSerializer(many=True, read_only=True)
     featured_image = serializers.SerializerMethodField()
+    featured_image_srcset = serializers.SerializerMethodField()
     image_attribution = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
 
+    select_related_fields = (
+        "category", "writer", "author", "author__profile", "editor", "editor__profile",
+    )
+    prefetch_fields = ("tags",)
+
+    @classmethod
+    def get_prefetches(cls):
+        return [*cls.prefetch_fields, related_companies_prefetch()]
+
     class Meta:
         model = NewsArticle
         fields = [
@@ -223,6 +418,7 @@ class NewsArticleDetailSerializer(serializers.ModelSerializer):
             "excerpt",
             "content",
             "featured_image",
+            "featured_image_srcset",
             "featured_image_caption",
             "image_attribution",
             "category",
@@ -253,33 +449,17 @@ class NewsArticleDetailSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request:
             return False
-        from .models import ArticleLike
-        from apps.analytics.geoip import get_visitor_key
+        from apps.analytics.viewer_state import get_viewer_state
 
-        if request.user.is_authenticated:
-            return ArticleLike.objects.filter(article=obj, user=request.user).exists()
-        vid = get_visitor_key(request)
-        if not vid:
-            return False
-        return ArticleLike.objects.filter(
-            article=obj, user__isnull=True, session_key=vid
-        ).exists()
+        return get_viewer_state(request).has("article_like", obj.pk)
 
     def get_is_saved(self, obj):
         request = self.context.get("request")
         if not request:
             return False
-        from .models import ArticleSave
-        from apps.analytics.geoip import get_visitor_key
+        from apps.analytics.viewer_state import get_viewer_state
 
-        if request.user.is_authenticated:
-            return ArticleSave.objects.filter(article=obj, user=request.user).exists()
-        vid = get_visitor_key(request)
-        if not vid:
-            return False
-        return ArticleSave.objects.filter(
-            article=obj, user__isnull=True, session_key=vid
-        ).exists()
+        return get_viewer_state(request).has("article_save", obj.pk)
 
     def get_author(self, obj):
         """Return byline: writer profile if attached, else uploading user."""
@@ -309,6 +489,9 @@ class NewsArticleDetailSerializer(serializers.ModelSerializer):
         """Return image URL — never null, never 404."""
         return _get_featured_image(obj, self.context)
 
+    def get_featured_image_srcset(self, obj):
+        return _get_featured_image_srcset(obj.featured_image.name, obj.featured_image_variants, self.context)
+
     def get_image_attribution(self, obj):
         """Return image attribution. No longer makes API calls."""
         return None
@@ -517,7 +700,7 @@ class CommentSerializer(serializers.ModelSerializer):
     """Serializer for displaying comments."""
 
     author = CommentAuthorSerializer(read_only=True)
-    reply_count = serializers.IntegerField(read_only=True)
+    reply_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     can_edit = serializers.SerializerMethodField()
     can_delete = serializers.SerializerMethodField()
@@ -546,6 +729,13 @@ class CommentSerializer(serializers.ModelSerializer):
             "is_edited", "edited_at", "created_at", "updated_at",
         ]
 
+    def get_reply_count(self, obj):
+        """Approved replies; from context["reply_counts"] when the caller batched them."""
+        reply_counts = self.context.get("reply_counts")
+        if reply_counts is not None:
+            return reply_counts.get(obj.pk, 0)
+        return obj.reply_count
+
     def get_is_liked(self, obj):
         """Check if the current user has liked this comment."""
         request = self.context.get("request")
@@ -5,38 +5,46 @@ Handles:
 - Breaking news auto-notifications
 - Featured article email notifications to subscribers
 - Article status change events
+- Comment thread cache invalidation
 """
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.template.loader import render_to_string
 
-from .models import NewsArticle
+from .models import Comment, NewsArticle
 
 logger = logging.getLogger(__name__)
 
 
 @receiver(pre_save, sender=NewsArticle)
-def track_article_flag_changes(sender, instance, **kwargs):
+def track_article_flag_changes(sender, instance, update_fields=None, **kwargs):
     """
     Track if is_breaking or is_featured flags are being changed.
 
-    Store the previous state to detect transitions.
+    Store the previous state to detect transitions. Previous values come
+    from the instance's load-time snapshot (TrackedFieldsMixin); the row is
+    only re-read for instances that weren't loaded from the database. A
+    partial save that doesn't write a flag can't change it.
     """
-    if instance.pk:
-        try:
-            old_instance = NewsArticle.objects.get(pk=instance.pk)
-            instance._was_breaking = old_instance.is_breaking
-            instance._was_featured = old_instance.is_featured
-        except NewsArticle.DoesNotExist:
-            instance._was_breaking = False
-            instance._was_featured = False
-    else:
+    if instance._state.adding:
         instance._was_breaking = False
         instance._was_featured = False
+        return
+
+    for field, attr in (("is_breaking", "_was_breaking"), ("is_featured", "_was_featured")):
+        if update_fields is not None and field not in update_fields:
+            previous = getattr(instance, field)
+        else:
+            previous = instance.loaded_value(field)
+            if previous is instance.MISSING:
+                previous = (
+                    NewsArticle.all_objects.filter(pk=instance.pk)
+                    .values_list(field, flat=True)
+                    .first()
+                ) or False
+        setattr(instance, attr, previous)
 
 
 @receiver(post_save, sender=NewsArticle)
@@ -101,8 +109,14 @@ def notify_subscribers_featured_article(sender, instance, created, **kwargs):
         )
 
 
-def _send_featured_article_emails(article_id: str):
-    """Send featured article notification emails to breaking-news subscribers."""
+def _send_featured_article_emails(article_id: str, campaign_key: str = ""):
+    """
+    Send featured article notification emails to breaking-news subscribers.
+
+    Sends once per campaign_key (default: once per article); manual
+    re-sends pass their own key. See apps.engagement.delivery.
+    """
+    from apps.engagement.delivery import deliver_newsletter, subscribers
     from apps.engagement.models import NewsletterSubscription, Notification
 
     try:
@@ -110,13 +124,8 @@ def _send_featured_article_emails(article_id: str):
     except NewsArticle.DoesNotExist:
         return
 
-    subscriptions = NewsletterSubscription.objects.filter(
-        newsletter_type=NewsletterSubscription.NewsletterType.BREAKING_NEWS,
-        is_active=True,
-        is_verified=True,
-    )
-
-    if not subscriptions.exists():
+    breaking_news = NewsletterSubscription.NewsletterType.BREAKING_NEWS
+    if not subscribers(breaking_news).exists():
         logger.info("No breaking-news subscribers to notify for featured article %s", article_id)
         return
 
@@ -131,34 +140,18 @@ def _send_featured_article_emails(article_id: str):
     elif article.featured_image_url:
         image_url = article.featured_image_url
 
-    sent_count = 0
-    for subscription in subscriptions:
-        unsubscribe_url = (
-            f"{frontend_url}/newsletter/unsubscribe?token={subscription.unsubscribe_token}"
-        )
-
-        context = {
+    campaign = deliver_newsletter(
+        key=campaign_key or f"featured_article:{article.id}",
+        newsletter_type=breaking_news,
+        subject=f"Featured: {article.title}",
+        template="emails/featured_article",
+        context={
             "article": article,
             "article_url": article_url,
             "image_url": image_url,
-            "unsubscribe_url": unsubscribe_url,
-        }
-
-        try:
-            html_content = render_to_string("emails/featured_article.html", context)
-            text_content = render_to_string("emails/featured_article.txt", context)
-
-            send_mail(
-                subject=f"Featured: {article.title}",
-                message=text_content,
-                html_message=html_content,
-                from_email=from_email,
-                recipient_list=[subscription.email],
-                fail_silently=True,
-            )
-            sent_count += 1
-        except Exception as e:
-            logger.error("Failed to send featured article email to %s: %s", subscription.email, e)
+        },
+        from_email=from_email,
+    )
 
     # Also create in-app notifications for users watching related companies
     related_company_ids = article.related_companies.values_list("id", flat=True)
@@ -194,6 +187,15 @@ def _send_featured_article_emails(article_id: str):
             Notification.objects.bulk_create(notifications)
 
     logger.info(
-        "Featured article %s: sent %d emails, %d in-app notifications",
-        article.slug, sent_count, len(notifications) if related_company_ids else 0,
+        "Featured article %s: emails in %d shards, %d in-app notifications",
+        article.slug, campaign.shard_count, len(notifications) if related_company_ids else 0,
     )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_thread(sender, instance, **kwargs):
+    """Drop the article's cached comment thread on any comment change."""
+    from .comments import invalidate_thread
+
+    invalidate_thread(instance.article_id)
@@ -53,6 +53,54 @@ class NewsArticleModelTests(TestCase):
         self.assertEqual(article.title, "Test Article")
         self.assertEqual(article.status, NewsArticle.Status.PUBLISHED)
 
+    def test_feed_eligibility_maintained_on_save(self):
+        """is_feed_eligible tracks content length, source and image, including partial saves."""
+        article = NewsArticle.objects.create(
+            title="Scraped stub",
+            content="Too short.",
+            excerpt="Excerpt",
+            category=self.category,
+            source=NewsArticle.Source.SERPAPI,
+            featured_image_url="https://example.com/a.jpg",
+        )
+        self.assertEqual(article.content_length, 10)
+        self.assertFalse(article.is_feed_eligible)
+
+        article.content = "x" * NewsArticle.FEED_MIN_CONTENT_LENGTH
+        article.save(update_fields=["content"])
+        article.refresh_from_db()
+        self.assertTrue(article.is_feed_eligible)
+
+        article.featured_image_url = ""
+        article.save(update_fields=["featured_image_url"])
+        article.refresh_from_db()
+        self.assertFalse(article.is_feed_eligible)
+
+    def test_partial_save_skips_unrelated_work(self):
+        """An image-only save is one UPDATE; flag transitions still come from the loaded snapshot."""
+        NewsArticle.objects.create(title="Same title", content="x", excerpt="e", category=self.category)
+        article = NewsArticle.objects.create(title="Same title", content="x", excerpt="e", category=self.category)
+        self.assertEqual(article.slug, "same-title-2")
+
+        article = NewsArticle.objects.get(pk=article.pk)
+        article.featured_image_url = "https://example.com/b.jpg"
+        with self.assertNumQueries(1):
+            article.save(update_fields=["featured_image_url"])
+
+        article.is_featured = True
+        article.save(update_fields=["is_featured"])
+        self.assertFalse(article._was_featured)
+        article.save(update_fields=["is_featured"])
+        self.assertTrue(article._was_featured)
+
+        article.content = "word " * 400
+        NewsArticle.bulk_save([article], ["content", "featured_image_url"])
+        article.refresh_from_db()
+        self.assertEqual(article.read_time_minutes, 2)
+        self.assertTrue(article.is_feed_eligible)
+        with self.assertRaises(ValueError):
+            NewsArticle.bulk_save([article], ["title"])
+
 
 class NewsAPITests(APITestCase):
     """API tests for news."""
@@ -82,3 +130,263 @@ class NewsAPITests(APITestCase):
         published = NewsArticle.objects.filter(status=NewsArticle.Status.PUBLISHED)
         self.assertEqual(published.count(), 1)
         self.assertEqual(published.first().title, "Test Article")
+
+    def test_retrieve_counts_view(self):
+        """Retrieving an article bumps view_count and logs an ArticleView."""
+        from .models import ArticleView
+
+        response = self.client.get(f"/api/v1/news/articles/{self.article.slug}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 1)
+        self.assertEqual(ArticleView.objects.filter(article=self.article).count(), 1)
+
+    def test_feed_keyset_pagination(self):
+        """Feed pages never repeat or skip rows that share a published_at, and offset hands off the first page."""
+        from django.utils import timezone
+
+        published_at = timezone.now()
+        for i in range(7):
+            NewsArticle.objects.create(
+                title=f"Same second {i}", content="Body", excerpt="Excerpt",
+                category=self.category, status=NewsArticle.Status.PUBLISHED,
+                published_at=published_at, featured_image_url="https://example.com/a.jpg",
+            )
+
+        seen = []
+        url = "/api/v1/news/articles/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(row["slug"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+        response = self.client.get("/api/v1/news/articles/", {"page_size": 10, "offset": 2})
+        self.assertEqual([row["slug"] for row in response.data["results"]], seen[2:])
+        self.assertIsNotNone(response.data["previous"])
+
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual([row["slug"] for row in previous.data["results"]], seen[:2])
+
+    def test_viewer_state_in_bulk(self):
+        """viewer-state resolves a page's liked/saved flags in one lookup per flag."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import ArticleLike, ArticleSave
+
+        others = [
+            NewsArticle.objects.create(
+                title=f"Other {i}", content="Body", excerpt="Excerpt", category=self.category,
+                status=NewsArticle.Status.PUBLISHED,
+            )
+            for i in range(2)
+        ]
+        ArticleLike.objects.create(article=others[0], user=self.user)
+        ArticleSave.objects.create(article=others[1], user=self.user)
+        self.client.force_authenticate(self.user)
+
+        ids = ",".join(str(article.pk) for article in [self.article, *others])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/news/articles/viewer-state/", {"ids": ids})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response.data, {"liked": [str(others[0].pk)], "saved": [str(others[1].pk)]})
+
+        response = self.client.get(f"/api/v1/news/articles/{others[0].slug}/")
+        self.assertTrue(response.data["is_liked"])
+        self.assertFalse(response.data["is_saved"])
+
+    def test_unified_search(self):
+        """/search/ returns per-type facets and only published matches."""
+        NewsArticle.objects.create(
+            title="Draft test", content="Body", excerpt="Excerpt",
+            category=self.category, status=NewsArticle.Status.DRAFT,
+        )
+
+        response = self.client.get("/api/v1/search/", {"q": "test content"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["facets"]["articles"], 1)
+        self.assertEqual(response.data["results"]["articles"][0]["slug"], "test-article")
+        self.assertIn("research", response.data["facets"])
+
+        response = self.client.get("/api/v1/search/", {"q": "test", "type": "podcasts"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ArticleListQueryTests(APITestCase):
+    """List endpoints load a page in a fixed number of queries."""
+
+    # Upper bound per endpoint; must not depend on the page's row count
+    MAX_QUERIES = 4
+
+    def setUp(self):
+        from apps.markets.models import Company, Exchange
+        from apps.users.models import Writer
+
+        self.category = Category.objects.create(name="Markets", slug="markets")
+        self.author = User.objects.create_user(email="author@example.com", password="testpass123")
+        self.writer = Writer.objects.create(full_name="Guest Writer", slug="guest-writer")
+        exchange = Exchange.objects.create(
+            code="JSE", name="Johannesburg Stock Exchange", country="ZA",
+            currency="ZAR", timezone="Africa/Johannesburg",
+        )
+        self.companies = [
+            Company.objects.create(symbol=f"CO{i}", name=f"Company {i}", exchange=exchange)
+            for i in range(3)
+        ]
+        self.urls = [
+            "/api/v1/news/articles/",
+            f"/api/v1/news/articles/by-company/{self.companies[0].pk}/",
+        ]
+
+    def add_articles(self, n):
+        for i in range(n):
+            article = NewsArticle.objects.create(
+                title=f"Listed {NewsArticle.objects.count()}", content="Body", excerpt="Excerpt",
+                category=self.category, status=NewsArticle.Status.PUBLISHED,
+                author=self.author, writer=self.writer if i % 2 else None,
+                featured_image_url="https://example.com/a.jpg",
+            )
+            article.related_companies.set(self.companies)
+
+    def count_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_list_query_budget(self):
+        """Query count stays under budget and doesn't grow with the page size."""
+        self.add_articles(2)
+        small = {url: self.count_queries(url) for url in self.urls}
+        self.add_articles(6)
+        for url in self.urls:
+            queries = self.count_queries(url)
+            self.assertLessEqual(queries, self.MAX_QUERIES, url)
+            self.assertEqual(queries, small[url], url)
+
+    def test_fast_list_matches_drf(self):
+        """NewsArticleListValues renders byte-identical JSON to NewsArticleListSerializer."""
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.core.renderers import ORJSONRenderer
+        from .serializers import NewsArticleListSerializer, NewsArticleListValues
+
+        self.add_articles(3)
+        self.author.profile.avatar = "avatars/a.png"
+        self.author.profile.save()
+        NewsArticle.objects.filter(title="Listed 0").update(featured_image="articles/featured/x.jpg")
+        NewsArticle.objects.create(
+            title="No byline", content="Body", excerpt="Excerpt", category=self.category,
+        )
+
+        request = Request(APIRequestFactory().get("/api/v1/news/articles/"))
+        queryset = NewsArticle.objects.all()
+        expected = JSONRenderer().render(NewsArticleListSerializer(
+            NewsArticleListSerializer.setup_queryset(queryset), many=True, context={"request": request},
+        ).data)
+        actual = ORJSONRenderer().render(NewsArticleListValues(context={"request": request}).serialize(
+            NewsArticleListValues.values(queryset)
+        ))
+        self.assertEqual(actual, expected)
+
+
+class CommentThreadTests(APITestCase):
+    """Article comment threads load in a fixed number of queries."""
+
+    def setUp(self):
+        from .models import Comment, CommentLike
+
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.user = User.objects.create_user(email="reader@example.com", password="testpass123")
+        self.article = NewsArticle.objects.create(
+            title="Discussed", content="Body", excerpt="Excerpt", category=category,
+        )
+        self.top = [
+            Comment.objects.create(article=self.article, author=self.user, content=f"Top {i}")
+            for i in range(3)
+        ]
+        for i in range(2):
+            Comment.objects.create(
+                article=self.article, author=self.user, parent=self.top[0], content=f"Reply {i}",
+            )
+        Comment.objects.create(
+            article=self.article, author=self.user, parent=self.top[0], content="Hidden", is_approved=False,
+        )
+        CommentLike.objects.create(comment=self.top[1], user=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/news/comments/?article={self.article.pk}"
+
+    def test_thread_queries_and_nesting(self):
+        """Comments, replies and the viewer's likes come from two queries, whatever the thread size."""
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext, override_settings
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 2)
+
+        results = response.data["results"]
+        self.assertEqual([c["content"] for c in results], ["Top 2", "Top 1", "Top 0"])
+        self.assertEqual([r["content"] for r in results[2]["replies"]], ["Reply 0", "Reply 1"])
+        self.assertEqual(results[2]["reply_count"], 2)
+        self.assertEqual([c["is_liked"] for c in results], [False, True, False])
+        self.assertTrue(results[0]["can_edit"])
+
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=locmem):
+            cache.clear()
+            self.client.get(self.url)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url)
+            self.assertEqual(len(queries), 1)  # Liked IDs only
+
+            # Any spelling of the ID shares the cached thread and its invalidation
+            hex_url = f"/api/v1/news/comments/?article={self.article.pk.hex.upper()}"
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(hex_url)
+            self.assertEqual(len(queries), 1)
+
+            self.top[2].delete()
+            response = self.client.get(self.url)
+            self.assertEqual(len(response.data["results"]), 2)
+            response = self.client.get(hex_url)
+            self.assertEqual(len(response.data["results"]), 2)
+
+
+class ViewCounterTests(TestCase):
+    """Test cases for the buffered counter flush helpers."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Markets", slug="markets")
+        self.articles = [
+            NewsArticle.objects.create(
+                title=f"Article {i}",
+                content="Body",
+                excerpt="Excerpt",
+                category=category,
+            )
+            for i in range(3)
+        ]
+
+    def test_apply_counts_adds_deltas(self):
+        """apply_counts adds each delta to its own row."""
+        from apps.analytics.counters import apply_counts
+
+        updated = apply_counts("article_view", {
+            str(self.articles[0].pk): 5,
+            str(self.articles[1].pk): 2,
+        })
+
+        self.assertEqual(updated, 2)
+        counts = dict(NewsArticle.objects.values_list("title", "view_count"))
+        self.assertEqual(counts, {"Article 0": 5, "Article 1": 2, "Article 2": 0})
@@ -2,13 +2,17 @@
 News Views
 """
 import logging
+import uuid
 
 from django.db import IntegrityError
-from django.db.models import Q
+from django.utils import timezone
 from django_filters import rest_framework as filters
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
+from rest_framework.filters import OrderingFilter
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
 logger = logging.getLogger(__name__)
@@ -20,7 +24,10 @@ from apps.core.cache import (
     cache_reference_data,
     cache_response,
 )
+from apps.core.fast_serializers import FastListMixin
 from apps.core.pagination import InfiniteScrollPagination
+from apps.core.renderers import ORJSONRenderer
+from apps.search.filters import FullTextSearchFilter
 from apps.users.models import UserRole
 
 from .models import (
@@ -38,6 +45,7 @@ from .serializers import (
     NewsArticleCreateSerializer,
     NewsArticleDetailSerializer,
     NewsArticleListSerializer,
+    NewsArticleListValues,
     TagSerializer,
     CommentSerializer,
     CommentWithRepliesSerializer,
@@ -170,7 +178,7 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class NewsArticleViewSet(viewsets.ModelViewSet):
+class NewsArticleViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for NewsArticle model.
 
@@ -183,20 +191,13 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
     - GET /news/by-company/{company_id}/ - Articles related to a company
     """
 
-    # Optimized queryset with select_related for ForeignKey and prefetch_related for ManyToMany
-    queryset = NewsArticle.objects.select_related(
-        "category",
-        "author",
-        "author__profile",
-        "writer",
-        "editor",
-    ).prefetch_related(
-        "tags",
-        "related_companies",
-    )
+    # Relations are added per response serializer in get_queryset()
+    queryset = NewsArticle.objects.all()
     serializer_class = NewsArticleListSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [AllowAny]
     pagination_class = InfiniteScrollPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_class = NewsArticleFilter
     search_fields = ["title", "excerpt", "content"]
     lookup_field = "slug"
@@ -221,33 +222,26 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(status=NewsArticle.Status.PUBLISHED)
 
         # For feed listings: scraped articles need 500+ chars to filter stubs,
-        # and any article shown on the reader feed needs an image.
+        # and any article shown on the reader feed needs an image. Both rules
+        # are persisted as is_feed_eligible by NewsArticle.save(), so this is
+        # a range scan on the partial news_article_feed_idx index.
         #
         # IMPORTANT: Editors hitting this endpoint via /admin/articles MUST
         # see drafts, half-written pieces, and articles without images — those
-        # are exactly the rows they need to edit. Skip both filters for
-        # editors; this also avoids the Length("content") full-table scan on
-        # the admin list which was the hottest part of the query plan.
+        # are exactly the rows they need to edit. Skip the filter for editors.
         if self.action == "list" and not is_editor_request:
-            from django.db.models.functions import Length
-            queryset = queryset.annotate(_content_len=Length("content"))
-            queryset = queryset.filter(
-                Q(source="editorial") | Q(_content_len__gte=500)
-            )
-            queryset = queryset.filter(
-                Q(featured_image__gt="") | Q(featured_image_url__gt="")
-            )
+            queryset = queryset.filter(is_feed_eligible=True)
 
-        # Drop the heavy prefetches for the admin list view — the admin
-        # serializer doesn't render tags or related_companies, so hydrating
-        # those M2Ms is pure waste (extra queries + payload bytes).
-        if self.action == "list" and is_editor_request:
-            queryset = queryset.select_related(
-                "category", "author", "writer"
-            )
-            # Reset the inherited prefetches — Django keeps them on the
-            # default manager queryset otherwise.
-            queryset = queryset.prefetch_related(None)
+        # Load exactly the relations the response serializer reads: the admin
+        # list serializer needs no tags or related_companies, the reader list
+        # gets companies with only the columns CompanyMinimalSerializer uses.
+        serializer_class = self.get_serializer_class()
+        if (
+            self.request.method == "GET"
+            and hasattr(serializer_class, "setup_queryset")
+            and self.get_fast_serializer_class() is None
+        ):
+            queryset = serializer_class.setup_queryset(queryset)
 
         return queryset
 
@@ -267,6 +261,12 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
             return NewsArticleAdminListSerializer
         return NewsArticleListSerializer
 
+    def get_fast_serializer_class(self):
+        # The reader feed list reads .values() rows (relations via joins)
+        if self.action == "list" and self.get_serializer_class() is NewsArticleListSerializer:
+            return NewsArticleListValues
+        return None
+
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
             return [IsAuthenticated(), IsEditorOrReadOnly()]
@@ -348,45 +348,29 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         # Dedup views per visitor for 30 minutes so refresh spam doesn't
         # inflate the counter. Same (article, visitor) counted at most once
         # per window — both in the aggregate counter and the ArticleView log.
-        from django.core.cache import cache
-        from apps.analytics.geoip import (
-            get_client_ip,
-            get_visitor_key,
-            lookup_geo,
-            detect_source,
-        )
+        # The counter + ArticleView row are buffered in Redis and flushed in
+        # batches; geo lookup happens in the flusher, not here.
+        from apps.analytics.counters import record_hit
+        from apps.analytics.geoip import get_client_ip, get_visitor_key, detect_source
 
         ip = get_client_ip(request)
         visitor_id = get_visitor_key(request) or ip or "unknown"
-        dedup_key = f"viewed:article:{instance.pk}:{visitor_id}"
-        already_counted = cache.get(dedup_key)
-
-        if not already_counted:
-            cache.set(dedup_key, True, 60 * 30)  # 30 min TTL
-            instance.increment_view_count()
-
-            # Track view with geo + user info (silent fail — analytics shouldn't break reading)
-            try:
-                from .models import ArticleView
-
-                geo = lookup_geo(ip)
-                referrer = request.META.get("HTTP_REFERER", "")
-
-                ArticleView.objects.create(
-                    article=instance,
-                    user=request.user if request.user.is_authenticated else None,
-                    session_key=visitor_id[:40],
-                    ip_address=ip or None,
-                    user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-                    referrer=referrer[:200],
-                    country=geo["country"],
-                    country_name=geo["country_name"],
-                    city=geo["city"],
-                    region=geo["region"],
-                    source=detect_source(referrer),
-                )
-            except Exception:
-                pass
+        referrer = request.META.get("HTTP_REFERER", "")
+        record_hit(
+            "article_view",
+            instance.pk,
+            dedup_key=f"viewed:article:{instance.pk}:{visitor_id}",
+            event={
+                "article_id": instance.pk,
+                "user_id": request.user.pk if request.user.is_authenticated else None,
+                "session_key": visitor_id[:40],
+                "ip_address": ip or None,
+                "ip": ip,
+                "user_agent": request.META.get("HTTP_USER_AGENT", "")[:500],
+                "referrer": referrer[:200],
+                "source": detect_source(referrer),
+            },
+        )
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -435,6 +419,7 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         async_task(
             "apps.news.signals._send_featured_article_emails",
             str(article.id),
+            f"featured_article:{article.id}:manual:{timezone.now():%Y%m%d%H%M%S}",
             task_name=f"featured-article-manual-{article.slug}",
         )
 
@@ -452,6 +437,7 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
     def like(self, request, slug=None):
         """Toggle like on an article. Works for both registered and anonymous."""
         from apps.analytics.geoip import get_client_ip, get_visitor_key, lookup_geo
+        from apps.analytics.viewer_state import invalidate as invalidate_viewer_state
 
         article = self.get_object()
         ip = get_client_ip(request)
@@ -478,6 +464,7 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
             )
             liked = True
 
+        invalidate_viewer_state(request, "article_like")
         article.recount_likes()
         article.refresh_from_db(fields=["likes_count"])
         return Response({"liked": liked, "likes_count": article.likes_count})
@@ -486,6 +473,7 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
     def save_article(self, request, slug=None):
         """Toggle save/bookmark on an article. Works for both registered and anonymous."""
         from apps.analytics.geoip import get_client_ip, get_visitor_key, lookup_geo
+        from apps.analytics.viewer_state import invalidate as invalidate_viewer_state
 
         article = self.get_object()
         ip = get_client_ip(request)
@@ -512,10 +500,23 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
             )
             saved = True
 
+        invalidate_viewer_state(request, "article_save")
         article.recount_saves()
         article.refresh_from_db(fields=["saves_count"])
         return Response({"saved": saved, "saves_count": article.saves_count})
 
+    @action(detail=False, methods=["get"], permission_classes=[AllowAny], url_path="viewer-state")
+    def viewer_state(self, request):
+        """
+        Liked/saved state for a page of articles: ?ids=<uuid>,<uuid>,...
+
+        List responses are cached for everyone, so clients fetch the
+        viewer's flags for the visible page here in one call.
+        """
+        from apps.analytics.viewer_state import page_state
+
+        return Response(page_state(request, "article"))
+
     @action(detail=False, methods=["get"])
     @cache_response(ttl=CacheTTL.SHORT, key_prefix="news_featured")
     def featured(self, request):
@@ -779,18 +780,30 @@ class CommentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path=r"article/(?P<article_id>[0-9a-f-]+)")
     def by_article(self, request, article_id=None):
         """Get all comments for an article with pagination."""
-        queryset = self.get_queryset().filter(
-            article_id=article_id,
-            parent__isnull=True
-        ).order_by("-created_at")
+        return self.thread_response(article_id)
 
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = CommentWithRepliesSerializer(page, many=True, context={"request": request})
-            return self.get_paginated_response(serializer.data)
+    def list(self, request, *args, **kwargs):
+        article_id = request.query_params.get("article")
+        if article_id:
+            return self.thread_response(article_id)
+        return super().list(request, *args, **kwargs)
 
-        serializer = CommentWithRepliesSerializer(queryset, many=True, context={"request": request})
-        return Response(serializer.data)
+    def thread_response(self, article_id):
+        """Top-level comments with replies, from the per-article thread (see apps.news.comments)."""
+        from .comments import get_thread, render_thread
+
+        try:
+            # Canonical form, so every spelling of an ID shares one cached thread
+            article_id = str(uuid.UUID(str(article_id)))
+        except ValueError:
+            return Response({"error": "Invalid article ID"}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = self.request.user
+        thread = get_thread(article_id, include_unapproved=user.is_authenticated and user.is_staff)
+        page = self.paginate_queryset(thread)
+        if page is not None:
+            return self.get_paginated_response(render_thread(page, article_id, user))
+        return Response(render_thread(thread, article_id, user))
 
 
 @api_view(["GET"])
@@ -1,6 +1,8 @@
 """
 Podcast API Views
 """
+import math
+
 from django.db.models import Sum
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
@@ -8,7 +10,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import PodcastShow, PodcastEpisode, EpisodeListen, PodcastSubscription
+from .models import PodcastShow, PodcastEpisode, PodcastSubscription
 from .serializers import (
     PodcastShowListSerializer,
     PodcastShowDetailSerializer,
@@ -116,6 +118,7 @@ class PodcastEpisodeViewSet(viewsets.ModelViewSet):
     retrieve: Get episode details
     featured: Get featured episodes
     listen: Track episode listen
+    audio: Serve the episode audio (Range-capable)
     """
 
     queryset = PodcastEpisode.objects.select_related("show").prefetch_related(
@@ -181,33 +184,58 @@ class PodcastEpisodeViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["post"])
     def listen(self, request, slug=None):
         """Track episode listen."""
+        from apps.analytics.counters import record_hit
+
         episode = self.get_object()
+        try:
+            duration = float(request.data.get("duration", 0) or 0)
+            completion = float(request.data.get("completion", 0) or 0)
+            if not (math.isfinite(duration) and math.isfinite(completion)):
+                raise ValueError
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "duration and completion must be numbers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # Create listen record
-        listen_data = {
-            "episode": episode.id,
-            "listen_duration_seconds": request.data.get("duration", 0),
-            "completion_percentage": request.data.get("completion", 0),
-            "platform": request.data.get("platform", "web"),
-        }
-
-        # Track the listen
-        EpisodeListen.objects.create(
-            episode=episode,
-            user=request.user if request.user.is_authenticated else None,
-            session_key=request.session.session_key or "",
-            ip_address=self.get_client_ip(request),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            listen_duration_seconds=listen_data["listen_duration_seconds"],
-            completion_percentage=listen_data["completion_percentage"],
-            platform=listen_data["platform"],
+        # Episode + show counters and the EpisodeListen row are buffered in
+        # Redis and flushed in batches by apps.analytics.counters.
+        record_hit(
+            "episode_listen",
+            episode.pk,
+            extra=[("show_listen", episode.show_id)],
+            event={
+                "episode_id": episode.pk,
+                "user_id": request.user.pk if request.user.is_authenticated else None,
+                "session_key": request.session.session_key or "",
+                "ip_address": self.get_client_ip(request),
+                "user_agent": request.META.get("HTTP_USER_AGENT", ""),
+                "listen_duration_seconds": max(0, int(duration)),
+                "completion_percentage": round(min(100.0, max(0.0, completion)), 2),
+                "platform": str(request.data.get("platform", "web"))[:50],
+            },
         )
 
-        # Increment listen count
-        episode.increment_listen_count()
-
         return Response({"message": "Listen tracked"})
 
+    @action(detail=True, methods=["get"])
+    def audio(self, request, slug=None):
+        """
+        Episode audio for the player: a presigned redirect, X-Accel-Redirect
+        or ranged stream for uploaded files, a redirect for hosted ones.
+        Listens are tracked by the listen action, not here.
+        """
+        from django.http import HttpResponseRedirect
+
+        from apps.media.downloads import serve_file
+
+        episode = self.get_object()
+        if episode.audio_file:
+            return serve_file(request, episode.audio_file, as_attachment=False)
+        if episode.audio_url:
+            return HttpResponseRedirect(episode.audio_url)
+        return Response({"error": "No audio for this episode."}, status=status.HTTP_404_NOT_FOUND)
+
     def get_client_ip(self, request):
         """Get client IP address from request."""
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
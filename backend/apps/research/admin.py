@@ -4,6 +4,8 @@ Research Admin Configuration
 from django.contrib import admin
 from django.utils.html import format_html
 
+from apps.core.pagination import EstimatedCountPaginator
+
 from .models import (
     Topic,
     Industry,
@@ -100,6 +102,9 @@ class ResearchReportAdmin(admin.ModelAdmin):
 
 @admin.register(ResearchDownload)
 class ResearchDownloadAdmin(admin.ModelAdmin):
+    # Log table: avoid COUNT(*) on every changelist page
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ["report", "user", "created_at", "ip_address"]
     list_filter = ["created_at"]
     search_fields = ["report__title", "user__email"]
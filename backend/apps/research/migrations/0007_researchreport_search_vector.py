@@ -0,0 +1,15 @@
+"""Trigger-maintained full-text search vector + GIN index (Postgres only)."""
+from django.db import migrations
+
+from apps.search.operations import AddSearchVector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("research", "0006_researchreport_likes_count_and_more"),
+    ]
+
+    operations = [
+        AddSearchVector("ResearchReport", [("title", "A"), ("abstract", "B"), ("content", "C")]),
+    ]
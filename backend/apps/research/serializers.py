@@ -193,33 +193,17 @@ class ResearchReportDetailSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request:
             return False
-        from .models import ResearchLike
-        from apps.analytics.geoip import get_visitor_key
+        from apps.analytics.viewer_state import get_viewer_state
 
-        if request.user.is_authenticated:
-            return ResearchLike.objects.filter(report=obj, user=request.user).exists()
-        vid = get_visitor_key(request)
-        if not vid:
-            return False
-        return ResearchLike.objects.filter(
-            report=obj, user__isnull=True, session_key=vid
-        ).exists()
+        return get_viewer_state(request).has("report_like", obj.pk)
 
     def get_is_saved(self, obj):
         request = self.context.get("request")
         if not request:
             return False
-        from .models import ResearchSave
-        from apps.analytics.geoip import get_visitor_key
+        from apps.analytics.viewer_state import get_viewer_state
 
-        if request.user.is_authenticated:
-            return ResearchSave.objects.filter(report=obj, user=request.user).exists()
-        vid = get_visitor_key(request)
-        if not vid:
-            return False
-        return ResearchSave.objects.filter(
-            report=obj, user__isnull=True, session_key=vid
-        ).exists()
+        return get_viewer_state(request).has("report_save", obj.pk)
 
     def get_image_url(self, obj):
         """Return the best available image URL."""
@@ -12,9 +12,10 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.search.filters import FullTextSearchFilter
+
 from .models import (
     Industry,
-    ResearchDownload,
     ResearchLike,
     ResearchReport,
     ResearchSave,
@@ -113,6 +114,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
     retrieve: Get research report details
     featured: Get featured research reports
     download: Track and initiate report download
+    pdf: Serve the report PDF (Range-capable)
     """
 
     queryset = ResearchReport.objects.select_related("lead_author").prefetch_related(
@@ -121,7 +123,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     lookup_field = "slug"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ["report_type", "status", "is_featured", "is_premium"]
     search_fields = ["title", "abstract", "content"]
     ordering_fields = ["published_at", "view_count", "download_count", "created_at"]
@@ -171,44 +173,28 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
 
         # Dedup views per visitor for 30 min so refresh spam doesn't inflate
         # the counter. Same (report, visitor) counted at most once per window.
-        from django.core.cache import cache
-        from apps.analytics.geoip import (
-            get_client_ip,
-            get_visitor_key,
-            lookup_geo,
-            detect_source,
-        )
+        # Counter + ResearchView row are buffered and flushed in batches.
+        from apps.analytics.counters import record_hit
+        from apps.analytics.geoip import get_client_ip, get_visitor_key, detect_source
 
         ip = get_client_ip(request)
         visitor_id = get_visitor_key(request) or ip or "unknown"
-        dedup_key = f"viewed:report:{instance.pk}:{visitor_id}"
-        already_counted = cache.get(dedup_key)
-
-        if not already_counted:
-            cache.set(dedup_key, True, 60 * 30)  # 30 min TTL
-            instance.increment_view_count()
-
-            try:
-                from .models import ResearchView
-
-                geo = lookup_geo(ip)
-                referrer = request.META.get("HTTP_REFERER", "")
-
-                ResearchView.objects.create(
-                    report=instance,
-                    user=request.user if request.user.is_authenticated else None,
-                    session_key=visitor_id[:40],
-                    ip_address=ip or None,
-                    user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-                    referrer=referrer[:200],
-                    country=geo["country"],
-                    country_name=geo["country_name"],
-                    city=geo["city"],
-                    region=geo["region"],
-                    source=detect_source(referrer),
-                )
-            except Exception:
-                pass
+        referrer = request.META.get("HTTP_REFERER", "")
+        record_hit(
+            "report_view",
+            instance.pk,
+            dedup_key=f"viewed:report:{instance.pk}:{visitor_id}",
+            event={
+                "report_id": instance.pk,
+                "user_id": request.user.pk if request.user.is_authenticated else None,
+                "session_key": visitor_id[:40],
+                "ip_address": ip or None,
+                "ip": ip,
+                "user_agent": request.META.get("HTTP_USER_AGENT", "")[:500],
+                "referrer": referrer[:200],
+                "source": detect_source(referrer),
+            },
+        )
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -217,6 +203,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
     def like(self, request, slug=None):
         """Toggle like on a research report. Works for both registered and anonymous."""
         from apps.analytics.geoip import get_client_ip, get_visitor_key, lookup_geo
+        from apps.analytics.viewer_state import invalidate as invalidate_viewer_state
 
         report = self.get_object()
         ip = get_client_ip(request)
@@ -243,6 +230,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
             )
             liked = True
 
+        invalidate_viewer_state(request, "report_like")
         report.recount_likes()
         report.refresh_from_db(fields=["likes_count"])
         return Response({"liked": liked, "likes_count": report.likes_count})
@@ -251,6 +239,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
     def save_report(self, request, slug=None):
         """Toggle save/bookmark on a research report. Works for both registered and anonymous."""
         from apps.analytics.geoip import get_client_ip, get_visitor_key, lookup_geo
+        from apps.analytics.viewer_state import invalidate as invalidate_viewer_state
 
         report = self.get_object()
         ip = get_client_ip(request)
@@ -277,6 +266,7 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
             )
             saved = True
 
+        invalidate_viewer_state(request, "report_save")
         report.recount_saves()
         report.refresh_from_db(fields=["saves_count"])
         return Response({"saved": saved, "saves_count": report.saves_count})
@@ -288,6 +278,13 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
         serializer = ResearchReportListSerializer(featured, many=True, context={"request": request})
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], permission_classes=[], url_path="viewer-state")
+    def viewer_state(self, request):
+        """Viewer's liked/saved report IDs among ?ids=<uuid>,<uuid>,... (see apps.analytics.viewer_state)."""
+        from apps.analytics.viewer_state import page_state
+
+        return Response(page_state(request, "report"))
+
     @action(detail=False, methods=["get"], permission_classes=[])
     def counts(self, request):
         """Counts per report_type + has_new flag for nav badges."""
@@ -308,41 +305,68 @@ class ResearchReportViewSet(viewsets.ModelViewSet):
             "new_count": new_count,
         })
 
-    @action(detail=True, methods=["post"], permission_classes=[])
-    def download(self, request, slug=None):
-        """Track research report download."""
-        from apps.analytics.geoip import get_client_ip, lookup_geo
-        report = self.get_object()
-
-        # Check premium access
+    def _premium_denied(self, request, report):
         if report.is_premium and not (request.user.is_authenticated and getattr(request.user, "has_premium", False)):
             return Response(
                 {"error": "Premium subscription required to download this report."},
                 status=status.HTTP_403_FORBIDDEN
             )
+        return None
+
+    def _track_download(self, request, report):
+        """Counter + ResearchDownload row, buffered in Redis; geo resolved at flush."""
+        from apps.analytics.counters import record_hit
+        from apps.analytics.geoip import get_client_ip
 
-        # Track download with geo
         ip = get_client_ip(request)
-        geo = lookup_geo(ip)
-        ResearchDownload.objects.create(
-            report=report,
-            user=request.user if request.user.is_authenticated else None,
-            session_key=request.session.session_key or "",
-            ip_address=ip or None,
-            user_agent=request.META.get("HTTP_USER_AGENT", "")[:500],
-            country=geo["country"],
-            country_name=geo["country_name"],
-            city=geo["city"],
+        record_hit(
+            "report_download",
+            report.pk,
+            event={
+                "report_id": report.pk,
+                "user_id": request.user.pk if request.user.is_authenticated else None,
+                "session_key": request.session.session_key or "",
+                "ip_address": ip or None,
+                "ip": ip,
+                "user_agent": request.META.get("HTTP_USER_AGENT", "")[:500],
+            },
         )
 
-        # Increment download count
-        report.increment_download_count()
+    @action(detail=True, methods=["post"], permission_classes=[])
+    def download(self, request, slug=None):
+        """Track research report download and return a (short-lived) PDF link."""
+        from apps.media.downloads import file_url
 
+        report = self.get_object()
+        denied = self._premium_denied(request, report)
+        if denied:
+            return denied
+
+        self._track_download(request, report)
         return Response({
             "message": "Download tracked",
-            "pdf_url": report.pdf_file.url if report.pdf_file else (report.pdf_url if hasattr(report, 'pdf_url') else None),
+            "pdf_url": file_url(report.pdf_file, f"{report.slug}.pdf") if report.pdf_file else None,
         })
 
+    @action(detail=True, methods=["get"], permission_classes=[])
+    def pdf(self, request, slug=None):
+        """
+        Serve the report PDF inline (presigned redirect, X-Accel-Redirect or
+        ranged stream). Range requests after the first aren't tracked again.
+        """
+        from apps.media.downloads import is_first_request, serve_file
+
+        report = self.get_object()
+        denied = self._premium_denied(request, report)
+        if denied:
+            return denied
+        if not report.pdf_file:
+            return Response({"error": "No PDF for this report."}, status=status.HTTP_404_NOT_FOUND)
+
+        if is_first_request(request):
+            self._track_download(request, report)
+        return serve_file(request, report.pdf_file, f"{report.slug}.pdf", as_attachment=False)
+
     def get_client_ip(self, request):
         """Get client IP address from request."""
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
@@ -0,0 +1,191 @@
+"""
+Full-text search across articles, research, companies and columnists.
+
+Each searchable table has a `search_vector` tsvector column kept in sync by
+a Postgres trigger (weighted A > B > C, see operations.AddSearchVector) and
+a GIN index on it. The column is deliberately not a model field, so normal
+queries never SELECT it; VectorColumn references it inside search queries
+only.
+
+Matching uses websearch_to_tsquery, ordering uses ts_rank over the weighted
+vector, and snippets come from ts_headline, computed for the returned page
+only (it re-parses the document, so it's the expensive part).
+
+On other databases (SQLite in tests) search falls back to icontains over the
+same fields, ordered by recency, with plain-text snippets.
+"""
+import re
+
+from django.apps import apps
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
+from django.db import connections
+from django.db.models import Expression, Q
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from .operations import VECTOR_COLUMN
+
+SEARCH_CONFIG = "english"
+SNIPPET_WORDS = 35
+HEADLINE_OPTIONS = {
+    "start_sel": "<mark>",
+    "stop_sel": "</mark>",
+    "max_words": SNIPPET_WORDS,
+    "min_words": 15,
+    "max_fragments": 2,
+    "fragment_delimiter": " … ",
+}
+# ts_headline keeps markup from HTML bodies; keep only our highlight tags
+_MARKUP = re.compile(r"<(?!/?mark>)[^>]*>?")
+
+
+class VectorColumn(Expression):
+    """The base table's search_vector column."""
+
+    output_field = SearchVectorField()
+
+    def as_sql(self, compiler, connection):
+        alias = compiler.query.get_initial_alias()
+        return (
+            f"{compiler.quote_name_unless_alias(alias)}."
+            f"{connection.ops.quote_name(VECTOR_COLUMN)}",
+            [],
+        )
+
+
+class SearchType:
+    """One searchable model in the unified search."""
+
+    def __init__(self, model, fields, snippet_field, values, filters=None, recency="created_at"):
+        self.label = model
+        self.fields = fields
+        self.snippet_field = snippet_field
+        self.values = values
+        self.filters = filters or {}
+        self.recency = recency
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    def queryset(self):
+        return self.model.objects.filter(**self.filters)
+
+
+SEARCH_TYPES = {
+    "articles": SearchType(
+        "news.NewsArticle",
+        fields=("title", "excerpt", "content"),
+        snippet_field="content",
+        values=("id", "title", "slug", "excerpt", "published_at", "category__name"),
+        filters={"status": "published"},
+        recency="published_at",
+    ),
+    "research": SearchType(
+        "research.ResearchReport",
+        fields=("title", "abstract", "content"),
+        snippet_field="abstract",
+        values=("id", "title", "slug", "report_type", "published_at"),
+        filters={"status": "published"},
+        recency="published_at",
+    ),
+    "companies": SearchType(
+        "markets.Company",
+        fields=("symbol", "name", "short_name", "description"),
+        snippet_field="description",
+        values=("id", "symbol", "name", "short_name", "exchange__code"),
+        filters={"is_active": True},
+    ),
+    "columnists": SearchType(
+        "columnists.Columnist",
+        fields=("display_name", "title", "short_bio", "full_bio"),
+        snippet_field="short_bio",
+        values=("id", "display_name", "slug", "title", "organization"),
+        filters={"is_active": True},
+    ),
+}
+
+
+def type_for_model(model):
+    """The SearchType indexing model, or None."""
+    for search_type in SEARCH_TYPES.values():
+        if search_type.model is model:
+            return search_type
+    return None
+
+
+def uses_full_text(queryset) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def parse_query(text: str) -> SearchQuery:
+    return SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def match(queryset, text: str):
+    """Restrict queryset to rows matching text (full-text or icontains)."""
+    if uses_full_text(queryset):
+        return queryset.alias(_search_vector=VectorColumn()).filter(_search_vector=parse_query(text))
+
+    condition = Q()
+    for field in type_for_model(queryset.model).fields:
+        condition |= Q(**{f"{field}__icontains": text})
+    return queryset.filter(condition)
+
+
+def _plain_snippet(text) -> str:
+    return Truncator(strip_tags(text or "")).words(SNIPPET_WORDS)
+
+
+def search_type(name: str, text: str, limit: int = 10, offset: int = 0) -> tuple:
+    """(total matches, result rows) for one SearchType."""
+    spec = SEARCH_TYPES[name]
+    matches = match(spec.queryset(), text)
+    total = matches.count()
+    if not total or offset >= total:
+        return total, []
+
+    page = slice(offset, offset + limit)
+    if uses_full_text(matches):
+        query = parse_query(text)
+        rows = list(
+            matches.annotate(rank=SearchRank(VectorColumn(), query))
+            .order_by("-rank", f"-{spec.recency}")
+            .values(*spec.values, "rank")[page]
+        )
+        snippets = dict(
+            spec.model.objects.filter(pk__in=[row["id"] for row in rows])
+            .annotate(snippet=SearchHeadline(
+                spec.snippet_field, query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS,
+            ))
+            .values_list("pk", "snippet")
+        )
+        for row in rows:
+            row["snippet"] = _MARKUP.sub("", snippets.get(row["id"]) or "")
+    else:
+        rows = list(
+            matches.order_by(f"-{spec.recency}")
+            .values(*spec.values, spec.snippet_field)[page]
+        )
+        for row in rows:
+            row["rank"] = 0.0
+            row["snippet"] = _plain_snippet(row.pop(spec.snippet_field))
+
+    return total, rows
+
+
+def search(text: str, types=None, limit: int = 5, offset: int = 0) -> dict:
+    """
+    Search every requested type.
+
+    Returns {"facets": {type: total}, "results": {type: [rows]}}.
+    """
+    facets, results = {}, {}
+    for name in types or SEARCH_TYPES:
+        facets[name], results[name] = search_type(name, text, limit, offset)
+    return {"facets": facets, "results": results}
@@ -0,0 +1,22 @@
+"""
+DRF filter backend that routes `?search=` through the full-text index.
+"""
+from rest_framework.filters import SearchFilter
+
+from .engine import match, type_for_model, uses_full_text
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on indexed models.
+
+    Uses the search_vector GIN index on Postgres instead of ILIKE '%term%'
+    over every search_fields column; other models and databases keep the
+    stock SearchFilter behaviour.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text or type_for_model(queryset.model) is None or not uses_full_text(queryset):
+            return super().filter_queryset(request, queryset, view)
+        return match(queryset, text)
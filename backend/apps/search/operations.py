@@ -0,0 +1,91 @@
+"""
+Migration operation for trigger-maintained full-text search columns.
+
+    AddSearchVector("NewsArticle", [("title", "A"), ("excerpt", "B"), ("content", "C")])
+
+adds a `search_vector tsvector` column, a BEFORE INSERT/UPDATE trigger that
+recomputes it from the weighted columns, a GIN index, and backfills existing
+rows. The column is not part of the model state (see engine.VectorColumn).
+Postgres only — a no-op on other databases.
+"""
+from django.db.migrations.operations.base import Operation
+
+VECTOR_COLUMN = "search_vector"
+
+
+class AddSearchVector(Operation):
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name, weights, config="english"):
+        self.model_name = model_name
+        self.weights = weights
+        self.config = config
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _names(self, model):
+        table = model._meta.db_table
+        return {
+            "table": table,
+            "function": f"{table}_{VECTOR_COLUMN}_update",
+            "trigger": f"{table}_{VECTOR_COLUMN}_trigger",
+            "index": f"{table}_{VECTOR_COLUMN}_gin",
+        }
+
+    def _vector_sql(self, model, qn, prefix=""):
+        parts = []
+        for field_name, weight in self.weights:
+            column = qn(model._meta.get_field(field_name).column)
+            parts.append(
+                f"setweight(to_tsvector('{self.config}'::regconfig, "
+                f"coalesce({prefix}{column}, '')), '{weight}')"
+            )
+        return " || ".join(parts)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        qn = schema_editor.quote_name
+        names = self._names(model)
+        table, column = qn(names["table"]), qn(VECTOR_COLUMN)
+        watched = ", ".join(qn(model._meta.get_field(f).column) for f, _ in self.weights)
+
+        schema_editor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} tsvector")
+        schema_editor.execute(
+            f"CREATE OR REPLACE FUNCTION {qn(names['function'])}() RETURNS trigger "
+            f"LANGUAGE plpgsql AS $$ BEGIN "
+            f"NEW.{column} := {self._vector_sql(model, qn, 'NEW.')}; "
+            f"RETURN NEW; END $$"
+        )
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {qn(names['trigger'])} ON {table}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {qn(names['trigger'])} "
+            f"BEFORE INSERT OR UPDATE OF {watched} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {qn(names['function'])}()"
+        )
+        schema_editor.execute(f"UPDATE {table} SET {column} = {self._vector_sql(model, qn)}")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {qn(names['index'])} ON {table} USING gin ({column})"
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        model = from_state.apps.get_model(app_label, self.model_name)
+        qn = schema_editor.quote_name
+        names = self._names(model)
+        table = qn(names["table"])
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {qn(names['trigger'])} ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {qn(names['function'])}()")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {qn(names['index'])}")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {qn(VECTOR_COLUMN)}")
+
+    def describe(self):
+        return f"Add trigger-maintained search vector to {self.model_name}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_search_vector"
@@ -0,0 +1,12 @@
+"""
+Search API URLs
+"""
+from django.urls import path
+
+from .views import SearchView
+
+app_name = "search"
+
+urlpatterns = [
+    path("", SearchView.as_view(), name="search"),
+]
@@ -0,0 +1,54 @@
+"""
+Search API Views
+"""
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .engine import SEARCH_TYPES, search
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 50
+
+
+class SearchView(APIView):
+    """
+    Unified search across articles, research, companies and columnists.
+
+    GET /search/?q=<terms>[&type=articles,research][&limit=5][&offset=0]
+
+    `q` accepts web-search syntax ("quoted phrases", -exclusions, or).
+    Returns per-type match counts as facets alongside ranked, highlighted
+    results for each requested type.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if len(text) < MIN_QUERY_LENGTH:
+            return Response(
+                {"error": f"Query must be at least {MIN_QUERY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        types = [t for t in request.query_params.get("type", "").split(",") if t]
+        unknown = [t for t in types if t not in SEARCH_TYPES]
+        if unknown:
+            return Response(
+                {"error": f"Unknown type(s): {', '.join(unknown)}. Choose from {', '.join(SEARCH_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+        except ValueError:
+            return Response(
+                {"error": "limit and offset must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response({"query": text, **search(text, types, limit, offset)})
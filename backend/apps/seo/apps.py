@@ -5,3 +5,7 @@ class SeoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.seo"
     verbose_name = "SEO"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.seo.signals  # noqa: F401
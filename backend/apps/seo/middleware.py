@@ -0,0 +1,56 @@
+"""
+SEO Middleware
+
+Answers requests for redirected paths from the in-memory redirect map
+(apps.seo.redirects) before URL resolution, sessions or auth run.
+"""
+import logging
+
+from django.http import HttpResponseRedirect
+
+from .redirects import redirect_matcher
+
+logger = logging.getLogger(__name__)
+
+# Backend-owned paths are never redirected
+EXEMPT_PREFIXES = ("/api/", "/admin/", "/static/", "/media/", "/health/")
+
+
+class RedirectMiddleware:
+    """
+    Redirect GET/HEAD requests matching an active Redirect rule with its
+    status code (301/302/303/307/308), keeping the query string unless the
+    target has its own.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and not request.path_info.startswith(EXEMPT_PREFIXES):
+            response = self.redirect(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    @staticmethod
+    def redirect(request):
+        try:
+            rule = redirect_matcher.match(request.path_info)
+        except Exception as e:
+            logger.warning(f"Redirect lookup failed for {request.path_info}: {e}")
+            return None
+        if rule is None:
+            return None
+
+        pk, target, status_code = rule
+        query = request.META.get("QUERY_STRING", "")
+        if query and "?" not in target:
+            target = f"{target}?{query}"
+
+        from apps.analytics.counters import record_hit
+
+        record_hit("redirect_hit", pk)
+        response = HttpResponseRedirect(target)
+        response.status_code = status_code
+        return response
@@ -0,0 +1,154 @@
+"""
+In-memory redirect matching.
+
+Each worker compiles the active Redirect rows into:
+- an exact-path dict (paths compared without a trailing slash)
+- a segment trie for wildcard rules ending in "/*" ("/old-blog/*"); the
+  longest matching prefix wins and a "*" in to_path is replaced by the
+  rest of the request path
+- a list of compiled patterns for is_regex rules (full match; to_path may
+  use \\1 / \\g<name> group references), tried in from_path order
+
+Lookup order is exact, wildcard, regex. The map is rebuilt when the
+"redirects" cache version moves (bumped by apps.seo.signals once a
+Redirect save/delete commits), checked at most every few seconds, and
+at least hourly as a backstop for queryset.update() edits.
+
+Hits are counted through apps.analytics.counters ("redirect_hit"), so
+hit_count / last_hit are written in batches by the minute flush.
+"""
+import logging
+import re
+import threading
+import time
+
+from apps.core.cache import CacheVersionManager
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "redirects"
+VERSION_CHECK_SECONDS = 5
+MAX_AGE_SECONDS = 60 * 60
+
+_RULE = "rule"  # Trie key for "a wildcard rule ends here"
+
+
+def _normalize(path: str) -> str:
+    return path.rstrip("/") or "/"
+
+
+class RedirectMap:
+    """Immutable compiled snapshot of the active redirects."""
+
+    def __init__(self, rows):
+        # rows: (id, from_path, to_path, redirect_type, is_regex)
+        self.exact = {}
+        self.trie = {}
+        self.patterns = []
+        self.wildcards = 0
+
+        for pk, from_path, to_path, redirect_type, is_regex in rows:
+            rule = (pk, to_path, redirect_type)
+            if is_regex:
+                try:
+                    self.patterns.append((re.compile(from_path), rule))
+                except re.error as e:
+                    logger.warning(f"Skipping redirect {pk}: invalid pattern {from_path!r}: {e}")
+            elif from_path.endswith("/*"):
+                node = self.trie
+                for segment in from_path[:-2].strip("/").split("/"):
+                    if segment:
+                        node = node.setdefault(segment, {})
+                node[_RULE] = rule
+                self.wildcards += 1
+            else:
+                self.exact[_normalize(from_path)] = rule
+
+    def __len__(self):
+        return len(self.exact) + self.wildcards + len(self.patterns)
+
+    def _wildcard(self, path: str):
+        segments = [segment for segment in path.strip("/").split("/") if segment]
+        node = self.trie
+        match = node.get(_RULE), 0
+        for depth, segment in enumerate(segments, 1):
+            node = node.get(segment)
+            if node is None:
+                break
+            if _RULE in node:
+                match = node[_RULE], depth
+        rule, depth = match
+        if rule is None:
+            return None
+        pk, to_path, redirect_type = rule
+        if "*" in to_path:
+            to_path = to_path.replace("*", "/".join(segments[depth:]))
+        return pk, to_path, redirect_type
+
+    def match(self, path: str):
+        """(redirect id, target, status code) for path, or None."""
+        rule = self.exact.get(_normalize(path))
+        if rule is not None:
+            return rule
+        if self.trie:
+            rule = self._wildcard(path)
+            if rule is not None:
+                return rule
+        for pattern, (pk, to_path, redirect_type) in self.patterns:
+            found = pattern.fullmatch(path)
+            if found:
+                return pk, found.expand(to_path), redirect_type
+        return None
+
+
+class RedirectMatcher:
+    """Process-wide, lazily (re)built RedirectMap."""
+
+    def __init__(self):
+        self._map = None
+        self._version = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load():
+        from .models import Redirect
+
+        rows = (
+            Redirect.objects.filter(is_active=True)
+            .order_by("from_path")
+            .values_list("id", "from_path", "to_path", "redirect_type", "is_regex")
+        )
+        return RedirectMap(list(rows))
+
+    def redirects(self) -> RedirectMap:
+        # Read once: invalidate() may reset self._map from another thread
+        current = self._map
+        now = time.monotonic()
+        if current is not None and now - self._checked_at < VERSION_CHECK_SECONDS:
+            return current
+
+        with self._lock:
+            self._checked_at = now
+            current = self._map
+            version = CacheVersionManager.get_version(VERSION_PREFIX)
+            stale = now - self._built_at >= MAX_AGE_SECONDS
+            if current is None or version != self._version or stale:
+                current = self._load()
+                self._map = current
+                self._version = version
+                self._built_at = now
+                logger.debug(f"Redirect map built: {len(current)} rules")
+        return current
+
+    def match(self, path: str):
+        return self.redirects().match(path)
+
+    def invalidate(self):
+        """Rebuild here on next use and in other workers on their next version check."""
+        CacheVersionManager.increment_version(VERSION_PREFIX)
+        self._map = None
+
+
+redirect_matcher = RedirectMatcher()
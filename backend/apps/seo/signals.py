@@ -0,0 +1,57 @@
+"""
+SEO app Django signals.
+
+Handles:
+- Sitemap index invalidation and shard rebuilds when articles change
+- Redirect map reloads when redirects change
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.news.models import NewsArticle
+
+from . import sitemaps
+from .models import Redirect
+from .redirects import redirect_matcher
+
+logger = logging.getLogger(__name__)
+
+# A save that writes none of these can't change any sitemap
+SITEMAP_FIELDS = {"slug", "title", "status", "published_at", "updated_at"}
+
+
+@receiver(post_save, sender=NewsArticle)
+def refresh_article_sitemap(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Drop the cached sitemap index and, for published articles, rebuild
+    the article's month shard in the background (debounced per month).
+    """
+    if update_fields and not SITEMAP_FIELDS.intersection(update_fields):
+        return
+    sitemaps.invalidate_index()
+
+    if instance.status != NewsArticle.Status.PUBLISHED or not instance.published_at:
+        return
+    published_at = timezone.localtime(instance.published_at)
+    transaction.on_commit(lambda: sitemaps.schedule_rebuild(published_at.year, published_at.month))
+
+
+@receiver(post_delete, sender=NewsArticle)
+def drop_article_sitemap(sender, instance, **kwargs):
+    """A deleted article changes its month's count, so the index must be recomputed."""
+    sitemaps.invalidate_index()
+
+
+@receiver(post_save, sender=Redirect)
+@receiver(post_delete, sender=Redirect)
+def reload_redirects(sender, instance, **kwargs):
+    """
+    Rebuild the in-memory redirect map in every worker, once the change is
+    committed: bumped earlier, another worker could rebuild from the old
+    rows and keep them under the new version.
+    """
+    transaction.on_commit(redirect_matcher.invalidate)
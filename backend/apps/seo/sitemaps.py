@@ -0,0 +1,316 @@
+"""
+Sharded, streamed XML sitemaps.
+
+Layout (under /api/v1/seo/):
+- sitemap.xml, sitemap-index.xml: <sitemapindex> of everything below
+- sitemap-pages.xml: static pages, columnists and categories
+- sitemap-articles-<year>-<month>.xml[?page=N]: published articles by
+  publication month (local time), at most SHARD_SIZE URLs per page
+- sitemap-news.xml: Google News sitemap (last 48 hours)
+
+Article shards are keyed by month rather than by row offset, so
+publishing, editing or unpublishing an article only changes its own
+month's shard. Each shard is cached under a key containing that month's
+article count and latest updated_at (its lastmod), so a change rolls the
+key and stale XML is never served. The per-month counts/lastmods (one
+GROUP BY query) are cached until an article changes (apps.seo.signals),
+which also rebuilds the article's shard in the background so crawlers
+find it warm. Rebuilds are debounced per month: while one is queued,
+further changes to that month don't queue another.
+
+A shard is one (slug, updated_at) query streamed with .iterator() into a
+StreamingHttpResponse; the rendered bytes are cached as the stream
+completes. Every article gets DEFAULT_PRIORITY/DEFAULT_CHANGEFREQ:
+SEOMetadata's object_id is an integer and article keys are UUIDs, so its
+per-object sitemap settings can't refer to an article.
+"""
+import logging
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.functions import TruncMonth
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.cache import CacheTTL
+
+logger = logging.getLogger(__name__)
+
+SHARD_SIZE = 50_000  # sitemaps.org limit per file
+CHUNK_SIZE = 2000
+NEWS_WINDOW_HOURS = 48
+NEWS_LIMIT = 1000
+DEFAULT_PRIORITY = "0.6"
+DEFAULT_CHANGEFREQ = "weekly"
+
+INDEX_CACHE_KEY = "sitemap:index"
+PAGES_CACHE_KEY = "sitemap:pages"
+NEWS_CACHE_KEY = "sitemap:news"
+REBUILD_PENDING_KEY = "sitemap:rebuild:{}-{:02d}"  # year, month
+REBUILD_DEBOUNCE = 5 * 60  # Safety net if a queued rebuild never runs
+
+CONTENT_TYPE = "application/xml"
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+NEWS_URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"\n'
+    '        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">\n'
+)
+URLSET_CLOSE = "</urlset>\n"
+
+STATIC_PAGES = [
+    ("/", "hourly", "1.0"),
+    ("/markets", "hourly", "0.9"),
+    ("/news", "hourly", "0.9"),
+    ("/columnists", "weekly", "0.7"),
+    ("/about", "monthly", "0.5"),
+    ("/contact", "monthly", "0.5"),
+]
+
+
+def site_url() -> str:
+    return getattr(settings, "SITE_URL", "https://bgfi.global")
+
+
+def url_entry(loc, lastmod=None, changefreq=None, priority=None) -> str:
+    parts = [f"  <url>\n    <loc>{escape(loc)}</loc>\n"]
+    if lastmod:
+        parts.append(f"    <lastmod>{lastmod:%Y-%m-%d}</lastmod>\n")
+    if changefreq:
+        parts.append(f"    <changefreq>{changefreq}</changefreq>\n")
+    if priority:
+        parts.append(f"    <priority>{priority}</priority>\n")
+    parts.append("  </url>\n")
+    return "".join(parts)
+
+
+def published_articles():
+    from apps.news.models import NewsArticle
+
+    return NewsArticle.objects.filter(
+        status=NewsArticle.Status.PUBLISHED, published_at__isnull=False
+    )
+
+
+# =========================
+# Index
+# =========================
+
+def article_months() -> list:
+    """[{"year", "month", "count", "lastmod"}] for months with published articles, oldest first."""
+    months = cache.get(INDEX_CACHE_KEY)
+    if months is None:
+        rows = (
+            published_articles()
+            .annotate(month=TruncMonth("published_at"))
+            .values("month")
+            .annotate(count=Count("id"), lastmod=Max("updated_at"))
+            .order_by("month")
+        )
+        months = [
+            {
+                "year": row["month"].year,
+                "month": row["month"].month,
+                "count": row["count"],
+                "lastmod": row["lastmod"],
+            }
+            for row in rows
+        ]
+        cache.set(INDEX_CACHE_KEY, months, CacheTTL.MEDIUM)
+    return months
+
+
+def invalidate_index():
+    cache.delete_many([INDEX_CACHE_KEY, NEWS_CACHE_KEY])
+
+
+def month_entry(year: int, month: int):
+    for entry in article_months():
+        if (entry["year"], entry["month"]) == (year, month):
+            return entry
+    return None
+
+
+def page_count(entry) -> int:
+    return -(-entry["count"] // SHARD_SIZE)
+
+
+def render_index(request) -> str:
+    namespace = request.resolver_match.namespace  # "api-v1:seo"
+
+    def sitemap(url_name, lastmod=None, page=1, **kwargs):
+        loc = request.build_absolute_uri(reverse(f"{namespace}:{url_name}", kwargs=kwargs))
+        if page > 1:
+            loc = f"{loc}?page={page}"
+        entry = f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n"
+        if lastmod:
+            entry += f"    <lastmod>{lastmod.isoformat(timespec='seconds')}</lastmod>\n"
+        return entry + "  </sitemap>\n"
+
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+        sitemap("sitemap-pages"),
+    ]
+    for entry in article_months():
+        for page in range(1, page_count(entry) + 1):
+            parts.append(sitemap(
+                "sitemap-articles", entry["lastmod"], page, year=entry["year"], month=entry["month"],
+            ))
+    parts.append(sitemap("sitemap-news"))
+    parts.append("</sitemapindex>\n")
+    return "".join(parts)
+
+
+# =========================
+# Shards
+# =========================
+
+def shard_cache_key(entry, page: int) -> str:
+    return (
+        f"sitemap:articles:{entry['year']}-{entry['month']:02d}:{page}:"
+        f"{entry['count']}:{entry['lastmod'].timestamp():.6f}"
+    )
+
+
+def _month_bounds(year: int, month: int):
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+    return start, end
+
+
+def article_shard(year: int, month: int, page: int = 1):
+    """Yield the XML for one article shard in chunks of CHUNK_SIZE URLs."""
+    start, end = _month_bounds(year, month)
+    offset = (page - 1) * SHARD_SIZE
+    rows = (
+        published_articles()
+        .filter(published_at__gte=start, published_at__lt=end)
+        .order_by("published_at", "id")
+        .values_list("slug", "updated_at")[offset:offset + SHARD_SIZE]
+    )
+    base_url = site_url()
+
+    yield URLSET_OPEN
+    chunk = []
+    for slug, updated_at in rows.iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(url_entry(
+            f"{base_url}/article/{slug}", updated_at, DEFAULT_CHANGEFREQ, DEFAULT_PRIORITY
+        ))
+        if len(chunk) >= CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append(URLSET_CLOSE)
+    yield "".join(chunk)
+
+
+def schedule_rebuild(year: int, month: int) -> bool:
+    """Queue rebuild_shard for the month unless one is already queued; True if queued."""
+    from django_q.tasks import async_task
+
+    if not cache.add(REBUILD_PENDING_KEY.format(year, month), 1, REBUILD_DEBOUNCE):
+        return False
+    async_task(
+        "apps.seo.sitemaps.rebuild_shard",
+        year,
+        month,
+        task_name=f"sitemap-{year}-{month:02d}",
+    )
+    return True
+
+
+def rebuild_shard(year: int, month: int):
+    """Render and cache every page of a month's shard (run after an article changes)."""
+    # Changes from here on need a rebuild of their own
+    cache.delete(REBUILD_PENDING_KEY.format(year, month))
+    entry = month_entry(year, month)
+    if entry is None:
+        return
+    for page in range(1, page_count(entry) + 1):
+        xml = "".join(article_shard(year, month, page)).encode()
+        cache.set(shard_cache_key(entry, page), xml, CacheTTL.VERY_LONG)
+    logger.info(f"Rebuilt article sitemap {year}-{month:02d} ({entry['count']} URLs)")
+
+
+def pages_sitemap():
+    from apps.columnists.models import Columnist
+    from apps.news.models import Category
+
+    base_url = site_url()
+    yield URLSET_OPEN
+    yield "".join(url_entry(f"{base_url}{loc}", None, changefreq, priority) for loc, changefreq, priority in STATIC_PAGES)
+    yield "".join(
+        url_entry(f"{base_url}/columnist/{slug}", None, "weekly", "0.6")
+        for slug in Columnist.objects.filter(is_active=True).values_list("slug", flat=True)
+    )
+    yield "".join(
+        url_entry(f"{base_url}/category/{slug}", None, "daily", "0.7")
+        for slug in Category.objects.filter(is_active=True).values_list("slug", flat=True)
+    )
+    yield URLSET_CLOSE
+
+
+def news_sitemap():
+    """Google News entries for articles published in the last NEWS_WINDOW_HOURS."""
+    from django.db.models import Prefetch
+
+    from apps.news.models import Tag
+
+    cutoff = timezone.now() - timedelta(hours=NEWS_WINDOW_HOURS)
+    articles = (
+        published_articles()
+        .filter(published_at__gte=cutoff)
+        .order_by("-published_at")
+        .only("slug", "title", "published_at")
+        .prefetch_related(Prefetch("tags", queryset=Tag.objects.only("name")))[:NEWS_LIMIT]
+    )
+    base_url = site_url()
+    yield NEWS_URLSET_OPEN
+    for article in articles:
+        keywords = ", ".join(tag.name for tag in article.tags.all()[:5])
+        pub_date = article.published_at.isoformat(timespec="seconds")
+        yield f"""  <url>
+    <loc>{escape(f"{base_url}/article/{article.slug}")}</loc>
+    <news:news>
+      <news:publication>
+        <news:name>Bard Santner Journal</news:name>
+        <news:language>en</news:language>
+      </news:publication>
+      <news:publication_date>{pub_date}</news:publication_date>
+      <news:title>{escape(article.title)}</news:title>
+      <news:keywords>{escape(keywords)}</news:keywords>
+    </news:news>
+  </url>
+"""
+    yield URLSET_CLOSE
+
+
+# =========================
+# Responses
+# =========================
+
+def cached_xml_response(key: str, chunks, ttl: int = CacheTTL.VERY_LONG):
+    """
+    Serve `key` from cache, or stream `chunks()` and cache the full
+    document once the last chunk has been sent.
+    """
+    xml = cache.get(key)
+    if xml is not None:
+        return HttpResponse(xml, content_type=CONTENT_TYPE)
+
+    def stream():
+        parts = []
+        for chunk in chunks():
+            data = chunk.encode()
+            parts.append(data)
+            yield data
+        cache.set(key, b"".join(parts), ttl)
+
+    return StreamingHttpResponse(stream(), content_type=CONTENT_TYPE)
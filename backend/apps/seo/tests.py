@@ -0,0 +1,209 @@
+"""
+Tests for the SEO app.
+"""
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.news.models import Category, NewsArticle
+
+from . import sitemaps
+from .models import Redirect
+from .redirects import RedirectMap, redirect_matcher
+
+User = get_user_model()
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def xml(response) -> str:
+    body = b"".join(response.streaming_content) if response.streaming else response.content
+    return body.decode()
+
+
+@override_settings(CACHES=LOCMEM, SITE_URL="https://example.com")
+class SitemapTests(TestCase):
+    """Test cases for the sharded article sitemaps."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.category = Category.objects.create(name="Markets", slug="markets")
+        self.march = [self.publish(f"March {i}", datetime(2026, 3, 10 + i, 12)) for i in range(3)]
+        self.publish("April 0", datetime(2026, 4, 2, 12))
+        NewsArticle.objects.create(title="Draft", content="Body", excerpt="Excerpt", category=self.category)
+
+    def publish(self, title, when):
+        return NewsArticle.objects.create(
+            title=title, content="Body", excerpt="Excerpt", category=self.category,
+            status=NewsArticle.Status.PUBLISHED, published_at=timezone.make_aware(when),
+        )
+
+    def shard_url(self, year, month, page=None):
+        url = reverse("api-v1:seo:sitemap-articles", kwargs={"year": year, "month": month})
+        return f"{url}?page={page}" if page else url
+
+    def test_index_lists_every_shard(self):
+        with mock.patch.object(sitemaps, "SHARD_SIZE", 2):
+            response = self.client.get(reverse("api-v1:seo:sitemap"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = xml(response)
+        self.assertIn("<sitemapindex", body)
+        self.assertIn("/sitemap-pages.xml</loc>", body)
+        self.assertIn("/sitemap-news.xml</loc>", body)
+        self.assertIn(f"{self.shard_url(2026, 3)}</loc>", body)
+        self.assertIn(f"{self.shard_url(2026, 3, 2)}</loc>", body)
+        self.assertIn(f"{self.shard_url(2026, 4)}</loc>", body)
+        self.assertNotIn(self.shard_url(2026, 4, 2), body)
+        self.assertEqual(body.count("<sitemap>"), 5)
+
+    def test_shard_pages_and_404s(self):
+        with mock.patch.object(sitemaps, "SHARD_SIZE", 2):
+            first = xml(self.client.get(self.shard_url(2026, 3)))
+            second = xml(self.client.get(self.shard_url(2026, 3, 2)))
+            for url in (self.shard_url(2026, 3, 3), self.shard_url(2026, 3, "x"), self.shard_url(2026, 5)):
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND, url)
+
+        self.assertEqual(first.count("<url>"), 2)
+        self.assertIn(f"https://example.com/article/{self.march[0].slug}</loc>", first)
+        self.assertIn(f"https://example.com/article/{self.march[2].slug}</loc>", second)
+        self.assertEqual(second.count("<url>"), 1)
+        self.assertNotIn("draft", first + second)
+
+    def test_article_change_rolls_the_shard_key(self):
+        """A cached shard is served until one of its articles changes, then re-rendered."""
+        url = self.shard_url(2026, 3)
+        xml(self.client.get(url))
+        old_key = sitemaps.shard_cache_key(sitemaps.month_entry(2026, 3), 1)
+        self.assertIsNotNone(cache.get(old_key))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertFalse(response.streaming)
+
+        article = self.march[1]
+        article.slug = "renamed"
+        article.save()
+        self.assertNotEqual(sitemaps.shard_cache_key(sitemaps.month_entry(2026, 3), 1), old_key)
+        self.assertIn("/article/renamed</loc>", xml(self.client.get(url)))
+
+    def test_rebuilds_are_debounced_per_month(self):
+        with mock.patch("django_q.tasks.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                for article in self.march:
+                    article.title = f"{article.title} (updated)"
+                    article.save()
+            self.assertEqual(async_task.call_count, 1)
+            self.assertEqual(async_task.call_args.args[1:], (2026, 3))
+
+            sitemaps.rebuild_shard(2026, 3)  # Clears the pending marker
+            self.assertTrue(sitemaps.schedule_rebuild(2026, 3))
+
+
+class RedirectMapTests(SimpleTestCase):
+    """Test cases for compiled redirect matching."""
+
+    def setUp(self):
+        self.map = RedirectMap([
+            (1, "/old-blog/2024/launch", "/news/launch", 301, False),
+            (2, "/old-blog/*", "/news/*", 301, False),
+            (3, "/old-blog/2024/*", "/archive/2024", 302, False),
+            (4, r"/old-blog/(\d+)/(?P<slug>[\w-]+)", r"/posts/\g<slug>?y=\1", 308, True),
+            (5, r"/p/(\d+)", r"/article/\1", 301, True),
+            (6, "/broken/(", "/x", 301, True),
+            (7, "/about-us/", "/about", 301, False),
+        ])
+
+    def test_precedence(self):
+        # Exact beats wildcard beats regex
+        self.assertEqual(self.map.match("/old-blog/2024/launch"), (1, "/news/launch", 301))
+        self.assertEqual(self.map.match("/old-blog/2024/other")[0], 3)  # Longest prefix
+        self.assertEqual(self.map.match("/old-blog/2023/other"), (2, "/news/2023/other", 301))
+        self.assertEqual(self.map.match("/old-blog"), (2, "/news/", 301))
+        self.assertEqual(self.map.match("/old-blog/2022/hello")[0], 2)  # Not regex 4
+        self.assertEqual(self.map.match("/p/42"), (5, "/article/42", 301))
+
+    def test_normalisation_and_misses(self):
+        self.assertEqual(self.map.match("/about-us")[1], "/about")
+        self.assertEqual(self.map.match("/about-us/")[1], "/about")
+        self.assertIsNone(self.map.match("/p/42/extra"))  # Regex is a full match
+        self.assertIsNone(self.map.match("/broken/("))
+        self.assertEqual(len(self.map), 6)  # Invalid pattern skipped
+
+    def test_regex_group_references(self):
+        only_regex = RedirectMap([(4, r"/old-blog/(\d+)/(?P<slug>[\w-]+)", r"/posts/\g<slug>?y=\1", 308, True)])
+        self.assertEqual(only_regex.match("/old-blog/2022/hello"), (4, "/posts/hello?y=2022", 308))
+
+
+class RedirectMiddlewareTests(TestCase):
+    """Test cases for the redirect middleware and map reloads."""
+
+    def setUp(self):
+        redirect_matcher.invalidate()
+        self.addCleanup(redirect_matcher.invalidate)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule = Redirect.objects.create(from_path="/old-article", to_path="/article/new")
+            Redirect.objects.create(from_path="/promo/*", to_path="https://example.com/*", redirect_type=302)
+
+    def test_redirects_keep_query_and_count_hits(self):
+        response = self.client.get("/old-article/?utm_source=x")
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response["Location"], "/article/new?utm_source=x")
+
+        response = self.client.get("/promo/spring/sale")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "https://example.com/spring/sale")
+
+        self.rule.refresh_from_db()
+        self.assertEqual(self.rule.hit_count, 1)
+
+    def test_exempt_requests(self):
+        self.assertNotEqual(self.client.post("/old-article").status_code, 301)
+        with self.captureOnCommitCallbacks(execute=True):
+            Redirect.objects.create(from_path="/api/v1/old", to_path="/api/v1/new")
+        self.assertNotEqual(self.client.get("/api/v1/old").status_code, 301)
+
+    def test_map_reloads_on_commit(self):
+        self.assertIsNotNone(redirect_matcher.match("/old-article"))
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.rule.delete()
+        self.assertIsNotNone(redirect_matcher.match("/old-article"))  # Not committed yet
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(redirect_matcher.match("/old-article"))
+
+
+class RedirectCheckTests(APITestCase):
+    """Test cases for RedirectViewSet.check."""
+
+    def setUp(self):
+        redirect_matcher.invalidate()
+        self.addCleanup(redirect_matcher.invalidate)
+        Redirect.objects.create(from_path="/old-article", to_path="/article/new", redirect_type=308)
+        admin = User.objects.create_user(email="seo@example.com", password="testpass123", role="admin")
+        self.client.force_authenticate(admin)
+        self.url = reverse("api-v1:seo:redirects-check")
+
+    def test_check(self):
+        response = self.client.get(self.url, {"path": "/old-article/"})
+        self.assertEqual(response.data, {"has_redirect": True, "to_path": "/article/new", "redirect_type": 308})
+
+        response = self.client.get(self.url, {"path": "/elsewhere"})
+        self.assertEqual(response.data, {"has_redirect": False})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        reader = User.objects.create_user(email="reader@example.com", password="testpass123")
+        self.client.force_authenticate(reader)
+        response = self.client.get(self.url, {"path": "/old-article"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -15,8 +15,14 @@ router.register(r"structured-data", views.StructuredDataViewSet, basename="struc
 
 urlpatterns = [
     path("article/<slug:slug>/", views.ArticleSEOView.as_view(), name="article-seo"),
-    path("sitemap.xml", views.SitemapView.as_view(), name="sitemap"),
+    path("sitemap.xml", views.SitemapIndexView.as_view(), name="sitemap"),
     path("sitemap-index.xml", views.SitemapIndexView.as_view(), name="sitemap-index"),
+    path("sitemap-pages.xml", views.PagesSitemapView.as_view(), name="sitemap-pages"),
+    path(
+        "sitemap-articles-<int:year>-<int:month>.xml",
+        views.ArticleSitemapView.as_view(),
+        name="sitemap-articles",
+    ),
     path("sitemap-news.xml", views.NewsSitemapView.as_view(), name="sitemap-news"),
     path("robots.txt", views.RobotsTxtView.as_view(), name="robots"),
     path("", include(router.urls)),
@@ -5,19 +5,19 @@ SEO metadata, sitemap, and structured data endpoints.
 """
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.http import HttpResponse
-from django.utils import timezone
+from django.http import Http404, HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.cache import CacheTTL
 from apps.core.permissions import IsAdmin
 from apps.news.models import NewsArticle
-from apps.columnists.models import Columnist, Column
 from apps.geography.models import Country
 
+from . import sitemaps
 from .models import SEOMetadata, Redirect, StructuredData, RobotsTxt
 from .serializers import (
     SEOMetadataSerializer,
@@ -231,116 +231,51 @@ class ArticleSEOView(APIView):
         return Response(serializer.data)
 
 
-class SitemapView(APIView):
+class SitemapIndexView(APIView):
     """
-    Generate XML sitemap.
+    Sitemap index: the pages sitemap, one entry per article shard, and
+    the Google News sitemap. See apps.seo.sitemaps.
     """
 
     permission_classes = [AllowAny]
 
     def get(self, request):
-        base_url = getattr(settings, "SITE_URL", "https://bgfi.global")
-
-        # Build sitemap entries
-        entries = []
-
-        # Static pages
-        static_pages = [
-            {"loc": "/", "priority": "1.0", "changefreq": "hourly"},
-            {"loc": "/markets", "priority": "0.9", "changefreq": "hourly"},
-            {"loc": "/news", "priority": "0.9", "changefreq": "hourly"},
-            {"loc": "/columnists", "priority": "0.7", "changefreq": "weekly"},
-            {"loc": "/about", "priority": "0.5", "changefreq": "monthly"},
-            {"loc": "/contact", "priority": "0.5", "changefreq": "monthly"},
-        ]
+        return HttpResponse(sitemaps.render_index(request), content_type=sitemaps.CONTENT_TYPE)
 
-        for page in static_pages:
-            entries.append(f"""  <url>
-    <loc>{base_url}{page['loc']}</loc>
-    <changefreq>{page['changefreq']}</changefreq>
-    <priority>{page['priority']}</priority>
-  </url>""")
 
-        # Articles
-        articles = NewsArticle.objects.filter(
-            status="published"
-        ).order_by("-published_at")[:1000]
+class PagesSitemapView(APIView):
+    """
+    Static pages, columnists and categories.
+    """
 
-        content_type = ContentType.objects.get_for_model(NewsArticle)
+    permission_classes = [AllowAny]
 
-        for article in articles:
-            # Get SEO metadata if exists
-            try:
-                seo = SEOMetadata.objects.get(
-                    content_type=content_type,
-                    object_id=article.id
-                )
-                priority = str(seo.sitemap_priority)
-                changefreq = seo.sitemap_changefreq
-            except SEOMetadata.DoesNotExist:
-                priority = "0.6"
-                changefreq = "weekly"
-
-            lastmod = article.updated_at.strftime("%Y-%m-%d")
-            entries.append(f"""  <url>
-    <loc>{base_url}/article/{article.slug}</loc>
-    <lastmod>{lastmod}</lastmod>
-    <changefreq>{changefreq}</changefreq>
-    <priority>{priority}</priority>
-  </url>""")
-
-        # Columnists
-        columnists = Columnist.objects.filter(is_active=True)
-        for columnist in columnists:
-            entries.append(f"""  <url>
-    <loc>{base_url}/columnist/{columnist.slug}</loc>
-    <changefreq>weekly</changefreq>
-    <priority>0.6</priority>
-  </url>""")
-
-        # Categories (from news app)
-        from apps.news.models import Category
-        categories = Category.objects.filter(is_active=True)
-        for category in categories:
-            entries.append(f"""  <url>
-    <loc>{base_url}/category/{category.slug}</loc>
-    <changefreq>daily</changefreq>
-    <priority>0.7</priority>
-  </url>""")
-
-        # Build XML
-        xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{chr(10).join(entries)}
-</urlset>"""
-
-        return HttpResponse(xml, content_type="application/xml")
+    def get(self, request):
+        return sitemaps.cached_xml_response(
+            sitemaps.PAGES_CACHE_KEY, sitemaps.pages_sitemap, ttl=CacheTTL.LONG
+        )
 
 
-class SitemapIndexView(APIView):
+class ArticleSitemapView(APIView):
     """
-    Generate sitemap index for large sites.
+    Published articles for one month, SHARD_SIZE URLs per ?page=.
     """
 
     permission_classes = [AllowAny]
 
-    def get(self, request):
-        base_url = getattr(settings, "SITE_URL", "https://bgfi.global")
-        today = timezone.now().strftime("%Y-%m-%d")
-
-        xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <sitemap>
-    <loc>{base_url}/sitemap.xml</loc>
-    <lastmod>{today}</lastmod>
-  </sitemap>
-  <sitemap>
-    <loc>{base_url}/sitemap-news.xml</loc>
-    <lastmod>{today}</lastmod>
-  </sitemap>
-</sitemapindex>"""
-
-        return HttpResponse(xml, content_type="application/xml")
+    def get(self, request, year, month):
+        entry = sitemaps.month_entry(year, month)
+        try:
+            page = int(request.query_params.get("page", 1))
+        except ValueError:
+            page = 0
+        if entry is None or not 1 <= page <= sitemaps.page_count(entry):
+            raise Http404("No such sitemap")
+
+        return sitemaps.cached_xml_response(
+            sitemaps.shard_cache_key(entry, page),
+            lambda: sitemaps.article_shard(year, month, page),
+        )
 
 
 class NewsSitemapView(APIView):
@@ -351,42 +286,9 @@ class NewsSitemapView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        base_url = getattr(settings, "SITE_URL", "https://bgfi.global")
-
-        # Get articles from last 48 hours (Google News requirement)
-        from datetime import timedelta
-        cutoff = timezone.now() - timedelta(hours=48)
-
-        articles = NewsArticle.objects.filter(
-            status="published",
-            published_at__gte=cutoff
-        ).order_by("-published_at")[:1000]
-
-        entries = []
-        for article in articles:
-            pub_date = article.published_at.strftime("%Y-%m-%dT%H:%M:%S+00:00")
-            keywords = ", ".join(t.name for t in article.tags.all()[:5])
-
-            entries.append(f"""  <url>
-    <loc>{base_url}/article/{article.slug}</loc>
-    <news:news>
-      <news:publication>
-        <news:name>Bard Santner Journal</news:name>
-        <news:language>en</news:language>
-      </news:publication>
-      <news:publication_date>{pub_date}</news:publication_date>
-      <news:title>{article.headline}</news:title>
-      <news:keywords>{keywords}</news:keywords>
-    </news:news>
-  </url>""")
-
-        xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
-        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
-{chr(10).join(entries)}
-</urlset>"""
-
-        return HttpResponse(xml, content_type="application/xml")
+        return sitemaps.cached_xml_response(
+            sitemaps.NEWS_CACHE_KEY, sitemaps.news_sitemap, ttl=CacheTTL.SHORT
+        )
 
 
 class RobotsTxtView(APIView):
@@ -442,15 +344,17 @@ class RedirectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            redirect = Redirect.objects.get(from_path=path, is_active=True)
-            return Response({
-                "has_redirect": True,
-                "to_path": redirect.to_path,
-                "redirect_type": redirect.redirect_type,
-            })
-        except Redirect.DoesNotExist:
+        from .redirects import redirect_matcher
+
+        rule = redirect_matcher.match(path)
+        if rule is None:
             return Response({"has_redirect": False})
+        _pk, to_path, redirect_type = rule
+        return Response({
+            "has_redirect": True,
+            "to_path": to_path,
+            "redirect_type": redirect_type,
+        })
 
 
 class StructuredDataViewSet(viewsets.ModelViewSet):
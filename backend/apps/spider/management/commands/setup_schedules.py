@@ -14,6 +14,30 @@ SCHEDULES = [
         "schedule_type": Schedule.MINUTES,
         "minutes": 720,  # Every 12 hours
     },
+    {
+        "name": "flush-view-counters",
+        "func": "apps.analytics.counters.flush_counters",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 1,
+    },
+    {
+        "name": "flush-usage-counters",
+        "func": "apps.subscriptions.metering.flush_usage",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 1,
+    },
+    {
+        "name": "retry-webhook-events",
+        "func": "apps.subscriptions.webhooks.retry_webhook_events",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 5,
+    },
+    {
+        "name": "update-analytics-rollups",
+        "func": "apps.analytics.rollups.update_rollups",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 10,
+    },
 ]
 
 
@@ -898,6 +898,45 @@ def fetch_youtube_african_finance():
         raise
 
 
+# set_article_images budget: stay under Unsplash's 50 requests/hour
+IMAGE_API_BUDGET = 45
+IMAGE_FETCH_WORKERS = 4
+IMAGE_BATCH_LIMIT = 200
+
+
+def _article_seed(article_id) -> int:
+    """Stable per-article index into a list of candidate images."""
+    import hashlib
+
+    return int(hashlib.md5(str(article_id).encode()).hexdigest()[:8], 16)
+
+
+def _fetch_photos(unsplash, queries, budget) -> tuple:
+    """
+    ({query: [photo, ...]}, API calls made, queries left over) for
+    `queries`. Searches already in the shared result store are free; the
+    rest are fetched, at most `budget` of them, with bounded concurrency.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from apps.media import image_store
+
+    def fetch(query):
+        results = unsplash.search_photo(query, per_page=10)
+        return (results or {}).get('all_results', [])
+
+    stored = [query for query in queries if image_store.get_results(query, per_page=10) is not None]
+    stored_set = set(stored)
+    missing = [query for query in queries if query not in stored_set]
+    budget = max(budget, 0)
+    fetched, left = missing[:budget], missing[budget:]
+    served = stored + fetched
+    if not served:
+        return {}, 0, left
+    with ThreadPoolExecutor(max_workers=min(IMAGE_FETCH_WORKERS, len(served))) as pool:
+        return dict(zip(served, pool.map(fetch, served))), len(fetched), left
+
+
 def set_article_images():
     """
     Set contextual HD Unsplash images for articles.
@@ -906,17 +945,29 @@ def set_article_images():
     one Unsplash search per unique topic and distributes results across articles.
     This is MUCH more API-efficient: 20 articles about Kenya = 1 API call, not 20.
 
+    Runs as a pipeline:
+    1. select: candidates with their category in one query
+    2. group: one search query per visual topic
+    3. fetch: topic searches (then category fallbacks for empty topics)
+       from the shared result store, or with IMAGE_FETCH_WORKERS concurrent
+       requests within IMAGE_API_BUDGET
+    4. assign: pick each article's image by its ID seed
+    5. save: one bulk_update for every assignment
+
     Schedule: Every hour
     """
+    import time
+
+    from django.db.models import Q
+
     from apps.news.models import NewsArticle
     from apps.media.image_service import ArticleImageService, UnsplashService
-    import hashlib
 
+    stats = {}
     try:
-        from django.db.models import Q
-
-        # Get articles needing contextual images (generic fallback = no ixid param)
+        # 1. Articles needing contextual images (generic fallback = no ixid param)
         # Skip articles with intentional images (DO Spaces uploads, etc.)
+        started = time.monotonic()
         needs_image = list(
             NewsArticle.objects.filter(
                 status='published',
@@ -928,8 +979,12 @@ def set_article_images():
                     Q(featured_image_url__contains='images.unsplash.com') &
                     ~Q(featured_image_url__contains='ixid=')
                 )
-            ).order_by('-is_featured', '-published_at')[:200]
+            ).select_related('category').only(
+                'id', 'title', 'excerpt', 'source', 'content_length',
+                'featured_image', 'featured_image_url', 'category__slug',
+            ).order_by('-is_featured', '-published_at')[:IMAGE_BATCH_LIMIT]
         )
+        stats['select'] = {'articles': len(needs_image), 'ms': round((time.monotonic() - started) * 1000)}
 
         if not needs_image:
             return "No articles need images"
@@ -937,8 +992,8 @@ def set_article_images():
         image_service = ArticleImageService()
         unsplash = UnsplashService()
 
-        # Step 1: Group articles by their visual search query
-        # This lets us make ONE API call per unique query instead of per article
+        # 2. Group articles by their visual search query, so we make ONE
+        # API call per unique query instead of per article
         query_groups = {}  # { search_query: [article, ...] }
         for article in needs_image:
             cat_slug = article.category.slug if article.category else ''
@@ -948,70 +1003,82 @@ def set_article_images():
                 cat_slug,
                 '',
             )
-            if query not in query_groups:
-                query_groups[query] = []
-            query_groups[query].append(article)
-
-        logger.info(
-            f"Grouped {len(needs_image)} articles into {len(query_groups)} unique queries"
-        )
-
-        saved = 0
-        api_calls = 0
-        MAX_API_CALLS = 45  # Stay under 50/hr rate limit
+            query_groups.setdefault(query, []).append(article)
+        stats['group'] = {'queries': len(query_groups)}
+
+        # 3. Topic searches first, then category fallbacks for topics with
+        # no results, while the budget (this run's share of the hourly
+        # quota left across workers) lasts. Topics past the budget are left
+        # for the next run; searches already in the shared store are free.
+        started = time.monotonic()
+        photos = {}
+        skipped = set()
+        api_calls = fallback_calls = 0
+        if unsplash.is_configured:
+            budget = IMAGE_API_BUDGET
+            remaining = unsplash.remaining_calls()
+            if remaining is not None:
+                budget = min(budget, remaining)
+            photos, api_calls, left = _fetch_photos(unsplash, list(query_groups), budget)
+            skipped = set(left)
+
+            fallback_for = {}  # topic query -> category query
+            for query, found in photos.items():
+                articles = query_groups[query]
+                cat_slug = articles[0].category.slug if articles[0].category else ''
+                cat_query = image_service.CATEGORY_QUERIES.get(cat_slug, '')
+                if not found and cat_query and cat_query != query:
+                    fallback_for[query] = cat_query
+            fallback_photos, fallback_calls, _ = _fetch_photos(
+                unsplash, list(dict.fromkeys(fallback_for.values())), budget - api_calls
+            )
+            for query, cat_query in fallback_for.items():
+                photos[query] = fallback_photos.get(cat_query, [])
+        stats['fetch'] = {
+            'api_calls': api_calls + fallback_calls,
+            'fallback_calls': fallback_calls,
+            'stored_queries': len(query_groups) - len(skipped) - api_calls if unsplash.is_configured else 0,
+            'skipped_queries': len(skipped),
+            'ms': round((time.monotonic() - started) * 1000),
+        }
 
+        # 4. Distribute images across the articles of each group, picking a
+        # unique image from the results by article ID
+        changed = []
+        from_unsplash = from_fallback = 0
         for query, articles in query_groups.items():
-            if api_calls >= MAX_API_CALLS:
-                logger.info(f"Rate limit reached after {api_calls} API calls, {saved} saved")
-                break
-
-            # Fetch 10 results for this query
-            results = None
-            if unsplash.is_configured:
-                results = unsplash.search_photo(query, per_page=10, use_cache=False)
-                api_calls += 1
-
-                # If no results, try category fallback query
-                if not results or not results.get('all_results'):
-                    cat_slug = articles[0].category.slug if articles[0].category else ''
-                    cat_query = image_service.CATEGORY_QUERIES.get(cat_slug, '')
-                    if cat_query and cat_query != query:
-                        results = unsplash.search_photo(cat_query, per_page=10, use_cache=False)
-                        api_calls += 1
-
-            all_photos = (results or {}).get('all_results', [])
-
-            # Distribute images across all articles in this group
+            if query in skipped:
+                continue
+            all_photos = photos.get(query, [])
             for article in articles:
-                try:
-                    if all_photos:
-                        # Use article ID hash to pick a unique image from results
-                        seed = int(hashlib.md5(str(article.id).encode()).hexdigest()[:8], 16)
-                        idx = seed % len(all_photos)
-                        image_url = all_photos[idx].get('url')
-                    else:
-                        # API unavailable — use category fallback from image service
-                        cat_slug = article.category.slug if article.category else 'default'
-                        fallback_list = image_service.FALLBACK_IMAGES.get(
-                            cat_slug, image_service.FALLBACK_IMAGES['default']
-                        )
-                        seed = int(hashlib.md5(str(article.id).encode()).hexdigest()[:8], 16)
-                        image_url = fallback_list[seed % len(fallback_list)]
-
-                    if image_url:
-                        article.featured_image_url = image_url
-                        article.save(update_fields=['featured_image_url'])
-                        saved += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to set image for {article.id}: {e}")
-                    continue
-
-        logger.info(f"Set images for {saved} articles using {api_calls} API calls")
-        return f"Set {saved} images with {api_calls} API calls ({len(query_groups)} unique queries)"
+                seed = _article_seed(article.id)
+                if all_photos:
+                    image_url = all_photos[seed % len(all_photos)].get('url')
+                    from_unsplash += 1
+                else:
+                    # API unavailable — use category fallback from image service
+                    cat_slug = article.category.slug if article.category else 'default'
+                    fallback_list = image_service.FALLBACK_IMAGES.get(
+                        cat_slug, image_service.FALLBACK_IMAGES['default']
+                    )
+                    image_url = fallback_list[seed % len(fallback_list)]
+                    from_fallback += 1
+                if image_url and image_url != article.featured_image_url:
+                    article.featured_image_url = image_url
+                    changed.append(article)
+        stats['assign'] = {'unsplash': from_unsplash, 'fallback': from_fallback, 'changed': len(changed)}
+
+        # 5. One bulk UPDATE (feed flags and updated_at included)
+        started = time.monotonic()
+        saved = NewsArticle.bulk_save(changed, ['featured_image_url']) if changed else 0
+        stats['save'] = {'rows': saved, 'ms': round((time.monotonic() - started) * 1000)}
+
+        api_calls = stats['fetch']['api_calls']
+        logger.info(f"Set images for {saved} articles using {api_calls} API calls: {stats}")
+        return f"Set {saved} images with {api_calls} API calls ({len(query_groups)} unique queries) {stats}"
 
     except Exception as e:
-        logger.error(f"Set article images failed: {e}")
+        logger.error(f"Set article images failed: {e} (stages done: {stats})")
         raise
 
 
@@ -1314,15 +1381,13 @@ def backfill_draft_articles(batch_size: int = 50):
     """
     from apps.news.models import NewsArticle
     from .providers import SerpAPIProvider
-    from django.db.models.functions import Length
 
     drafts = (
         NewsArticle.objects
         .filter(status='draft')
         .exclude(external_url='')
         .exclude(external_url__isnull=True)
-        .annotate(clen=Length('content'))
-        .filter(clen__lt=500)
+        .filter(content_length__lt=NewsArticle.FEED_MIN_CONTENT_LENGTH)
         .order_by('-created_at')[:batch_size]
     )
 
@@ -0,0 +1,100 @@
+"""
+Tests for the Spider app.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.media.image_service import ArticleImageService, UnsplashService
+from apps.news.models import Category, NewsArticle
+
+from . import tasks
+
+
+def photos(query, count=3):
+    return {"all_results": [{"url": f"https://images.unsplash.com/{query}-{i}?ixid=test"} for i in range(count)]}
+
+
+@override_settings(UNSPLASH_ACCESS_KEY="test-key", UNSPLASH_ACCESS_KEY_2="", UNSPLASH_ACCESS_KEY_3="")
+class SetArticleImagesTests(TestCase):
+    """Test cases for the batched article image pipeline."""
+
+    def setUp(self):
+        markets = Category.objects.create(name="Markets", slug="markets")
+        titles = ("Kenya shilling rallies", "Kenya bonds rally", "Nigeria rates hold", "Ghana cocoa output")
+        self.articles = {
+            title: NewsArticle.objects.create(
+                title=title, content="Body", excerpt="Excerpt", category=markets,
+                status=NewsArticle.Status.PUBLISHED, published_at=timezone.now() - timedelta(hours=len(titles) - i),
+            )
+            for i, title in enumerate(titles)
+        }
+        NewsArticle.objects.create(
+            title="Kenya uploaded", content="Body", excerpt="Excerpt", category=markets,
+            status=NewsArticle.Status.PUBLISHED,
+            featured_image_url="https://bucket.fra1.digitaloceanspaces.com/a.jpg",
+        )
+        NewsArticle.objects.create(
+            title="Kenya picked", content="Body", excerpt="Excerpt", category=markets,
+            status=NewsArticle.Status.PUBLISHED,
+            featured_image_url="https://images.unsplash.com/photo-1?ixid=chosen",
+        )
+
+        # One topic per first word of the title: kenya, nigeria, ghana
+        for patcher in (
+            mock.patch.object(
+                ArticleImageService, "_build_search_query",
+                side_effect=lambda title, *args: title.split()[0].lower(),
+            ),
+            mock.patch.object(UnsplashService, "remaining_calls", return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def image(self, title):
+        return NewsArticle.objects.values_list("featured_image_url", flat=True).get(pk=self.articles[title].pk)
+
+    def test_one_select_and_one_bulk_update(self):
+        with mock.patch.object(UnsplashService, "search_photo", side_effect=lambda query, **kw: photos(query)):
+            with CaptureQueriesContext(connection) as queries:
+                result = tasks.set_article_images()
+
+        statements = [q["sql"].split()[0] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(statements, ["SELECT", "UPDATE"])
+        self.assertIn("'select': {'articles': 4", result)
+        self.assertIn("'group': {'queries': 3}", result)
+        self.assertIn("'api_calls': 3, 'fallback_calls': 0", result)
+        self.assertIn("'assign': {'unsplash': 4, 'fallback': 0, 'changed': 4}", result)
+        self.assertIn("'save': {'rows': 4", result)
+        self.assertTrue(self.image("Kenya bonds rally").startswith("https://images.unsplash.com/kenya-"))
+        self.assertTrue(self.image("Ghana cocoa output").startswith("https://images.unsplash.com/ghana-"))
+
+    def test_budget_leaves_remaining_topics_for_the_next_run(self):
+        with mock.patch.object(tasks, "IMAGE_API_BUDGET", 2), mock.patch.object(
+            UnsplashService, "search_photo", side_effect=lambda query, **kw: photos(query),
+        ) as search:
+            result = tasks.set_article_images()
+
+        self.assertEqual(search.call_count, 2)
+        self.assertIn("'skipped_queries': 1", result)
+        # Topics go in selection order (newest first), so "kenya" is left for later
+        self.assertEqual(self.image("Kenya shilling rallies"), "")
+        self.assertEqual(self.image("Kenya bonds rally"), "")
+        self.assertNotEqual(self.image("Ghana cocoa output"), "")
+
+    def test_empty_topics_fall_back_to_the_category_search(self):
+        def search(query, **kwargs):
+            return photos(query) if query in ("kenya", "stock exchange") else {"all_results": []}
+
+        with mock.patch.object(UnsplashService, "search_photo", side_effect=search) as search_photo:
+            result = tasks.set_article_images()
+
+        searched = [call.args[0] for call in search_photo.call_args_list]
+        self.assertEqual(searched.count("stock exchange"), 1)  # Shared by both empty topics
+        self.assertIn("'api_calls': 4, 'fallback_calls': 1", result)
+        self.assertTrue(self.image("Nigeria rates hold").startswith("https://images.unsplash.com/stock exchange-"))
+        self.assertTrue(self.image("Kenya shilling rallies").startswith("https://images.unsplash.com/kenya-"))
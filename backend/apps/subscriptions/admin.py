@@ -326,14 +326,15 @@ class WebhookEventAdmin(admin.ModelAdmin):
         "event_id",
         "provider",
         "event_type",
+        "customer_key",
         "status_badge",
         "attempts",
         "created_at",
     ]
     list_filter = ["provider", "status", "event_type"]
-    search_fields = ["event_id", "event_type"]
+    search_fields = ["event_id", "event_type", "customer_key"]
     readonly_fields = [
-        "event_id", "provider", "event_type", "payload",
+        "event_id", "provider", "event_type", "customer_key", "occurred_at", "payload",
         "response", "error_message", "processed_at", "attempts"
     ]
     date_hierarchy = "created_at"
@@ -0,0 +1,206 @@
+"""
+Subscription usage metering (premium article reads, API calls).
+
+Request path (one Redis round trip, no DB write):
+- usage:<meter>:<subscription>:<period> holds the usage total for the
+  subscription's current billing period. It is seeded with the DB value
+  on first use in the period (SET NX) and INCRBY'd on every use, so
+  limits are checked against it without re-reading the subscription row.
+- the same increment is HINCRBY'd into the usage:pending:<meter> hash,
+  keyed by "<subscription>:<period>".
+
+`flush_usage` (scheduled every minute) renames each pending hash and
+applies it with one UPDATE ... SET field = field + delta per subscription,
+only while the subscription is still in the period the usage was recorded
+in, so usage from a period that has since been reset is dropped.
+
+Without Redis (dummy cache in tests, Redis outage) usage is written
+straight to the row with an F() update.
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.analytics.counters import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# meter -> Subscription usage field
+METERS = {
+    "articles": "articles_read_this_period",
+    "api_calls": "api_calls_this_period",
+}
+
+USAGE_KEY = "usage:{}:{}:{}"  # meter, subscription id, period
+PENDING_KEY = "usage:pending:{}"  # meter
+FLUSH_LOCK_KEY = "usage:flush:lock"
+FLUSH_LOCK_TTL = 55
+USAGE_TTL = 40 * 24 * 60 * 60  # Outlives a monthly period
+
+
+def period_token(subscription) -> int:
+    """Whole seconds of current_period_start: identifies the billing period."""
+    return int(subscription.current_period_start.timestamp())
+
+
+def _usage_key(meter: str, subscription) -> str:
+    return USAGE_KEY.format(meter, subscription.pk, period_token(subscription))
+
+
+def _pending_field(subscription) -> str:
+    return f"{subscription.pk}:{period_token(subscription)}"
+
+
+def usage(subscription, meter: str) -> int:
+    """Usage of `meter` this period, including increments not flushed yet."""
+    conn = get_redis_client()
+    if conn is not None:
+        try:
+            value = conn.get(_usage_key(meter, subscription))
+            if value is not None:
+                return int(value)
+        except Exception as e:
+            logger.warning(f"Usage lookup failed: {e}")
+    return getattr(subscription, METERS[meter])
+
+
+def usage_all(subscription) -> dict:
+    """{meter: usage} for every meter, in one round trip."""
+    values = {meter: getattr(subscription, field) for meter, field in METERS.items()}
+    conn = get_redis_client()
+    if conn is None:
+        return values
+    try:
+        stored = conn.mget([_usage_key(meter, subscription) for meter in METERS])
+    except Exception as e:
+        logger.warning(f"Usage lookup failed: {e}")
+        return values
+    for meter, value in zip(METERS, stored):
+        if value is not None:
+            values[meter] = int(value)
+    return values
+
+
+def _write_through(subscription, meter: str, amount: int) -> int:
+    from .models import Subscription
+
+    field = METERS[meter]
+    Subscription.all_objects.filter(pk=subscription.pk).update(**{field: F(field) + amount})
+    setattr(subscription, field, getattr(subscription, field) + amount)
+    return getattr(subscription, field)
+
+
+def record(subscription, meter: str, amount: int = 1) -> int:
+    """
+    Add `amount` to the subscription's `meter`; returns the new total for
+    the period. With Redis the instance's usage field is left as loaded,
+    so a later save() can't write the buffered total back over the flush.
+    """
+    conn = get_redis_client()
+    if conn is None:
+        return _write_through(subscription, meter, amount)
+
+    key = _usage_key(meter, subscription)
+    try:
+        pipe = conn.pipeline()
+        pipe.set(key, getattr(subscription, METERS[meter]), nx=True, ex=USAGE_TTL)
+        pipe.incrby(key, amount)
+        pipe.hincrby(PENDING_KEY.format(meter), _pending_field(subscription), amount)
+        return int(pipe.execute()[1])
+    except Exception as e:
+        logger.warning(f"Usage metering via Redis failed, writing through: {e}")
+        return _write_through(subscription, meter, amount)
+
+
+def consume(subscription, meter: str, limit: int) -> bool:
+    """
+    Record one use if it stays within `limit` (0 = unlimited). The check
+    and the increment are one INCR, so concurrent requests can't overrun
+    the limit; a refused use is taken back.
+    """
+    total = record(subscription, meter)
+    if not limit or total <= limit:
+        return True
+    record(subscription, meter, -1)
+    return False
+
+
+def reset(subscription):
+    """Forget this period's Redis usage and unflushed increments (the row is reset by the caller)."""
+    conn = get_redis_client()
+    if conn is None:
+        return
+    try:
+        pipe = conn.pipeline()
+        for meter in METERS:
+            pipe.delete(_usage_key(meter, subscription))
+            pipe.hdel(PENDING_KEY.format(meter), _pending_field(subscription))
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Usage reset failed: {e}")
+
+
+def apply_usage(meter: str, deltas: dict) -> int:
+    """Apply {(subscription id, period token): delta}; returns the rows updated."""
+    from .models import Subscription
+
+    field = METERS[meter]
+    updated = 0
+    for (pk, token), delta in deltas.items():
+        start = datetime.fromtimestamp(token, tz=dt_timezone.utc)
+        updated += Subscription.all_objects.filter(
+            pk=pk,
+            current_period_start__gte=start,
+            current_period_start__lt=start + timedelta(seconds=1),
+        ).update(**{field: F(field) + delta})
+    return updated
+
+
+def _flush_meter(conn, meter: str) -> int:
+    live_key = PENDING_KEY.format(meter)
+    inflight_key = f"{live_key}:inflight"
+
+    # A leftover inflight hash means the previous flush died mid-way
+    if not conn.exists(inflight_key):
+        if not conn.exists(live_key):
+            return 0
+        conn.rename(live_key, inflight_key)
+
+    deltas = {}
+    for raw_field, raw_delta in conn.hgetall(inflight_key).items():
+        pk, _, token = raw_field.decode().rpartition(":")
+        if int(raw_delta):
+            deltas[(pk, int(token))] = int(raw_delta)
+    with transaction.atomic():
+        apply_usage(meter, deltas)
+    conn.delete(inflight_key)
+    return sum(deltas.values())
+
+
+def flush_usage():
+    """
+    Apply buffered usage increments to the subscription rows.
+
+    Schedule: Every minute
+    """
+    conn = get_redis_client()
+    if conn is None:
+        return "Redis unavailable — usage is written synchronously"
+
+    if not conn.set(FLUSH_LOCK_KEY, 1, nx=True, ex=FLUSH_LOCK_TTL):
+        return "Flush already running"
+
+    flushed = {}
+    try:
+        for meter in METERS:
+            try:
+                flushed[meter] = _flush_meter(conn, meter)
+            except Exception as e:
+                logger.error(f"Usage flush failed for {meter}: {e}")
+    finally:
+        conn.delete(FLUSH_LOCK_KEY)
+
+    summary = ", ".join(f"{meter}={count}" for meter, count in flushed.items() if count)
+    return f"Flushed usage: {summary or 'nothing pending'}"
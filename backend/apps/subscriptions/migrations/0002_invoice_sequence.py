@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("subscriptions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvoiceSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(help_text="YYYYMM", max_length=6, unique=True),
+                ),
+                ("last_value", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Invoice Sequence",
+                "verbose_name_plural": "Invoice Sequences",
+            },
+        ),
+    ]
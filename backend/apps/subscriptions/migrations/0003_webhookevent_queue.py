@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("subscriptions", "0002_invoice_sequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhookevent",
+            name="customer_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Provider customer the event belongs to; events are processed in order per customer",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="webhookevent",
+            name="occurred_at",
+            field=models.DateTimeField(
+                blank=True, help_text="When the provider created the event", null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webhookevent",
+            index=models.Index(
+                fields=["provider", "customer_key", "status"],
+                name="subscriptio_provide_917630_idx",
+            ),
+        ),
+    ]
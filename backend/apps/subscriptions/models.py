@@ -231,29 +231,62 @@ class Subscription(BaseModel):
         return max(0, delta.days)
 
     def can_read_premium_article(self):
-        """Check if user can read another premium article this period."""
+        """Check if user can read another premium article this period (see consume_article_read)."""
+        from .metering import usage
+
         if self.plan.has_unlimited_articles:
             return True
-        return self.articles_read_this_period < self.plan.article_limit
+        return usage(self, "articles") < self.plan.article_limit
 
     def can_make_api_call(self):
-        """Check if user can make another API call this period."""
+        """Check if user can make another API call this period (see consume_api_call)."""
+        from .metering import usage
+
         if self.plan.api_calls_limit == 0:
             return self.plan.has_api_access
-        return self.api_calls_this_period < self.plan.api_calls_limit
+        return usage(self, "api_calls") < self.plan.api_calls_limit
+
+    def consume_article_read(self):
+        """
+        Count a premium article read if the plan allows another; False when
+        over the limit. Use this as the gate: the check and the increment
+        are one Redis INCR, so concurrent reads can't overrun the limit.
+        """
+        from .metering import consume
+
+        return consume(self, "articles", self.plan.article_limit)
+
+    def consume_api_call(self):
+        """Count an API call if the plan allows another; False when over the limit."""
+        from .metering import consume
+
+        if not self.plan.has_api_access:
+            return False
+        return consume(self, "api_calls", self.plan.api_calls_limit)
+
+    def current_usage(self):
+        """{"articles": n, "api_calls": n} this period, including unflushed usage."""
+        from .metering import usage_all
+
+        return usage_all(self)
 
     def increment_article_read(self):
-        """Increment the article read counter."""
-        self.articles_read_this_period += 1
-        self.save(update_fields=["articles_read_this_period"])
+        """Increment the article read counter (buffered, see apps.subscriptions.metering)."""
+        from .metering import record
+
+        record(self, "articles")
 
     def increment_api_call(self):
-        """Increment the API call counter."""
-        self.api_calls_this_period += 1
-        self.save(update_fields=["api_calls_this_period"])
+        """Increment the API call counter (buffered, see apps.subscriptions.metering)."""
+        from .metering import record
+
+        record(self, "api_calls")
 
     def reset_usage_counters(self):
         """Reset usage counters for new billing period."""
+        from .metering import reset
+
+        reset(self)
         self.articles_read_this_period = 0
         self.api_calls_this_period = 0
         self.save(update_fields=[
@@ -443,17 +476,9 @@ class Invoice(BaseModel):
 
     def save(self, *args, **kwargs):
         if not self.invoice_number:
-            # Generate invoice number
-            prefix = timezone.now().strftime("%Y%m")
-            last_invoice = Invoice.objects.filter(
-                invoice_number__startswith=f"INV-{prefix}"
-            ).order_by("-invoice_number").first()
-
-            if last_invoice:
-                last_num = int(last_invoice.invoice_number.split("-")[-1])
-                self.invoice_number = f"INV-{prefix}-{last_num + 1:05d}"
-            else:
-                self.invoice_number = f"INV-{prefix}-00001"
+            from .numbering import next_invoice_number
+
+            self.invoice_number = next_invoice_number()
 
         # Calculate total
         self.total = self.subtotal + self.tax - self.discount
@@ -466,6 +491,22 @@ class Invoice(BaseModel):
         return f"{symbol}{self.total / 100:.2f}"
 
 
+class InvoiceSequence(models.Model):
+    """
+    Per-month invoice number counter (apps.subscriptions.numbering), used
+    where there are no Postgres sequences.
+    """
+    period = models.CharField(max_length=6, unique=True, help_text="YYYYMM")
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Invoice Sequence"
+        verbose_name_plural = "Invoice Sequences"
+
+    def __str__(self):
+        return f"{self.period}: {self.last_value}"
+
+
 class InvoiceItem(TimeStampedModel):
     """
     Individual line items on an invoice.
@@ -694,6 +735,12 @@ class WebhookEvent(TimeStampedModel):
     event_id = models.CharField(max_length=255, unique=True)
     provider = models.CharField(max_length=20, choices=Provider.choices)
     event_type = models.CharField(max_length=100)
+    customer_key = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Provider customer the event belongs to; events are processed in order per customer",
+    )
+    occurred_at = models.DateTimeField(null=True, blank=True, help_text="When the provider created the event")
     status = models.CharField(
         max_length=20,
         choices=Status.choices,
@@ -713,6 +760,7 @@ class WebhookEvent(TimeStampedModel):
             models.Index(fields=["event_id"]),
             models.Index(fields=["provider", "event_type"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["provider", "customer_key", "status"]),
         ]
 
     def __str__(self):
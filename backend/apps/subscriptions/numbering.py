@@ -0,0 +1,144 @@
+"""
+Invoice number allocation.
+
+Numbers look like INV-202610-00042: a per-month counter, formatted with at
+least five digits. Invoice.save used to find the month's highest number
+with an ORDER BY on invoice_number and add one in Python, so concurrent
+webhook-driven invoices either collided on the unique constraint or had
+to retry.
+
+Each allocation is now one O(1) statement, and a caller can take a block
+of numbers at once for bulk invoice runs (`allocate_invoice_numbers(n)`,
+`assign_invoice_numbers(invoices)`):
+
+- PostgreSQL: one sequence per month (invoice_number_202610), created on
+  first use. nextval() never blocks or waits on another transaction, and
+  a block is a single `nextval() FROM generate_series(1, n)`. The
+  trade-off is that a rolled-back transaction leaves a gap in the
+  numbering. The sequence is created inside the caller's transaction, so
+  a process only remembers it once that commits; a sequence that turns
+  out to be missing anyway is created again.
+- Other databases (SQLite in development and tests): an InvoiceSequence
+  row per month, advanced with UPDATE ... SET last_value = last_value + n.
+  The row lock is held until the allocating transaction commits.
+
+A month's counter starts after the highest number already issued that
+month, so it picks up where the old scheme left off.
+"""
+import logging
+
+from django.db import IntegrityError, ProgrammingError, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "INV"
+SEQUENCE_NAME = "invoice_number_{}"  # period
+
+# Periods whose Postgres sequence this process has seen committed
+_known_sequences: set[str] = set()
+
+
+def current_period() -> str:
+    return timezone.now().strftime("%Y%m")
+
+
+def format_number(period: str, value: int) -> str:
+    return f"{PREFIX}-{period}-{value:05d}"
+
+
+def last_issued(period: str) -> int:
+    """Highest counter value already used in `period` (once per period, when its counter is created)."""
+    from .models import Invoice
+
+    numbers = Invoice.all_objects.filter(
+        invoice_number__startswith=f"{PREFIX}-{period}-"
+    ).values_list("invoice_number", flat=True)
+    values = [int(number.rsplit("-", 1)[-1]) for number in numbers if number.rsplit("-", 1)[-1].isdigit()]
+    return max(values, default=0)
+
+
+def _create_sequence(connection, period: str):
+    name = connection.ops.quote_name(SEQUENCE_NAME.format(period))
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {name} START WITH {last_issued(period) + 1}")
+    except IntegrityError:
+        # Another process created it at the same moment
+        pass
+    # Rolled back with the caller's transaction (ATOMIC_REQUESTS), so only
+    # remembered once that commits
+    transaction.on_commit(lambda: _known_sequences.add(period), using=connection.alias)
+
+
+def _nextvals(connection, period: str, count: int) -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+            [SEQUENCE_NAME.format(period), count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _allocate_postgres(connection, period: str, count: int) -> list:
+    if period not in _known_sequences:
+        _create_sequence(connection, period)
+    try:
+        with transaction.atomic(using=connection.alias):
+            return _nextvals(connection, period, count)
+    except ProgrammingError as e:
+        # UndefinedTable: the sequence was dropped or never committed
+        logger.warning(f"Invoice sequence for {period} missing, creating it again: {e}")
+        _known_sequences.discard(period)
+        _create_sequence(connection, period)
+        return _nextvals(connection, period, count)
+
+
+def _allocate_counter(using: str, period: str, count: int) -> list:
+    from .models import InvoiceSequence
+
+    rows = InvoiceSequence.objects.using(using).filter(period=period)
+    with transaction.atomic(using=using):
+        if not rows.update(last_value=F("last_value") + count):
+            try:
+                with transaction.atomic(using=using):
+                    InvoiceSequence.objects.using(using).create(
+                        period=period, last_value=last_issued(period) + count
+                    )
+            except IntegrityError:
+                # Created concurrently; advance that row instead
+                rows.update(last_value=F("last_value") + count)
+        last = rows.values_list("last_value", flat=True).get()
+    return list(range(last - count + 1, last + 1))
+
+
+def allocate_invoice_numbers(count: int = 1, period: str = None) -> list:
+    """`count` unused invoice numbers for `period` (YYYYMM, default this month), ascending."""
+    from .models import Invoice
+
+    if count < 1:
+        return []
+    period = period or current_period()
+    using = router.db_for_write(Invoice)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        values = _allocate_postgres(connection, period, count)
+    else:
+        values = _allocate_counter(using, period, count)
+    return [format_number(period, value) for value in values]
+
+
+def next_invoice_number(period: str = None) -> str:
+    return allocate_invoice_numbers(1, period)[0]
+
+
+def assign_invoice_numbers(invoices, period: str = None) -> list:
+    """
+    Give every invoice without a number one from a single pre-allocated
+    block, e.g. before Invoice.objects.bulk_create(invoices).
+    """
+    pending = [invoice for invoice in invoices if not invoice.invoice_number]
+    for invoice, number in zip(pending, allocate_invoice_numbers(len(pending), period)):
+        invoice.invoice_number = number
+    return invoices
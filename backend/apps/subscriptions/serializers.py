@@ -143,16 +143,17 @@ class SubscriptionSerializer(serializers.ModelSerializer):
         ]
 
     def get_usage(self, obj):
+        used = obj.current_usage()
         return {
-            "articles_read": obj.articles_read_this_period,
+            "articles_read": used["articles"],
             "articles_limit": obj.plan.article_limit,
             "articles_remaining": max(
-                0, obj.plan.article_limit - obj.articles_read_this_period
+                0, obj.plan.article_limit - used["articles"]
             ) if obj.plan.article_limit > 0 else None,
-            "api_calls": obj.api_calls_this_period,
+            "api_calls": used["api_calls"],
             "api_calls_limit": obj.plan.api_calls_limit,
             "api_calls_remaining": max(
-                0, obj.plan.api_calls_limit - obj.api_calls_this_period
+                0, obj.plan.api_calls_limit - used["api_calls"]
             ) if obj.plan.api_calls_limit > 0 else None,
         }
 
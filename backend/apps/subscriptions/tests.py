@@ -1,8 +1,11 @@
 """
 Tests for the Subscriptions app.
 """
+import hashlib
+import hmac
+import json
 from decimal import Decimal
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -15,6 +18,7 @@ from .models import (
     Invoice,
     Coupon,
     PaymentMethod,
+    WebhookEvent,
 )
 
 User = get_user_model()
@@ -112,6 +116,20 @@ class SubscriptionModelTests(TestCase):
         self.subscription.save()
         self.assertFalse(self.subscription.can_read_premium_article())
 
+    def test_consume_article_read(self):
+        """The article gate counts a read only while under the limit."""
+        self.subscription.articles_read_this_period = 99
+        self.subscription.save()
+
+        self.assertTrue(self.subscription.consume_article_read())
+        self.assertFalse(self.subscription.consume_article_read())
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.articles_read_this_period, 100)
+
+        self.plan.article_limit = 0  # Unlimited
+        self.plan.save()
+        self.assertTrue(self.subscription.consume_article_read())
+
     def test_increment_article_read(self):
         """Test incrementing article read counter."""
         initial_count = self.subscription.articles_read_this_period
@@ -122,6 +140,25 @@ class SubscriptionModelTests(TestCase):
             initial_count + 1
         )
 
+    def test_metered_usage(self):
+        """The consume gates enforce the limit; flushed usage only lands in its own period."""
+        from .metering import apply_usage, period_token
+
+        self.plan.api_calls_limit = 2
+        self.plan.save()
+        self.assertTrue(self.subscription.consume_api_call())
+        self.assertTrue(self.subscription.consume_api_call())
+        self.assertFalse(self.subscription.consume_api_call())
+        self.assertFalse(self.subscription.can_make_api_call())
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.api_calls_this_period, 2)
+
+        token = period_token(self.subscription)
+        self.assertEqual(apply_usage("articles", {(str(self.subscription.pk), token): 3}), 1)
+        self.assertEqual(apply_usage("articles", {(str(self.subscription.pk), token - 86400): 5}), 0)
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.articles_read_this_period, 3)
+
 
 class CouponModelTests(TestCase):
     """Test cases for Coupon model."""
@@ -162,6 +199,86 @@ class CouponModelTests(TestCase):
         self.assertEqual(discount, 300)  # Capped at original amount
 
 
+class InvoiceNumberTests(TestCase):
+    """Test cases for invoice number allocation."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="billing@example.com",
+            password="testpass123"
+        )
+
+    def test_numbers_continue_after_existing_invoices(self):
+        """The month's counter starts after numbers already issued."""
+        from .numbering import allocate_invoice_numbers, current_period
+
+        period = current_period()
+        Invoice.objects.create(user=self.user, invoice_number=f"INV-{period}-00007")
+
+        invoice = Invoice.objects.create(user=self.user)
+        self.assertEqual(invoice.invoice_number, f"INV-{period}-00008")
+        self.assertEqual(
+            allocate_invoice_numbers(3),
+            [f"INV-{period}-00009", f"INV-{period}-00010", f"INV-{period}-00011"],
+        )
+
+    def test_bulk_run_uses_one_block(self):
+        """assign_invoice_numbers numbers unsaved invoices for bulk_create."""
+        from .numbering import assign_invoice_numbers
+
+        invoices = assign_invoice_numbers(
+            [Invoice(user=self.user) for _ in range(4)], period="203001"
+        )
+        Invoice.objects.bulk_create(invoices)
+        self.assertEqual(
+            sorted(Invoice.objects.values_list("invoice_number", flat=True)),
+            [f"INV-203001-0000{i}" for i in range(1, 5)],
+        )
+
+    def test_sequence_only_remembered_once_committed(self):
+        """A CREATE SEQUENCE rolled back with the caller's transaction isn't cached."""
+        from unittest import mock
+
+        from django.db import connection
+
+        from . import numbering
+
+        pg = mock.MagicMock(alias=connection.alias)
+        pg.ops.quote_name.side_effect = lambda name: f'"{name}"'
+        self.addCleanup(numbering._known_sequences.discard, "203002")
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            numbering._create_sequence(pg, "203002")
+        pg.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+            'CREATE SEQUENCE IF NOT EXISTS "invoice_number_203002" START WITH 1'
+        )
+        self.assertNotIn("203002", numbering._known_sequences)
+
+        for callback in callbacks:
+            callback()
+        self.assertIn("203002", numbering._known_sequences)
+
+    def test_missing_sequence_is_created_again(self):
+        """A cached period whose sequence is gone (UndefinedTable) gets it re-created."""
+        from unittest import mock
+
+        from django.db import ProgrammingError, connection
+
+        from . import numbering
+
+        numbering._known_sequences.add("203003")
+        self.addCleanup(numbering._known_sequences.discard, "203003")
+        missing = ProgrammingError('relation "invoice_number_203003" does not exist')
+
+        with mock.patch.object(numbering, "_nextvals", side_effect=[missing, [1, 2]]), \
+                mock.patch.object(numbering, "_create_sequence") as create:
+            values = numbering._allocate_postgres(connection, "203003", 2)
+
+        self.assertEqual(values, [1, 2])
+        create.assert_called_once_with(connection, "203003")
+        self.assertNotIn("203003", numbering._known_sequences)  # Until the re-creation commits
+
+
 class SubscriptionPlanAPITests(APITestCase):
     """API tests for subscription plans."""
 
@@ -242,3 +359,69 @@ class SubscriptionAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("has_active_subscription", response.data)
         self.assertIn("available_plans", response.data)
+
+
+@override_settings(PAYSTACK_SECRET_KEY="sk_test_webhooks")
+class WebhookQueueTests(APITestCase):
+    """Test cases for queued webhook processing."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="hook@example.com",
+            password="testpass123"
+        )
+        self.plan = SubscriptionPlan.objects.create(
+            name="Premium",
+            slug="premium",
+            plan_type=SubscriptionPlan.PlanType.PREMIUM,
+            price_usd=1999,
+        )
+        self.subscription = Subscription.objects.create(
+            user=self.user,
+            plan=self.plan,
+            status=Subscription.Status.ACTIVE,
+            paystack_subscription_code="SUB_abc",
+        )
+
+    def _post(self, payload):
+        body = json.dumps(payload).encode()
+        signature = hmac.new(b"sk_test_webhooks", body, hashlib.sha512).hexdigest()
+        return self.client.post(
+            reverse("api-v1:subscriptions:paystack-webhook"),
+            data=body,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+
+    def test_retries_collapse_into_one_processed_event(self):
+        """A retried delivery is stored and processed once."""
+        payload = {
+            "event": "subscription.disable",
+            "data": {
+                "id": 42,
+                "subscription_code": "SUB_abc",
+                "customer": {"customer_code": "CUS_1"},
+            },
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._post(payload)
+        with self.captureOnCommitCallbacks(execute=True):
+            retry = self._post(payload)
+
+        self.assertEqual(first.data["status"], "queued")
+        self.assertEqual(retry.data["status"], "duplicate")
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.status, WebhookEvent.Status.PROCESSED)
+        self.assertEqual(event.customer_key, "CUS_1")
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.status, Subscription.Status.CANCELED)
+
+    def test_bad_signature_rejected(self):
+        """Unsigned deliveries are not stored."""
+        response = self.client.post(
+            reverse("api-v1:subscriptions:paystack-webhook"),
+            data={"event": "charge.success"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WebhookEvent.objects.exists())
@@ -4,6 +4,7 @@ Views for Subscription and Payment management.
 Provides REST API endpoints for subscription management with
 Stripe and Paystack payment processing.
 """
+import json
 import logging
 from django.conf import settings
 from django.utils import timezone
@@ -171,18 +172,19 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         plan = subscription.plan
         articles_limit = plan.article_limit or 0
         api_limit = plan.api_calls_limit or 0
+        used = subscription.current_usage()
 
         data = {
-            "articles_read": subscription.articles_read_this_period,
+            "articles_read": used["articles"],
             "articles_limit": articles_limit,
             "articles_percentage": (
-                (subscription.articles_read_this_period / articles_limit * 100)
+                (used["articles"] / articles_limit * 100)
                 if articles_limit > 0 else 0
             ),
-            "api_calls": subscription.api_calls_this_period,
+            "api_calls": used["api_calls"],
             "api_calls_limit": api_limit,
             "api_calls_percentage": (
-                (subscription.api_calls_this_period / api_limit * 100)
+                (used["api_calls"] / api_limit * 100)
                 if api_limit > 0 else 0
             ),
             "period_start": subscription.current_period_start,
@@ -553,17 +555,22 @@ class BillingPortalView(views.APIView):
 class StripeWebhookView(views.APIView):
     """
     Handle Stripe webhook events.
+
+    Verified events are stored and processed by a django-q task
+    (apps.subscriptions.webhooks); Stripe gets its 200 straight away.
     """
     permission_classes = [AllowAny]
 
     def post(self, request):
+        from .webhooks import ingest
+
         payload = request.body
         sig_header = request.META.get("HTTP_STRIPE_SIGNATURE")
 
         stripe_service = StripeService()
 
         try:
-            event = stripe_service.construct_webhook_event(payload, sig_header)
+            stripe_service.construct_webhook_event(payload, sig_header)
         except ValueError:
             logger.error("Invalid Stripe webhook payload")
             return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -571,43 +578,22 @@ class StripeWebhookView(views.APIView):
             logger.error(f"Stripe webhook error: {e}")
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        # Log the event
-        webhook_event, created = WebhookEvent.objects.get_or_create(
-            event_id=event["id"],
-            defaults={
-                "provider": WebhookEvent.Provider.STRIPE,
-                "event_type": event["type"],
-                "payload": event,
-            }
-        )
-
-        if not created:
-            # Already processed
-            return Response({"status": "already_processed"})
-
-        try:
-            stripe_service.handle_webhook_event(event)
-            webhook_event.status = WebhookEvent.Status.PROCESSED
-            webhook_event.processed_at = timezone.now()
-        except Exception as e:
-            logger.error(f"Failed to process Stripe webhook: {e}")
-            webhook_event.status = WebhookEvent.Status.FAILED
-            webhook_event.error_message = str(e)
-            webhook_event.attempts += 1
-
-        webhook_event.save()
-
-        return Response({"status": "success"})
+        result = ingest(WebhookEvent.Provider.STRIPE, json.loads(payload), payload)
+        return Response({"status": result})
 
 
 class PaystackWebhookView(views.APIView):
     """
     Handle Paystack webhook events.
+
+    Verified events are stored and processed by a django-q task
+    (apps.subscriptions.webhooks); Paystack gets its 200 straight away.
     """
     permission_classes = [AllowAny]
 
     def post(self, request):
-        payload = request.data
+        from .webhooks import ingest
+
         signature = request.META.get("HTTP_X_PAYSTACK_SIGNATURE")
 
         paystack_service = PaystackService()
@@ -616,38 +602,8 @@ class PaystackWebhookView(views.APIView):
             logger.error("Invalid Paystack webhook signature")
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        event_type = payload.get("event")
-        event_data = payload.get("data", {})
-
-        # Generate unique event ID
-        event_id = f"paystack_{event_data.get('reference', timezone.now().timestamp())}"
-
-        # Log the event
-        webhook_event, created = WebhookEvent.objects.get_or_create(
-            event_id=event_id,
-            defaults={
-                "provider": WebhookEvent.Provider.PAYSTACK,
-                "event_type": event_type,
-                "payload": payload,
-            }
-        )
-
-        if not created:
-            return Response({"status": "already_processed"})
-
-        try:
-            paystack_service.handle_webhook_event(event_type, event_data)
-            webhook_event.status = WebhookEvent.Status.PROCESSED
-            webhook_event.processed_at = timezone.now()
-        except Exception as e:
-            logger.error(f"Failed to process Paystack webhook: {e}")
-            webhook_event.status = WebhookEvent.Status.FAILED
-            webhook_event.error_message = str(e)
-            webhook_event.attempts += 1
-
-        webhook_event.save()
-
-        return Response({"status": "success"})
+        result = ingest(WebhookEvent.Provider.PAYSTACK, request.data, request.body)
+        return Response({"status": result})
 
 
 class AdminSubscriptionViewSet(viewsets.ModelViewSet):
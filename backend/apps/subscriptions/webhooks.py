@@ -0,0 +1,222 @@
+"""
+Queued payment webhook processing (Stripe, Paystack).
+
+The webhook views only verify the signature and `ingest` the event: the
+raw payload is stored as a WebhookEvent under the provider's event ID
+(unique), and a django-q task is queued for the event's customer once the
+row is committed. The provider gets its 200 straight away.
+
+Idempotency: a delivery whose event ID is already stored isn't stored or
+queued again, so a burst of provider retries collapses into one row and
+at most one task. Only a retry of an event that failed re-queues it.
+
+Ordering: events are processed one customer at a time (Stripe customer
+ID, Paystack customer code) in the order the provider created them.
+`process_customer` holds a per-customer cache lock and works through
+that customer's queue. If an event fails, the run stops there so later
+events for the same customer don't overtake it. `retry_webhook_events`
+(scheduled) picks up stalled queues and retries failed events, up to
+MAX_ATTEMPTS; after that the event is left FAILED for the admin and the
+queue moves on.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+LOCK_TTL = 5 * 60
+LOCK_KEY = "webhooks:lock:{}:{}"  # provider, customer key
+STALE_AFTER = timedelta(minutes=2)
+
+
+# =========================
+# Event identity
+# =========================
+
+def _stripe_identity(event: dict) -> dict:
+    obj = event.get("data", {}).get("object", {})
+    customer = obj.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+    created = event.get("created")
+    return {
+        "event_id": event["id"],
+        "event_type": event.get("type", ""),
+        "customer_key": customer or obj.get("subscription") or obj.get("id") or "",
+        "occurred_at": datetime.fromtimestamp(created, tz=dt_timezone.utc) if created else None,
+    }
+
+
+def _paystack_identity(payload: dict, body: bytes) -> dict:
+    event_type = payload.get("event", "")
+    data = payload.get("data") or {}
+    customer = data.get("customer") or {}
+    # Paystack sends no event ID: the object ID (or reference) per event
+    # type, else the body hash, so identical retries share a key.
+    object_id = data.get("id") or data.get("reference") or hashlib.sha256(body).hexdigest()
+    return {
+        "event_id": f"paystack_{event_type}_{object_id}",
+        "event_type": event_type,
+        "customer_key": customer.get("customer_code") or customer.get("email") or "",
+        "occurred_at": None,
+    }
+
+
+# =========================
+# Ingestion
+# =========================
+
+def _enqueue(provider: str, customer_key: str):
+    from django_q.tasks import async_task
+
+    async_task(
+        "apps.subscriptions.webhooks.process_customer",
+        provider,
+        customer_key,
+        task_name=f"webhooks:{provider}:{customer_key or '-'}",
+        group="webhooks",
+    )
+
+
+def ingest(provider: str, payload: dict, body: bytes = b"") -> str:
+    """
+    Store a verified webhook event and queue its customer. Returns
+    "queued", "duplicate" (already stored, nothing to do) or "requeued"
+    (a failed event the provider retried).
+    """
+    from .models import WebhookEvent
+
+    if provider == WebhookEvent.Provider.STRIPE:
+        identity = _stripe_identity(payload)
+    else:
+        identity = _paystack_identity(payload, body)
+
+    try:
+        with transaction.atomic():
+            event = WebhookEvent.objects.create(provider=provider, payload=payload, **identity)
+    except IntegrityError:
+        event = WebhookEvent.objects.get(event_id=identity["event_id"])
+        if event.status != WebhookEvent.Status.FAILED:
+            return "duplicate"
+        WebhookEvent.objects.filter(pk=event.pk, status=WebhookEvent.Status.FAILED).update(
+            status=WebhookEvent.Status.PENDING, attempts=0, updated_at=timezone.now()
+        )
+        result = "requeued"
+    else:
+        result = "queued"
+
+    transaction.on_commit(lambda: _enqueue(provider, event.customer_key))
+    return result
+
+
+# =========================
+# Processing
+# =========================
+
+def _queue(provider: str, customer_key: str):
+    from .models import WebhookEvent
+
+    return WebhookEvent.objects.filter(
+        Q(status=WebhookEvent.Status.PENDING)
+        | Q(status=WebhookEvent.Status.FAILED, attempts__lt=MAX_ATTEMPTS),
+        provider=provider,
+        customer_key=customer_key,
+    ).order_by("occurred_at", "created_at")
+
+
+def handle(event):
+    """Run the provider handler for one stored event."""
+    from .models import WebhookEvent
+    from .services import PaystackService, StripeService
+
+    if event.provider == WebhookEvent.Provider.STRIPE:
+        StripeService().handle_webhook_event(event.payload)
+    else:
+        PaystackService().handle_webhook_event(event.event_type, event.payload.get("data") or {})
+
+
+def process_event(event) -> bool:
+    """Handle one event and record the outcome; False if it failed."""
+    from .models import WebhookEvent
+
+    try:
+        with transaction.atomic():
+            handle(event)
+            WebhookEvent.objects.filter(pk=event.pk).update(
+                status=WebhookEvent.Status.PROCESSED,
+                processed_at=timezone.now(),
+                attempts=event.attempts + 1,
+                error_message="",
+                updated_at=timezone.now(),
+            )
+        return True
+    except Exception as e:
+        logger.error(f"Failed to process {event.provider} webhook {event.event_id}: {e}")
+        WebhookEvent.objects.filter(pk=event.pk).update(
+            status=WebhookEvent.Status.FAILED,
+            attempts=event.attempts + 1,
+            error_message=str(e),
+            updated_at=timezone.now(),
+        )
+        return False
+
+
+def process_customer(provider: str, customer_key: str) -> str:
+    """django-q task: process one customer's queued events in order."""
+    from .models import WebhookEvent
+
+    lock_key = LOCK_KEY.format(provider, customer_key)
+    processed = failed = 0
+
+    while True:
+        if not cache.add(lock_key, 1, LOCK_TTL):
+            return f"{provider} {customer_key or '-'}: already being processed"
+        try:
+            while True:
+                event = _queue(provider, customer_key).first()
+                if event is None:
+                    break
+                if not process_event(event):
+                    failed += 1
+                    break  # Keep order; retry_webhook_events tries it again
+                processed += 1
+        finally:
+            cache.delete(lock_key)
+
+        # An event queued while we held the lock had its task turned away
+        if failed or not _queue(provider, customer_key).filter(status=WebhookEvent.Status.PENDING).exists():
+            break
+
+    return f"{provider} {customer_key or '-'}: processed {processed}, failed {failed}"
+
+
+def retry_webhook_events() -> str:
+    """
+    Re-queue customers with stalled or failed events.
+
+    Schedule: Every 5 minutes
+    """
+    from .models import WebhookEvent
+
+    cutoff = timezone.now() - STALE_AFTER
+    customers = (
+        WebhookEvent.objects.filter(
+            Q(status=WebhookEvent.Status.PENDING)
+            | Q(status=WebhookEvent.Status.FAILED, attempts__lt=MAX_ATTEMPTS),
+            updated_at__lt=cutoff,
+        )
+        .values_list("provider", "customer_key")
+        .distinct()
+    )
+    count = 0
+    for provider, customer_key in customers:
+        _enqueue(provider, customer_key)
+        count += 1
+    return f"Re-queued webhook events for {count} customers"
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_writer_email_public"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="avatar_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive derivatives (apps.media.derivatives)",
+                verbose_name="Avatar Variants",
+            ),
+        ),
+    ]
@@ -197,6 +197,13 @@ class UserProfile(TimeStampedModel):
         null=True,
         blank=True,
     )
+    avatar_variants = models.JSONField(
+        "Avatar Variants",
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Responsive derivatives (apps.media.derivatives)",
+    )
     bio = models.TextField(
         "Bio",
         max_length=500,
@@ -31,11 +31,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
         source="watchlist",
         required=False,
     )
+    avatar_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = UserProfile
         fields = [
             "avatar",
+            "avatar_srcset",
             "bio",
             "company",
             "job_title",
@@ -50,6 +52,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
+    def get_avatar_srcset(self, obj):
+        from apps.media.derivatives import srcset
+
+        return srcset(obj.avatar.name, obj.avatar_variants, obj.avatar.storage, self.context.get("request"))
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model."""
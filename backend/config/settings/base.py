@@ -87,6 +87,7 @@ LOCAL_APPS = [
     "apps.media",
     "apps.research",
     "apps.podcasts",
+    "apps.search",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -98,6 +99,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "apps.seo.middleware.RedirectMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -192,6 +194,9 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# nginx "internal" location aliasing MEDIA_ROOT; downloads use X-Accel-Redirect when set
+MEDIA_ACCEL_REDIRECT = env("MEDIA_ACCEL_REDIRECT", default="")
+DOWNLOAD_URL_TTL = env.int("DOWNLOAD_URL_TTL", default=300)  # Presigned download URL lifetime (seconds)
 
 # =========================
 # Sites Framework
@@ -453,6 +458,14 @@ SUBSCRIPTION_SETTINGS = {
     "PRORATION_BEHAVIOR": "create_prorations",  # or "none"
 }
 
+# =========================
+# GeoIP (local IP-range database)
+# =========================
+# Compiled range table (.bin) or MaxMind .mmdb; see `manage.py refresh_geoip`.
+# When the file is missing, lookups fall back to the ipapi.co API.
+GEOIP_DB_PATH = env("GEOIP_DB_PATH", default=str(BASE_DIR / "data" / "geoip.bin"))
+GEOIP_SOURCE_URL = env("GEOIP_SOURCE_URL", default="")
+
 # =========================
 # External API Keys
 # =========================
@@ -462,3 +475,4 @@ SERPAPI_KEY = env("SERPAPI_KEY", default="")
 UNSPLASH_ACCESS_KEY = env("UNSPLASH_ACCESS_KEY", default="")
 UNSPLASH_ACCESS_KEY_2 = env("UNSPLASH_ACCESS_KEY_2", default="")
 UNSPLASH_ACCESS_KEY_3 = env("UNSPLASH_ACCESS_KEY_3", default="")
+UNSPLASH_HOURLY_LIMIT = env.int("UNSPLASH_HOURLY_LIMIT", default=50)  # Requests per key per hour
@@ -52,6 +52,7 @@ api_v1_patterns = [
     path("media/", include("apps.media.urls", namespace="media")),
     path("research/", include("apps.research.urls", namespace="research")),
     path("podcasts/", include("apps.podcasts.urls", namespace="podcasts")),
+    path("search/", include("apps.search.urls", namespace="search")),
     # Health check endpoint
     path("health/", include("apps.core.urls", namespace="core")),
 ]
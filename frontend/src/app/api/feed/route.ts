@@ -30,6 +30,7 @@ const ALLOWED_PARAMS = [
   "page",
   "page_size",
   "offset",
+  "cursor",
   "category",
   "status",
   "search",